@@ -0,0 +1,71 @@
+import argparse
+import time
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from kami_pricing.pricing import Pricing
+
+SELLERS = ['HAIRPRO', 'LOJA A', 'LOJA B', 'LOJA C', 'LOJA D']
+
+
+def make_sellers_list(rows: int, seed: int = 42) -> Tuple[List, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    skus = rng.integers(0, max(rows // len(SELLERS), 1), rows)
+    sellers = rng.choice(SELLERS, rows)
+    prices = np.round(rng.uniform(10, 300, rows), 2)
+    sellers_list = [
+        [f'MP{sku:07d}', 'BRAND', 'CATEGORY', f'PRODUCT {sku}', price, seller]
+        for sku, price, seller in zip(skus, prices, sellers)
+    ]
+    unique_skus = np.unique(skus)
+    skus_df = pd.DataFrame(
+        {
+            'SKU Seller': [f'KAMI{sku:07d}' for sku in unique_skus],
+            'SKU Beleza': [f'MP{sku:07d}' for sku in unique_skus],
+        }
+    )
+    return sellers_list, skus_df
+
+
+def run(sizes: List[int], loop_max_rows: int):
+    for rows in sizes:
+        sellers_list, skus_df = make_sellers_list(rows)
+        timings = {}
+        for engine in ['vectorized', 'loop']:
+            if engine == 'loop' and rows > loop_max_rows:
+                timings[engine] = None
+                continue
+            pc = Pricing(pricing_engine=engine)
+            start = time.perf_counter()
+            pc.create_dataframes(sellers_list=sellers_list, skus_list=skus_df)
+            timings[engine] = time.perf_counter() - start
+
+        loop = timings['loop']
+        print(
+            f"{rows:>7} rows | vectorized {timings['vectorized']:.3f}s | "
+            + (
+                f'loop {loop:.3f}s | speedup {loop / timings["vectorized"]:.0f}x'
+                if loop is not None
+                else 'loop skipped'
+            )
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark Pricing.create_dataframes engines. '
+        'Run with: python -m benchmarks.bench_create_dataframes'
+    )
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 100000]
+    )
+    parser.add_argument(
+        '--loop-max-rows',
+        type=int,
+        default=10000,
+        help='the loop engine is quadratic, larger sizes only run vectorized',
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.loop_max_rows)
@@ -0,0 +1,45 @@
+import argparse
+import glob
+import time
+from os import path
+
+from kami_pricing.constant import ROOT_DIR
+from kami_pricing.extractors import OFFER_EXTRACTORS
+
+SAVED_PAGES_PATTERN = path.join(ROOT_DIR, 'tests/fixtures/pages/*.html')
+
+
+def run(pages_paths, repeat: int):
+    pages = []
+    for page_path in pages_paths:
+        with open(page_path, 'rb') as f:
+            pages.append(f.read())
+    if not pages:
+        raise SystemExit(
+            'No pages to benchmark: save real product pages in '
+            'tests/fixtures/pages or pass their paths'
+        )
+    print(f'{len(pages)} pages x {repeat} runs')
+
+    for name, extractor_class in OFFER_EXTRACTORS.items():
+        extractor = extractor_class()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for page in pages:
+                extractor.extract(page)
+        runtime = time.perf_counter() - start
+        per_page = runtime / (repeat * len(pages)) * 1000
+        print(f'{name:>8} | {runtime:.3f}s | {per_page:.3f}ms per page')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the offer extractors over saved pages. '
+        'Run with: python -m benchmarks.bench_extractors'
+    )
+    parser.add_argument(
+        'pages', nargs='*', default=sorted(glob.glob(SAVED_PAGES_PATTERN))
+    )
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    run(args.pages, args.repeat)
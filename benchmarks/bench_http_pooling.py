@@ -0,0 +1,47 @@
+import argparse
+import statistics
+import time
+
+import httpx
+
+from kami_pricing.api.http_client import PooledHTTPClient
+from tests.stand_in_server import StandInServer
+
+
+def _measure(get, url: str, requests: int):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        get(url).raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _get_without_pool(url: str) -> httpx.Response:
+    with httpx.Client() as client:
+        return client.get(url)
+
+
+def run(requests: int):
+    with StandInServer() as server, PooledHTTPClient() as http_client:
+        url = f'{server.base_url}/v2/products'
+        results = {
+            'new client per call': _measure(_get_without_pool, url, requests),
+            'pooled client': _measure(http_client.client.get, url, requests),
+        }
+
+    for name, latencies in results.items():
+        print(
+            f'{name:>20} | mean {statistics.mean(latencies):.3f}ms | '
+            f'p95 {statistics.quantiles(latencies, n=20)[-1]:.3f}ms'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark per-request latency with and without pooling. '
+        'Run with: python -m benchmarks.bench_http_pooling'
+    )
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    run(args.requests)
@@ -1,13 +1,21 @@
+import asyncio
 import json
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from os import path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List
 
 import httpx
 import pandas as pd
 from kami_logging import benchmark_with, logging_with
 
+from kami_pricing.api.anymarket_index import AnymarketIndex, build_index_entry
+from kami_pricing.api.http_client import PooledHTTPClient
 from kami_pricing.constant import ROOT_DIR
+from kami_pricing.fetcher import TokenBucket
 
 anymarket_api_logger = logging.getLogger('Anymarket API')
 test_base_url = 'https://sandbox-api.anymarket.com.br'
@@ -15,6 +23,15 @@ base_url = 'https://api.anymarket.com.br'
 anymarket_credentials_path = path.join(
     ROOT_DIR, 'credentials/anymarket_hairpro.json'
 )
+ADS_COLUMNS = {
+    'sku (*)': 'skuInMarketplace',
+    'id': 'id',
+    'marketPlace': 'marketPlace',
+    'publicationStatus': 'publicationStatus',
+    'marketplaceStatus': 'marketplaceStatus',
+    'price': 'price',
+    'fields.title': 'fields.title',
+}
 
 
 class AnymarketAPIError(Exception):
@@ -26,12 +43,33 @@ class AnymarketAPI:
         self,
         base_url: str = base_url,
         credentials_path: str = anymarket_credentials_path,
+        http_client: PooledHTTPClient = None,
+        batch_size: int = 50,
+        index: AnymarketIndex = None,
+        page_size: int = 100,
+        prefetch_pages: int = 4,
+        max_workers: int = 8,
     ):
         self.base_url = base_url
         self.credentials_path = credentials_path
+        self.http_client = http_client or PooledHTTPClient()
+        self.batch_size = batch_size
+        self.index = index
+        self.page_size = page_size
+        self.prefetch_pages = prefetch_pages
+        self.max_workers = max_workers
         self.credentials = None
         self.result = None
 
+    def close(self):
+        self.http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def _set_credentials(self):
         try:
             with open(self.credentials_path, 'r') as f:
@@ -68,30 +106,32 @@ class AnymarketAPI:
 
             method = method.upper()
 
-            with httpx.Client() as client:
-                response = {
-                    'GET': lambda: client.get(
-                        self.base_url + endpoint, headers=headers
-                    ),
-                    'POST': lambda: client.post(
-                        self.base_url + endpoint, json=payload, headers=headers
-                    ),
-                    'PUT': lambda: client.put(
-                        self.base_url + endpoint, json=payload, headers=headers
-                    ),
-                    'DELETE': lambda: client.delete(
-                        self.base_url + endpoint, headers=headers
-                    ),
-                    'PATCH': lambda: client.patch(
-                        self.base_url + endpoint, json=payload, headers=headers
-                    ),
-                }.get(method, lambda: None)()
-
-                if response is None:
-                    raise ValueError(f'Unsupported HTTP method: {method}')
-
-                response.raise_for_status()
-                self.result = response.json()
+            client = self.http_client.client
+            response = {
+                'GET': lambda: client.get(
+                    self.base_url + endpoint, headers=headers
+                ),
+                'POST': lambda: client.post(
+                    self.base_url + endpoint, json=payload, headers=headers
+                ),
+                'PUT': lambda: client.put(
+                    self.base_url + endpoint, json=payload, headers=headers
+                ),
+                'DELETE': lambda: client.delete(
+                    self.base_url + endpoint, headers=headers
+                ),
+                'PATCH': lambda: client.patch(
+                    self.base_url + endpoint, json=payload, headers=headers
+                ),
+            }.get(method, lambda: None)()
+
+            if response is None:
+                raise ValueError(f'Unsupported HTTP method: {method}')
+
+            response.raise_for_status()
+            result = response.json()
+            self.result = result
+            return result
 
         except httpx.HTTPStatusError as e:
             raise AnymarketAPIError(f'HTTP error occurred: {str(e)}')
@@ -171,13 +211,50 @@ class AnymarketAPI:
             (ad for ad in ads if ad['marketPlace'] == marketplace), None
         )
 
+    def _get_products_page(self, offset: int, limit: int) -> Dict:
+        return self._connect(
+            endpoint=f'/v2/products?offset={offset}&limit={limit}'
+        )
+
+    def _map_bounded(
+        self, func: Callable, items: Iterable, max_workers: int
+    ) -> Iterator:
+        # Mantém no máximo max_workers chamadas em voo/memória, em ordem
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(
+                executor.submit(func, item)
+                for item in islice(items, max_workers)
+            )
+            while pending:
+                result = pending.popleft().result()
+                for item in islice(items, 1):
+                    pending.append(executor.submit(func, item))
+                yield result
+
+    def iter_products(
+        self, page_size: int = None, prefetch_pages: int = None
+    ) -> Iterator[Dict]:
+        page_size = page_size or self.page_size
+        prefetch_pages = prefetch_pages or self.prefetch_pages
+
+        page = self._get_products_page(offset=0, limit=page_size)
+        total_elements = page['page']['totalElements']
+        yield from page.get('content', [])
+
+        pages = self._map_bounded(
+            lambda offset: self._get_products_page(offset, page_size),
+            range(page_size, total_elements, page_size),
+            prefetch_pages,
+        )
+        for page in pages:
+            yield from page.get('content', [])
+
     @benchmark_with(anymarket_api_logger)
     @logging_with(anymarket_api_logger)
     def get_all_products(self) -> List[Dict]:
         try:
-            quantity = self.get_products_quantity()
-            self._connect(endpoint=f'/v2/products?limit={quantity}')
-            return self.result.get('content', [])
+            return list(self.iter_products())
         except Exception as e:
             raise AnymarketAPIError(f'Failed to connect: {str(e)}')
 
@@ -185,8 +262,7 @@ class AnymarketAPI:
     @logging_with(anymarket_api_logger)
     def get_all_products_ids(self) -> List[str]:
         try:
-            products = self.get_all_products()
-            product_ids = [product['id'] for product in products]
+            product_ids = [product['id'] for product in self.iter_products()]
             return product_ids
         except Exception as e:
             raise AnymarketAPIError(f'Failed to connect: {str(e)}')
@@ -195,10 +271,9 @@ class AnymarketAPI:
     @logging_with(anymarket_api_logger)
     def get_all_products_partner_ids(self) -> List[str]:
         try:
-            products = self.get_all_products()
             partner_ids = [
                 sku.get('partnerId', '')
-                for product in products
+                for product in self.iter_products()
                 for sku in product.get('skus', [])
             ]
             return partner_ids
@@ -209,13 +284,13 @@ class AnymarketAPI:
     @logging_with(anymarket_api_logger)
     def get_partner_and_product_ids(self) -> (List[str], List[str]):
         try:
-            products = self.get_all_products()
-            partner_ids = [
-                sku.get('partnerId', '')
-                for product in products
-                for sku in product.get('skus', [])
-            ]
-            product_ids = [product['id'] for product in products]
+            partner_ids = []
+            product_ids = []
+            for product in self.iter_products():
+                partner_ids.extend(
+                    sku.get('partnerId', '') for sku in product.get('skus', [])
+                )
+                product_ids.append(product['id'])
             return partner_ids, product_ids
         except Exception as e:
             raise AnymarketAPIError(f'Failed to connect: {str(e)}')
@@ -236,8 +311,10 @@ class AnymarketAPI:
             anymarket_api_logger.info(
                 f'Set product: {product_id} for manual pricing'
             )
+            return True
         except Exception as e:
             anymarket_api_logger.exception(str(e))
+            return False
 
     @benchmark_with(anymarket_api_logger)
     @logging_with(anymarket_api_logger)
@@ -248,31 +325,39 @@ class AnymarketAPI:
         except Exception as e:
             anymarket_api_logger.exception(str(e))
 
+    def _get_ads_or_none(self, partner_id: str) -> List[Dict] | None:
+        try:
+            return self._connect(
+                endpoint=f'/v2/skus/marketplaces?partnerID={partner_id}'
+            )
+        except AnymarketAPIError as e:
+            anymarket_api_logger.error(
+                f'Failed to get ads of {partner_id}: {str(e)}'
+            )
+            return None
+
     @benchmark_with(anymarket_api_logger)
     @logging_with(anymarket_api_logger)
-    def get_products_ads(self, partner_ids: list):
+    def get_products_ads(self, partner_ids: list, max_workers: int = None):
         try:
-            advertisements = []
-            for partner_id in partner_ids:
-                advertisements.extend(
-                    self.get_ads_by_partner_id(partner_id=partner_id)
-                )
-            ads_df = pd.json_normalize(advertisements)
-            ads_df.rename(
-                columns={'skuInMarketplace': 'sku (*)'}, inplace=True
+            # Só as colunas mantidas são copiadas do payload de cada anúncio
+            columns = {column: [] for column in ADS_COLUMNS}
+            ads_batches = self._map_bounded(
+                self._get_ads_or_none,
+                partner_ids,
+                max_workers or self.max_workers,
             )
-            ads_df = ads_df[
-                [
-                    'sku (*)',
-                    'id',
-                    'marketPlace',
-                    'publicationStatus',
-                    'marketplaceStatus',
-                    'price',
-                    'fields.title',
-                ]
-            ]
-            ads_df.dropna(subset=['fields.title'], inplace=True)
+            for ads in ads_batches:
+                for ad in ads or []:
+                    title = (ad.get('fields') or {}).get('title')
+                    if title is None:
+                        continue
+                    for column, key in ADS_COLUMNS.items():
+                        columns[column].append(
+                            title if key == 'fields.title' else ad.get(key)
+                        )
+            ads_df = pd.DataFrame(columns)
+            ads_df['price'] = pd.to_numeric(ads_df['price'])
             return ads_df
         except Exception as e:
             anymarket_api_logger.exception(str(e))
@@ -292,12 +377,77 @@ class AnymarketAPI:
             f'Advertisement: {ad_id} updated price to {new_price}'
         )
 
+    def _get_batch_errors(self, result) -> Dict:
+        errors = {}
+        if not isinstance(result, list):
+            return errors
+        for item in result:
+            if not isinstance(item, dict):
+                continue
+            error = item.get('errorMessage') or item.get('error')
+            if error:
+                errors[str(item.get('id'))] = str(error)
+        return errors
+
+    def _get_batch_payload(self, batch: List[Dict]) -> List[Dict]:
+        return [
+            {
+                'id': ad['id'],
+                'price': ad['price'],
+                'discountPrice': ad['price'],
+            }
+            for ad in batch
+        ]
+
+    def _get_batch_results(
+        self, batch: List[Dict], errors: Dict
+    ) -> List[Dict]:
+        results = []
+        for ad in batch:
+            error = errors.get(str(ad['id']))
+            if error:
+                anymarket_api_logger.error(
+                    f"Advertisement: {ad['id']} failed to update price: {error}"
+                )
+            else:
+                anymarket_api_logger.info(
+                    f"Advertisement: {ad['id']} updated price to {ad['price']}"
+                )
+            results.append({**ad, 'success': not error, 'error': error})
+        return results
+
+    @benchmark_with(anymarket_api_logger)
+    @logging_with(anymarket_api_logger)
+    def update_ads_prices(
+        self, ads_prices: List[Dict], batch_size: int = None
+    ) -> List[Dict]:
+        batch_size = batch_size or self.batch_size
+        results = []
+        for start in range(0, len(ads_prices), batch_size):
+            batch = ads_prices[start : start + batch_size]
+            try:
+                self._connect(
+                    method='PUT',
+                    endpoint='/v2/skus/marketplaces/prices',
+                    payload=self._get_batch_payload(batch),
+                )
+                errors = self._get_batch_errors(self.result)
+            except AnymarketAPIError as e:
+                errors = {str(ad['id']): str(e) for ad in batch}
+            results.extend(self._get_batch_results(batch, errors))
+        return results
+
     def change_price(self, marketplace: str, ads_df: pd.DataFrame):
         try:
-            for index, row in ads_df[
-                ads_df['marketPlace'] == marketplace
-            ].iterrows():
-                self.update_price(row['id'], row['special_price'])
+            marketplace_ads = ads_df[ads_df['marketPlace'] == marketplace]
+            self.update_ads_prices(
+                [
+                    {'id': ad_id, 'price': price}
+                    for ad_id, price in zip(
+                        marketplace_ads['id'], marketplace_ads['special_price']
+                    )
+                ]
+            )
         except Exception as e:
             anymarket_api_logger.exception(str(e))
 
@@ -327,22 +477,313 @@ class AnymarketAPI:
             anymarket_api_logger.exception(str(e))
             raise
 
+    def refresh_index(self, force: bool = False):
+        if self.index is None or not (force or self.index.is_stale()):
+            return
+        self.index.refresh(self.iter_products())
+
+    def _get_index_entry(self, partner_id: str) -> Dict | None:
+        if self.index is None:
+            return None
+        return self.index.get(partner_id)
+
+    def _add_index_entry(self, partner_id: str, product: Dict) -> Dict:
+        if self.index is None:
+            return build_index_entry(product)
+        return self.index.set_product(partner_id, product)
+
+    def _add_index_ads(self, entry: Dict, ads: List[Dict]):
+        for ad in ads:
+            entry['ads'].setdefault(ad['marketPlace'], ad['id'])
+
+    def _drop_failed_ads(self, results: List[Dict], marketplace: str):
+        # Um anúncio removido ou recriado no marketplace falha em todo
+        # envio; sem o id no índice, o próximo ciclo volta a buscá-lo
+        if self.index is None:
+            return
+        for result in results:
+            if not result['success'] and result['id'] is not None:
+                self.index.drop_ad(
+                    result['sku (*)'], marketplace, result['id']
+                )
+        self.index.save()
+
+    def _get_ad_id(self, partner_id: str, marketplace: str) -> str:
+        entry = self._get_index_entry(partner_id)
+        if entry is None:
+            product = self.get_product_by_partner_id(partner_id=partner_id)
+            entry = self._add_index_entry(partner_id, product)
+
+        if not entry['manual_pricing']:
+            entry['manual_pricing'] = self.set_product_for_manual_pricing(
+                product_id=entry['product_id']
+            )
+
+        if marketplace not in entry['ads']:
+            ads = self.get_ads_by_partner_id(partner_id=partner_id)
+            self._add_index_ads(entry, ads)
+        if marketplace not in entry['ads']:
+            raise AnymarketAPIError(
+                f'No advertisement of {partner_id} on {marketplace}'
+            )
+        return entry['ads'][marketplace]
+
     def update_prices_on_marketplace(
         self, pricing_df: pd.DataFrame, marketplace: str = 'BELEZA_NA_WEB'
-    ):
-        for index, row in pricing_df.iterrows():
+    ) -> List[Dict]:
+        self.refresh_index()
+        ads_prices = []
+        failed = []
+        for partner_id, new_price in zip(
+            pricing_df['sku (*)'], pricing_df['special_price']
+        ):
             try:
-                product = self.get_product_by_partner_id(
-                    partner_id=row['sku (*)']
-                )
-                self.set_product_for_manual_pricing(product_id=product['id'])
-                ads = self.get_ads_by_partner_id(partner_id=row['sku (*)'])
-                marketplace_ad = self.get_first_ad_of_marketplace(
-                    ads=ads, marketplace=marketplace
-                )
-                self.update_price(
-                    ad_id=marketplace_ad['id'], new_price=row['special_price']
+                ads_prices.append(
+                    {
+                        'sku (*)': partner_id,
+                        'id': self._get_ad_id(partner_id, marketplace),
+                        'price': new_price,
+                    }
                 )
             except Exception as e:
                 anymarket_api_logger.exception(str(e))
-                continue
+                failed.append(
+                    {
+                        'sku (*)': partner_id,
+                        'id': None,
+                        'price': new_price,
+                        'success': False,
+                        'error': str(e),
+                    }
+                )
+        results = failed + self.update_ads_prices(ads_prices)
+        self._drop_failed_ads(results, marketplace)
+        return results
+
+
+class AsyncAnymarketAPI(AnymarketAPI):
+    def __init__(
+        self,
+        base_url: str = base_url,
+        credentials_path: str = anymarket_credentials_path,
+        http_client: PooledHTTPClient = None,
+        batch_size: int = 50,
+        max_concurrency: int = 10,
+        requests_per_second: float = 5.0,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        rate_limiter: TokenBucket = None,
+        index: AnymarketIndex = None,
+        page_size: int = 100,
+        prefetch_pages: int = 4,
+        max_workers: int = 8,
+    ):
+        super().__init__(
+            base_url=base_url,
+            credentials_path=credentials_path,
+            http_client=http_client,
+            batch_size=batch_size,
+            index=index,
+            page_size=page_size,
+            prefetch_pages=prefetch_pages,
+            max_workers=max_workers,
+        )
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.semaphore = None
+        self.shared_rate_limiter = rate_limiter
+        # O semáforo, o limitador e o cliente assíncrono pertencem ao loop
+        # de cada asyncio.run, então envios de threads diferentes esperam
+        self.push_lock = threading.Lock()
+        self.rate_limiter = None
+
+    def _get_retry_delay(self, attempt: int, response: httpx.Response):
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2**attempt
+
+    async def _connect_async(
+        self,
+        method: str = 'GET',
+        endpoint: str = '',
+        payload: List = None,
+        headers: Dict = None,
+    ):
+        try:
+            if not self.credentials:
+                self._set_credentials()
+
+            headers = {
+                'Content-Type': 'application/json',
+                **(headers or {}),
+                'gumgaToken': self.credentials['token'],
+            }
+            method = method.upper()
+            if method not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+                raise ValueError(f'Unsupported HTTP method: {method}')
+            json_payload = None if method in ['GET', 'DELETE'] else payload
+
+            client = self.http_client.async_client
+            for attempt in range(self.max_retries + 1):
+                await self.rate_limiter.acquire()
+                async with self.semaphore:
+                    response = await client.request(
+                        method,
+                        self.base_url + endpoint,
+                        json=json_payload,
+                        headers=headers,
+                    )
+                if response.status_code != 429 or attempt == self.max_retries:
+                    break
+                delay = self._get_retry_delay(attempt, response)
+                anymarket_api_logger.warning(
+                    f'Rate limited on {endpoint}, retrying in {delay:.1f}s'
+                )
+                await asyncio.sleep(delay)
+
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPStatusError as e:
+            raise AnymarketAPIError(f'HTTP error occurred: {str(e)}')
+        except httpx.RequestError as e:
+            raise AnymarketAPIError(f'Failed to connect: {str(e)}')
+        except ValueError as e:
+            raise AnymarketAPIError(str(e))
+        except Exception as e:
+            raise AnymarketAPIError(f'Failed to connect: {str(e)}')
+
+    async def _get_ad_price_async(
+        self, partner_id: str, new_price: float, marketplace: str
+    ) -> Dict:
+        ad_price = {'sku (*)': partner_id, 'id': None, 'price': new_price}
+        try:
+            entry = self._get_index_entry(partner_id)
+            if entry is None:
+                products = await self._connect_async(
+                    endpoint=f'/v2/products?partnerId={partner_id}'
+                )
+                entry = self._add_index_entry(
+                    partner_id, products.get('content', [])[0]
+                )
+
+            if not entry['manual_pricing']:
+                try:
+                    await self._connect_async(
+                        method='PATCH',
+                        endpoint=f"/v2/products/{entry['product_id']}",
+                        headers={
+                            'Content-Type': 'application/merge-patch+json'
+                        },
+                        payload={
+                            'calculatedPrice': False,
+                            'definitionPriceScope': 'SKU_MARKETPLACE',
+                        },
+                    )
+                    entry['manual_pricing'] = True
+                    anymarket_api_logger.info(
+                        f"Set product: {entry['product_id']} for manual pricing"
+                    )
+                except AnymarketAPIError as e:
+                    anymarket_api_logger.exception(str(e))
+
+            if marketplace not in entry['ads']:
+                ads = await self._connect_async(
+                    endpoint=f'/v2/skus/marketplaces?partnerID={partner_id}'
+                )
+                self._add_index_ads(entry, ads)
+            if marketplace not in entry['ads']:
+                raise AnymarketAPIError(
+                    f'No advertisement of {partner_id} on {marketplace}'
+                )
+            ad_price['id'] = entry['ads'][marketplace]
+            return ad_price
+        except Exception as e:
+            anymarket_api_logger.error(
+                f'Failed to find the advertisement of {partner_id}: {str(e)}'
+            )
+            return {**ad_price, 'success': False, 'error': str(e)}
+
+    async def get_ads_prices_async(
+        self, pricing_df: pd.DataFrame, marketplace: str = 'BELEZA_NA_WEB'
+    ) -> List[Dict]:
+        return await asyncio.gather(
+            *(
+                self._get_ad_price_async(
+                    partner_id=partner_id,
+                    new_price=new_price,
+                    marketplace=marketplace,
+                )
+                for partner_id, new_price in zip(
+                    pricing_df['sku (*)'], pricing_df['special_price']
+                )
+            )
+        )
+
+    async def _update_batch_prices_async(
+        self, batch: List[Dict]
+    ) -> List[Dict]:
+        try:
+            result = await self._connect_async(
+                method='PUT',
+                endpoint='/v2/skus/marketplaces/prices',
+                payload=self._get_batch_payload(batch),
+            )
+            errors = self._get_batch_errors(result)
+        except AnymarketAPIError as e:
+            errors = {str(ad['id']): str(e) for ad in batch}
+        return self._get_batch_results(batch, errors)
+
+    async def update_ads_prices_async(
+        self, ads_prices: List[Dict], batch_size: int = None
+    ) -> List[Dict]:
+        batch_size = batch_size or self.batch_size
+        batches = await asyncio.gather(
+            *(
+                self._update_batch_prices_async(
+                    ads_prices[start : start + batch_size]
+                )
+                for start in range(0, len(ads_prices), batch_size)
+            )
+        )
+        return [result for batch in batches for result in batch]
+
+    async def update_prices_async(
+        self, pricing_df: pd.DataFrame, marketplace: str = 'BELEZA_NA_WEB'
+    ) -> List[Dict]:
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.rate_limiter = self.shared_rate_limiter or TokenBucket(
+            rate=self.requests_per_second
+        )
+        try:
+            ads_prices = await self.get_ads_prices_async(
+                pricing_df=pricing_df, marketplace=marketplace
+            )
+            # Os lotes de preços passam pelo mesmo semáforo, limitador e
+            # retentativas das buscas; quem falhou na busca já tem o seu
+            # resultado
+            found = [ad for ad in ads_prices if 'success' not in ad]
+            updated = iter(await self.update_ads_prices_async(found))
+            return [
+                ad if 'success' in ad else next(updated) for ad in ads_prices
+            ]
+        finally:
+            await self.http_client.aclose()
+
+    @benchmark_with(anymarket_api_logger)
+    @logging_with(anymarket_api_logger)
+    def update_prices_on_marketplace(
+        self, pricing_df: pd.DataFrame, marketplace: str = 'BELEZA_NA_WEB'
+    ) -> List[Dict]:
+        with self.push_lock:
+            self.refresh_index()
+            results = asyncio.run(
+                self.update_prices_async(
+                    pricing_df=pricing_df, marketplace=marketplace
+                )
+            )
+            self._drop_failed_ads(results, marketplace)
+        return results
@@ -0,0 +1,79 @@
+import json
+import logging
+import time
+from os import makedirs, path
+from typing import Dict, Iterable
+
+anymarket_index_logger = logging.getLogger('Anymarket Index')
+
+
+def build_index_entry(product: Dict) -> Dict:
+    return {
+        'product_id': product['id'],
+        'manual_pricing': (
+            product.get('calculatedPrice') is False
+            and product.get('definitionPriceScope') == 'SKU_MARKETPLACE'
+        ),
+        'ads': {},
+    }
+
+
+class AnymarketIndex:
+    def __init__(self, file_path: str, ttl: float = 86400):
+        self.file_path = file_path
+        self.ttl = ttl
+        self.refreshed_at = 0
+        self.products = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.file_path, 'r') as f:
+                data = json.load(f)
+            self.refreshed_at = data.get('refreshed_at', 0)
+            self.products = data.get('products', {})
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            anymarket_index_logger.error(
+                f'The index at {self.file_path} contains invalid JSON, it will be rebuilt.'
+            )
+
+    def save(self):
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        with open(self.file_path, 'w') as f:
+            json.dump(
+                {'refreshed_at': self.refreshed_at, 'products': self.products},
+                f,
+            )
+
+    def is_stale(self) -> bool:
+        return time.time() - self.refreshed_at > self.ttl
+
+    def refresh(self, products: Iterable[Dict]):
+        # Os anúncios não passam de uma atualização para outra: um anúncio
+        # removido ou recriado no marketplace é buscado de novo
+        self.products = {}
+        for product in products:
+            for sku in product.get('skus', []):
+                partner_id = str(sku.get('partnerId', ''))
+                if partner_id:
+                    self.set_product(partner_id, product)
+        self.refreshed_at = time.time()
+        anymarket_index_logger.info(
+            f'Index refreshed with {len(self.products)} partner ids'
+        )
+        self.save()
+
+    def get(self, partner_id: str) -> Dict | None:
+        return self.products.get(str(partner_id))
+
+    def drop_ad(self, partner_id: str, marketplace: str, ad_id: str):
+        entry = self.get(partner_id)
+        if entry is not None and entry['ads'].get(marketplace) == ad_id:
+            del entry['ads'][marketplace]
+
+    def set_product(self, partner_id: str, product: Dict) -> Dict:
+        entry = build_index_entry(product)
+        self.products[str(partner_id)] = entry
+        return entry
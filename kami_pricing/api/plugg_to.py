@@ -1,5 +1,7 @@
+import asyncio
 import json
 import logging
+import threading
 from os import path
 from typing import Dict, List
 
@@ -7,7 +9,10 @@ import httpx
 import pandas as pd
 from kami_logging import benchmark_with, logging_with
 
+from kami_pricing.api.http_client import PooledHTTPClient
+from kami_pricing.api.token_cache import TokenCache
 from kami_pricing.constant import ROOT_DIR
+from kami_pricing.fetcher import TokenBucket
 
 plugg_to_api_logger = logging.getLogger('PluggTo API')
 base_url: str = 'https://api.plugg.to'
@@ -25,13 +30,26 @@ class PluggToAPI:
         self,
         base_url: str = base_url,
         credentials_path: str = plugg_to_credentials_path,
+        http_client: PooledHTTPClient = None,
+        token_cache: TokenCache = None,
     ):
         self.base_url = base_url
         self.credentials_path = credentials_path
+        self.http_client = http_client or PooledHTTPClient()
+        self.token_cache = token_cache or TokenCache()
         self.credentials = None
         self.access_token = None
         self.result = None
 
+    def close(self):
+        self.http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     @benchmark_with(plugg_to_api_logger)
     @logging_with(plugg_to_api_logger)
     def _set_credentials(self):
@@ -55,33 +73,71 @@ class PluggToAPI:
 
     @benchmark_with(plugg_to_api_logger)
     @logging_with(plugg_to_api_logger)
+    def _request_access_token(self) -> Dict:
+        if not self.credentials:
+            self._set_credentials()
+
+        headers = {
+            'accept': 'application/json',
+            'Content-Type': 'application/x-www-form-urlencoded',
+        }
+        payload = {
+            'client_id': self.credentials['client_id'],
+            'client_secret': self.credentials['client_secret'],
+            'username': self.credentials['username'],
+            'password': self.credentials['password'],
+            'grant_type': 'password',
+        }
+        client = self.http_client.client
+        response = client.post(
+            f'{self.base_url}/oauth/token',
+            data=payload,
+            headers=headers,
+        )
+        response.raise_for_status()
+        return response.json()
+
     def _set_access_token(self):
         try:
-            if not self.credentials:
-                self._set_credentials()
-
-            headers = {
-                'accept': 'application/json',
-                'Content-Type': 'application/x-www-form-urlencoded',
-            }
-            payload = {
-                'client_id': self.credentials['client_id'],
-                'client_secret': self.credentials['client_secret'],
-                'username': self.credentials['username'],
-                'password': self.credentials['password'],
-                'grant_type': 'password',
-            }
-            with httpx.Client() as client:
-                response = client.post(
-                    f'{self.base_url}/oauth/token',
-                    data=payload,
-                    headers=headers,
-                )
-                response.raise_for_status()
-                self.access_token = response.json()['access_token']
+            self.access_token = self.token_cache.get_or_refresh(
+                self._request_access_token
+            )
         except Exception as e:
             raise Exception(f'Failed to set access token: {str(e)}')
 
+    def _get_headers(self, headers: Dict = None) -> Dict:
+        return {
+            'Content-Type': 'application/json',
+            'accept': 'application/json',
+            'Authorization': f'Bearer {self.access_token}',
+            **(headers or {}),
+        }
+
+    def _send(
+        self, method: str, endpoint: str, payload: List, headers: Dict
+    ) -> httpx.Response:
+        self._set_access_token()
+        headers = self._get_headers(headers)
+
+        client = self.http_client.client
+        return {
+            'GET': lambda: client.get(
+                self.base_url + endpoint, headers=headers
+            ),
+            'POST': lambda: client.post(
+                self.base_url + endpoint, json=payload, headers=headers
+            ),
+            'PUT': lambda: client.put(
+                self.base_url + endpoint, json=payload, headers=headers
+            ),
+            'DELETE': lambda: client.delete(
+                self.base_url + endpoint, headers=headers
+            ),
+            'PATCH': lambda: client.patch(
+                self.base_url + endpoint, json=payload, headers=headers
+            ),
+        }.get(method, lambda: None)()
+
     def _connect(
         self,
         method: str = 'GET',
@@ -90,41 +146,21 @@ class PluggToAPI:
         headers: Dict = {},
     ):
         try:
-            if not self.access_token:
-                self._set_access_token()
-            if 'Content-Type' not in headers:
-                headers['Content-Type'] = 'application/json'
-            if 'accept' not in headers:
-                headers['accept'] = 'application/json'
-            if 'Authorization' not in headers:
-                headers['Authorization'] = f'Bearer {self.access_token}'
-
             method = method.upper()
+            response = self._send(method, endpoint, payload, headers)
 
-            with httpx.Client() as client:
-                response = {
-                    'GET': lambda: client.get(
-                        self.base_url + endpoint, headers=headers
-                    ),
-                    'POST': lambda: client.post(
-                        self.base_url + endpoint, json=payload, headers=headers
-                    ),
-                    'PUT': lambda: client.put(
-                        self.base_url + endpoint, data=payload, headers=headers
-                    ),
-                    'DELETE': lambda: client.delete(
-                        self.base_url + endpoint, headers=headers
-                    ),
-                    'PATCH': lambda: client.patch(
-                        self.base_url + endpoint, json=payload, headers=headers
-                    ),
-                }.get(method, lambda: None)()
-
-                if response is None:
-                    raise ValueError(f'Unsupported HTTP method: {method}')
-
-                response.raise_for_status()
-                self.result = response.json()
+            if response is None:
+                raise ValueError(f'Unsupported HTTP method: {method}')
+
+            if response.status_code == 401:
+                plugg_to_api_logger.warning(
+                    f'Access token rejected on {endpoint}, refreshing it'
+                )
+                self.token_cache.invalidate(self.access_token)
+                response = self._send(method, endpoint, payload, headers)
+
+            response.raise_for_status()
+            self.result = response.json()
 
         except httpx.HTTPStatusError as e:
             raise PluggToAPIError(f'HTTP error occurred: {str(e)}')
@@ -137,14 +173,10 @@ class PluggToAPI:
 
     def update_price(self, sku: str, new_price: float):
         try:
-            payload = [
-                {'special_price': new_price},
-            ]
-            payload_str = json.dumps(payload)
             self._connect(
                 method='PUT',
                 endpoint=f'/skus/{sku}',
-                payload=payload_str,
+                payload=[{'special_price': new_price}],
             )
             plugg_to_api_logger.info(
                 f'Product: {sku} updated price to {new_price}'
@@ -152,12 +184,169 @@ class PluggToAPI:
         except PluggToAPIError as e:
             raise PluggToAPIError(f'Failed to update price: {str(e)}')
 
-    def update_prices(self, pricing_df: pd.DataFrame):
+    def _get_result(self, sku: str, new_price: float, error: str = None):
+        if error:
+            plugg_to_api_logger.error(
+                f'Product: {sku} failed to update price: {error}'
+            )
+        return {
+            'sku (*)': sku,
+            'price': new_price,
+            'success': not error,
+            'error': error,
+        }
+
+    @benchmark_with(plugg_to_api_logger)
+    @logging_with(plugg_to_api_logger)
+    def update_prices(self, pricing_df: pd.DataFrame) -> List[Dict]:
+        skus = pricing_df['sku (*)'].astype(str).tolist()
+        prices = pricing_df['special_price'].tolist()
+        results = []
+        for sku, new_price in zip(skus, prices):
+            try:
+                self.update_price(sku=sku, new_price=new_price)
+                results.append(self._get_result(sku, new_price))
+            except PluggToAPIError as e:
+                results.append(self._get_result(sku, new_price, str(e)))
+        return results
+
+
+class AsyncPluggToAPI(PluggToAPI):
+    def __init__(
+        self,
+        base_url: str = base_url,
+        credentials_path: str = plugg_to_credentials_path,
+        http_client: PooledHTTPClient = None,
+        token_cache: TokenCache = None,
+        max_concurrency: int = 10,
+        requests_per_second: float = 5.0,
+        max_retries: int = 3,
+        backoff_factor: float = 1.0,
+        rate_limiter: TokenBucket = None,
+    ):
+        super().__init__(
+            base_url=base_url,
+            credentials_path=credentials_path,
+            http_client=http_client,
+            token_cache=token_cache,
+        )
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.semaphore = None
+        self.shared_rate_limiter = rate_limiter
+        # O semáforo, o limitador e o cliente assíncrono pertencem ao loop
+        # de cada asyncio.run, então envios de threads diferentes esperam
+        self.push_lock = threading.Lock()
+        self.rate_limiter = None
+
+    def _get_retry_delay(self, attempt: int, response: httpx.Response):
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2**attempt
+
+    async def _connect_async(
+        self,
+        method: str = 'GET',
+        endpoint: str = '',
+        payload: List = None,
+        headers: Dict = None,
+    ):
         try:
-            for index, row in pricing_df.iterrows():
-                self.update_price(
-                    sku=str(row['sku (*)']), new_price=row['special_price']
+            method = method.upper()
+            if method not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+                raise ValueError(f'Unsupported HTTP method: {method}')
+            json_payload = None if method in ['GET', 'DELETE'] else payload
+
+            client = self.http_client.async_client
+            attempt = 0
+            refreshed = False
+            while True:
+                # Renovar o token faz um POST síncrono e trava o arquivo do
+                # cache, então isso roda fora do loop
+                if self.token_cache.is_valid():
+                    self.access_token = self.token_cache.access_token
+                else:
+                    await asyncio.to_thread(self._set_access_token)
+                access_token = self.access_token
+                await self.rate_limiter.acquire()
+                async with self.semaphore:
+                    response = await client.request(
+                        method,
+                        self.base_url + endpoint,
+                        json=json_payload,
+                        headers=self._get_headers(headers),
+                    )
+                if response.status_code == 401 and not refreshed:
+                    plugg_to_api_logger.warning(
+                        f'Access token rejected on {endpoint}, refreshing it'
+                    )
+                    await asyncio.to_thread(
+                        self.token_cache.invalidate, access_token
+                    )
+                    refreshed = True
+                    continue
+                if response.status_code != 429 or attempt == self.max_retries:
+                    break
+                delay = self._get_retry_delay(attempt, response)
+                plugg_to_api_logger.warning(
+                    f'Rate limited on {endpoint}, retrying in {delay:.1f}s'
                 )
+                attempt += 1
+                await asyncio.sleep(delay)
+
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPStatusError as e:
+            raise PluggToAPIError(f'HTTP error occurred: {str(e)}')
+        except httpx.RequestError as e:
+            raise PluggToAPIError(f'Failed to connect: {str(e)}')
+        except ValueError as e:
+            raise PluggToAPIError(str(e))
         except Exception as e:
-            PluggToAPIError(e)
-            raise
+            raise PluggToAPIError(f'Failed to connect: {str(e)}')
+
+    async def _update_price_async(self, sku: str, new_price: float) -> Dict:
+        try:
+            await self._connect_async(
+                method='PUT',
+                endpoint=f'/skus/{sku}',
+                payload=[{'special_price': new_price}],
+            )
+            plugg_to_api_logger.info(
+                f'Product: {sku} updated price to {new_price}'
+            )
+            return self._get_result(sku, new_price)
+        except PluggToAPIError as e:
+            return self._get_result(sku, new_price, str(e))
+
+    async def update_prices_async(
+        self, skus: List[str], prices: List[float]
+    ) -> List[Dict]:
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.rate_limiter = self.shared_rate_limiter or TokenBucket(
+            rate=self.requests_per_second
+        )
+        try:
+            return await asyncio.gather(
+                *(
+                    self._update_price_async(sku, new_price)
+                    for sku, new_price in zip(skus, prices)
+                )
+            )
+        finally:
+            await self.http_client.aclose()
+
+    @benchmark_with(plugg_to_api_logger)
+    @logging_with(plugg_to_api_logger)
+    def update_prices(self, pricing_df: pd.DataFrame) -> List[Dict]:
+        with self.push_lock:
+            return asyncio.run(
+                self.update_prices_async(
+                    skus=pricing_df['sku (*)'].astype(str).tolist(),
+                    prices=pricing_df['special_price'].tolist(),
+                )
+            )
@@ -1,14 +1,17 @@
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from os import path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 
 import httpx
-from httpx import Response
 from kami_logging import benchmark_with, logging_with
 from requests.exceptions import HTTPError, RequestException
 
-from kami_pricing.constant import ROOT_DIR
+from kami_pricing.api.http_client import PooledHTTPClient
+from kami_pricing.api.ttl_cache import TTLCache
+from kami_pricing.constant import PRODUCTS_DIR, ROOT_DIR
+from kami_pricing.fetcher import TokenBucket
 
 tiny_api_logger = logging.getLogger('Tiny API')
 base_url = 'https://api.tiny.com.br/api2/'
@@ -24,12 +27,36 @@ class TinyAPI:
         self,
         base_url: str = base_url,
         credentials_path: str = tiny_credentials_path,
+        http_client: PooledHTTPClient = None,
+        requests_per_minute: int = 30,
+        max_workers: int = 4,
+        product_cache: TTLCache = None,
     ):
         self.base_url = base_url
         self.credentials_path = credentials_path
+        self.http_client = http_client or PooledHTTPClient()
+        self.max_workers = max_workers
+        # A cota do Tiny é por minuto, sem rajadas acima dela
+        self.rate_limiter = TokenBucket(
+            rate=requests_per_minute / 60, capacity=1
+        )
+        if product_cache is None:
+            product_cache = TTLCache(
+                file_path=path.join(PRODUCTS_DIR, 'tiny.json')
+            )
+        self.product_cache = product_cache
         self.credentials = None
         self.result = None
 
+    def close(self):
+        self.http_client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     @benchmark_with(tiny_api_logger)
     @logging_with(tiny_api_logger)
     def _set_credentials(self):
@@ -51,8 +78,6 @@ class TinyAPI:
         except Exception as e:
             raise TinyAPIError(f'Failed to get credentials: {str(e)}')
 
-    @benchmark_with(tiny_api_logger)
-    @logging_with(tiny_api_logger)
     def _connect(
         self,
         method: str = 'POST',
@@ -73,30 +98,33 @@ class TinyAPI:
 
             method = method.upper()
 
-            with httpx.Client() as client:
-                response = {
-                    'GET': lambda: client.get(
-                        base_url + endpoint, headers=headers
-                    ),
-                    'POST': lambda: client.post(
-                        base_url + endpoint, json=payload, headers=headers
-                    ),
-                    'PUT': lambda: client.put(
-                        base_url + endpoint, json=payload, headers=headers
-                    ),
-                    'DELETE': lambda: client.delete(
-                        base_url + endpoint, headers=headers
-                    ),
-                    'PATCH': lambda: client.patch(
-                        base_url + endpoint, json=payload, headers=headers
-                    ),
-                }.get(method, lambda: None)()
-
-                if response is None:
-                    raise ValueError(f'Unsupported HTTP method: {method}')
-
-                response.raise_for_status()
-                self.result = response.json()
+            self.rate_limiter.acquire_sync()
+            client = self.http_client.client
+            response = {
+                'GET': lambda: client.get(
+                    self.base_url + endpoint, headers=headers
+                ),
+                'POST': lambda: client.post(
+                    self.base_url + endpoint, json=payload, headers=headers
+                ),
+                'PUT': lambda: client.put(
+                    self.base_url + endpoint, json=payload, headers=headers
+                ),
+                'DELETE': lambda: client.delete(
+                    self.base_url + endpoint, headers=headers
+                ),
+                'PATCH': lambda: client.patch(
+                    self.base_url + endpoint, json=payload, headers=headers
+                ),
+            }.get(method, lambda: None)()
+
+            if response is None:
+                raise ValueError(f'Unsupported HTTP method: {method}')
+
+            response.raise_for_status()
+            result = response.json()
+            self.result = result
+            return result
 
         except httpx.HTTPStatusError as e:
             raise TinyAPIError(f'HTTP error occurred: {str(e)}')
@@ -107,14 +135,17 @@ class TinyAPI:
         except Exception as e:
             raise TinyAPIError(f'Failed to connect: {str(e)}')
 
-    @benchmark_with(tiny_api_logger)
-    @logging_with(tiny_api_logger)
     def get_product_by_sku(self, sku: str) -> Dict:
+        product_dict = self.product_cache.get(sku)
+        if product_dict is not None:
+            return product_dict
+
         endpoint = 'produtos.pesquisa.php'
         try:
             response = self._connect(endpoint=endpoint, query=sku)
             if 'retorno' in response and response['retorno']['status'] == 'OK':
                 product_dict = response['retorno']['produtos'][0]['produto']
+                self.product_cache.put(sku, product_dict)
                 return product_dict
             elif (
                 'retorno' in response
@@ -128,21 +159,41 @@ class TinyAPI:
         except RequestException as e:
             raise RequestException(f'An request error occurred: {str(e)}')
 
+    def _get_product_or_error(self, sku: str) -> Dict:
+        try:
+            return self.get_product_by_sku(sku)
+        except Exception as e:
+            return {'sku': sku, 'error': str(e)}
+
+    def iter_products_by_sku(
+        self, sku_list: List[str]
+    ) -> Iterator[Tuple[str, Dict]]:
+        missing = []
+        for sku in dict.fromkeys(sku_list):
+            product_dict = self.product_cache.get(sku)
+            if product_dict is None:
+                missing.append(sku)
+            else:
+                yield sku, product_dict
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self._get_product_or_error, sku): sku
+                    for sku in missing
+                }
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+        finally:
+            self.product_cache.save()
+
     @benchmark_with(tiny_api_logger)
     @logging_with(tiny_api_logger)
     def get_products_list_by_sku(self, sku_list: List[str]) -> List[dict]:
-        products_list = []
+        products = {}
         try:
-            for sku in sku_list:
-                product_dict = {}
-                try:
-                    product_data = self.get_product_by_sku(sku)
-                    product_dict = product_data
-                except Exception as e:
-                    product_dict = {'sku': sku, 'error': str(e)}
-                finally:
-                    products_list.append(product_dict)
+            products = dict(self.iter_products_by_sku(sku_list))
         except Exception as e:
             raise TinyAPIError(f'An unknown error occurred: {str(e)}')
         finally:
-            return products_list
+            return [products.get(sku, {}) for sku in sku_list]
@@ -0,0 +1,108 @@
+import fcntl
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from os import makedirs, path
+from typing import Callable, Dict
+
+token_cache_logger = logging.getLogger('Token Cache')
+
+
+class TokenCache:
+    def __init__(
+        self,
+        file_path: str = None,
+        refresh_margin: float = 60,
+        default_expires_in: float = 3600,
+    ):
+        self.file_path = file_path
+        self.refresh_margin = refresh_margin
+        self.default_expires_in = default_expires_in
+        self.access_token = None
+        self.expires_at = 0
+        self.lock = threading.Lock()
+
+    def is_valid(self) -> bool:
+        return bool(self.access_token) and (
+            time.time() < self.expires_at - self.refresh_margin
+        )
+
+    def get(self) -> str | None:
+        if not self.is_valid():
+            self._load()
+        return self.access_token if self.is_valid() else None
+
+    def set(self, access_token: str, expires_in: float):
+        self.access_token = access_token
+        self.expires_at = time.time() + float(expires_in)
+
+    def invalidate(self, access_token: str = None):
+        with self.lock, self._file_lock():
+            # O token rejeitado também sai do arquivo, senão o próximo get
+            # o leria de volta; só invalida se ninguém o renovou desde a falha
+            self._load()
+            if access_token is None or access_token == self.access_token:
+                self.access_token = None
+                self.expires_at = 0
+                self._save()
+
+    @contextmanager
+    def _file_lock(self):
+        if self.file_path is None:
+            yield
+            return
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        with open(f'{self.file_path}.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        if self.file_path is None:
+            return
+        try:
+            with open(self.file_path, 'r') as f:
+                data = json.load(f)
+            self.access_token = data.get('access_token')
+            self.expires_at = data.get('expires_at', 0)
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            token_cache_logger.error(
+                f'The token cache at {self.file_path} contains invalid JSON, it will be replaced.'
+            )
+
+    def _save(self):
+        if self.file_path is None:
+            return
+        with open(self.file_path, 'w') as f:
+            json.dump(
+                {
+                    'access_token': self.access_token,
+                    'expires_at': self.expires_at,
+                },
+                f,
+            )
+
+    def get_or_refresh(self, request_token: Callable[[], Dict]) -> str:
+        access_token = self.get()
+        if access_token:
+            return access_token
+
+        with self.lock, self._file_lock():
+            # Outro processo pode ter renovado enquanto esperávamos o lock
+            access_token = self.get()
+            if access_token:
+                return access_token
+            token = request_token()
+            expires_in = token.get('expires_in') or self.default_expires_in
+            self.set(token['access_token'], expires_in)
+            self._save()
+            token_cache_logger.info(
+                f'Access token refreshed, expires in {expires_in}s'
+            )
+            return self.access_token
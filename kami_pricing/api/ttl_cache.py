@@ -0,0 +1,75 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from os import makedirs, path
+from typing import Any
+
+ttl_cache_logger = logging.getLogger('TTL Cache')
+
+
+class TTLCache:
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_entries: int = 10000,
+        file_path: str = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.file_path = file_path
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if self.file_path is None:
+            return
+        try:
+            with open(self.file_path, 'r') as f:
+                entries = json.load(f)
+            self.entries = OrderedDict(
+                (key, tuple(entry)) for key, entry in entries.items()
+            )
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            ttl_cache_logger.error(
+                f'The cache at {self.file_path} contains invalid JSON, it will be rebuilt.'
+            )
+
+    def save(self):
+        if self.file_path is None:
+            return
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        with self.lock:
+            entries = dict(self.entries)
+        with open(self.file_path, 'w') as f:
+            json.dump(entries, f)
+
+    def get(self, key: str) -> Any | None:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any):
+        with self.lock:
+            self.entries[key] = (time.time(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -3,8 +3,16 @@ import os
 SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROOT_DIR = os.path.abspath(SOURCE_DIR + '/../')
 ID_HAIRPRO_SHEET = '1u7dCTQzbqgKSSjpSVtsUl7ea2j2YgW4Ko2nB9akE1ws'
+COMPANIES_SHEETS = {'HAIRPRO': ID_HAIRPRO_SHEET}
 GOOGLE_API_CREDENTIALS = os.path.join(ROOT_DIR, 'credentials/google_api.json')
 PRICING_MANAGER_FILE = os.path.join(ROOT_DIR, 'settings/pricing_manager.json')
+PAGE_CACHE_DIR = os.path.join(ROOT_DIR, 'cache/pages')
+SNAPSHOTS_DIR = os.path.join(ROOT_DIR, 'cache/snapshots')
+INDEXES_DIR = os.path.join(ROOT_DIR, 'cache/indexes')
+TOKENS_DIR = os.path.join(ROOT_DIR, 'cache/tokens')
+PRODUCTS_DIR = os.path.join(ROOT_DIR, 'cache/products')
+SHEETS_DIR = os.path.join(ROOT_DIR, 'cache/sheets')
+HISTORY_DIR = os.path.join(ROOT_DIR, 'history')
 COLUMNS_ALL_SELLER = [
     'sku',
     'brand',
@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import makedirs, path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from kami_pricing.sheets import get_sheet_revision
+
+cost_table_logger = logging.getLogger('cost table')
+COST_COLUMNS = ['CUSTO', 'FRETE', 'INSUMO']
+
+
+class CostTableError(Exception):
+    pass
+
+
+def parse_brl_decimals(frame: pd.DataFrame) -> pd.DataFrame:
+    values = pd.Series(frame.to_numpy(dtype=object).ravel(), dtype=str)
+    values = values.str.replace('R$', '', regex=False).str.strip()
+    # '1.234,56' é formato brasileiro, '12.5' já vem em formato numérico
+    brazilian = values.str.contains(',', regex=False, na=False)
+    values = values.where(
+        ~brazilian,
+        values.str.replace('.', '', regex=False).str.replace(
+            ',', '.', regex=False
+        ),
+    )
+    parsed = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+    return pd.DataFrame(
+        parsed.reshape(frame.shape), index=frame.index, columns=frame.columns
+    )
+
+
+# cost_join='local' lê os custos direto de cost_range, por padrão a aba
+# ebit, com cabeçalho na linha 1 e as colunas 'sku (*)', 'CUSTO', 'FRETE'
+# e 'INSUMO' (valores em R$, '1.234,56' ou '12.5'). A aba só traz os SKUs
+# da última escrita, então os que faltam na tabela seguem o modo 'sheet'
+# e são somados a ela.
+class CostTable:
+    def __init__(
+        self,
+        sheet_id: str,
+        cost_range: str = 'ebit!A1:E',
+        get_revision: Callable[[str], str] = get_sheet_revision,
+        file_path: str = None,
+    ):
+        self.sheet_id = sheet_id
+        self.cost_range = cost_range
+        self.get_revision = get_revision
+        self.file_path = file_path
+        self.revision = None
+        self.costs = None
+        self.lock = threading.Lock()
+        self.sheet_lock = threading.Lock()
+        self.report_executor = None
+        self._load()
+
+    def _load(self):
+        # A tabela salva vale enquanto a revisão da planilha não mudar,
+        # então um novo processo também pula o download e a conversão
+        if self.file_path is None:
+            return
+        try:
+            with open(self.file_path, 'r') as f:
+                data = json.load(f)
+            costs = pd.DataFrame.from_dict(
+                data['costs'], orient='index', columns=COST_COLUMNS
+            ).astype(np.float64)
+            costs.index = costs.index.astype(str)
+            self.costs = costs
+            self.revision = data['revision']
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, ValueError):
+            cost_table_logger.error(
+                f'The cost table at {self.file_path} is invalid, it will be rebuilt.'
+            )
+
+    def save(self):
+        if self.file_path is None or self.costs is None:
+            return
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        with self.lock:
+            data = {
+                'revision': self.revision,
+                'costs': dict(
+                    zip(self.costs.index, self.costs.to_numpy().tolist())
+                ),
+            }
+        tmp_path = f'{self.file_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.file_path)
+
+    def current_revision(self) -> str | None:
+        try:
+            return self.get_revision(self.sheet_id)
+        except Exception as e:
+            cost_table_logger.error(
+                f'Could not read the revision of {self.sheet_id}: {str(e)}'
+            )
+            return None
+
+    def is_fresh(self) -> bool:
+        if self.costs is None:
+            return False
+        revision = self.current_revision()
+        with self.lock:
+            return revision is not None and revision == self.revision
+
+    def lookup(
+        self, skus: pd.Series, fresh: bool = None
+    ) -> pd.DataFrame | None:
+        if fresh is None:
+            fresh = self.is_fresh()
+        if not fresh:
+            return None
+        keys = skus.astype(str)
+        if not keys.isin(self.costs.index).all():
+            return None
+        return self.costs.loc[keys].reset_index(drop=True)
+
+    def load(self, raw_df: pd.DataFrame, merge: bool = False) -> pd.DataFrame:
+        missing = [
+            column
+            for column in ['sku (*)'] + COST_COLUMNS
+            if column not in raw_df.columns
+        ]
+        if missing:
+            raise CostTableError(
+                f'The cost sheet is missing the columns: {missing}'
+            )
+        costs = parse_brl_decimals(raw_df[COST_COLUMNS])
+        costs.index = raw_df['sku (*)'].astype(str)
+        costs = costs[~costs.index.duplicated(keep='last')]
+        # A aba ebit só traz o lote recém escrito; se a tabela estava em dia
+        # antes dessa escrita, os custos dos outros lotes continuam valendo
+        if merge and self.costs is not None:
+            kept = self.costs[~self.costs.index.isin(costs.index)]
+            costs = pd.concat([kept, costs])
+        self.costs = costs
+        revision = self.current_revision()
+        with self.lock:
+            self.revision = revision
+        self.save()
+        return self.costs
+
+    def _run_report(self, write: Callable, *args):
+        # A aba ebit só comporta um lote de preços por vez
+        with self.sheet_lock:
+            was_fresh = self.is_fresh()
+            try:
+                write(*args)
+            except Exception as e:
+                cost_table_logger.exception(
+                    f'Failed to report prices to {self.sheet_id}: {str(e)}'
+                )
+                return
+            # A própria escrita muda a revisão, sem invalidar os custos
+            if was_fresh:
+                revision = self.current_revision()
+                with self.lock:
+                    self.revision = revision
+                self.save()
+
+    def submit_report(self, write: Callable, *args) -> Future:
+        if self.report_executor is None:
+            self.report_executor = ThreadPoolExecutor(max_workers=1)
+        return self.report_executor.submit(self._run_report, write, *args)
@@ -0,0 +1,94 @@
+import json
+import logging
+from html.parser import HTMLParser
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+extractors_logger = logging.getLogger('extractors')
+BELEZA_NA_WEB_OFFER_CLASS = 'btn btn-block btn-primary btn-lg js-add-to-cart'
+
+
+class OfferExtractor:
+    def __init__(
+        self,
+        tag: str = 'a',
+        class_: str = BELEZA_NA_WEB_OFFER_CLASS,
+        attribute: str = 'data-sku',
+    ):
+        self.tag = tag
+        self.class_ = class_
+        self.attribute = attribute
+
+    def get_offers_data(self, content: bytes) -> List[str]:
+        raise NotImplementedError
+
+    def extract(self, content: bytes) -> List[Dict]:
+        return [
+            json.loads(offer_data)[0]
+            for offer_data in self.get_offers_data(content)
+        ]
+
+
+class SoupOfferExtractor(OfferExtractor):
+    def get_offers_data(self, content: bytes) -> List[str]:
+        soup = BeautifulSoup(content, 'html.parser')
+        return [
+            offer.get(self.attribute)
+            for offer in soup.find_all(self.tag, class_=self.class_)
+        ]
+
+
+class _OfferParser(HTMLParser):
+    def __init__(self, tag: str, class_: str, attribute: str):
+        super().__init__()
+        self.tag = tag
+        self.class_ = class_
+        self.attribute = attribute
+        self.offers_data = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != self.tag:
+            return
+        attrs = dict(attrs)
+        if attrs.get('class') == self.class_:
+            self.offers_data.append(attrs.get(self.attribute))
+
+
+class StreamOfferExtractor(OfferExtractor):
+    def get_offers_data(self, content: bytes) -> List[str]:
+        parser = _OfferParser(self.tag, self.class_, self.attribute)
+        parser.feed(content.decode('utf-8'))
+        parser.close()
+        return parser.offers_data
+
+
+class FallbackOfferExtractor(OfferExtractor):
+    def __init__(self, extractor: OfferExtractor, **kwargs):
+        super().__init__(**kwargs)
+        self.extractor = extractor
+        self.fallback = SoupOfferExtractor(**kwargs)
+
+    def extract(self, content: bytes) -> List[Dict]:
+        try:
+            return self.extractor.extract(content)
+        except Exception as e:
+            extractors_logger.warning(
+                f'{type(self.extractor).__name__} failed, falling back to {type(self.fallback).__name__}: {str(e)}'
+            )
+            return self.fallback.extract(content)
+
+
+OFFER_EXTRACTORS = {
+    'soup': SoupOfferExtractor,
+    'stream': StreamOfferExtractor,
+}
+
+
+def get_offer_extractor(name: str, **kwargs) -> OfferExtractor:
+    if name not in OFFER_EXTRACTORS:
+        raise ValueError(f'Unsupported offer extractor: {name}')
+    extractor = OFFER_EXTRACTORS[name](**kwargs)
+    if name == 'soup':
+        return extractor
+    return FallbackOfferExtractor(extractor, **kwargs)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+import httpx
+
+fetcher_logger = logging.getLogger('fetcher')
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:79.0) Gecko/20100101 Firefox/79.0'
+}
+
+
+class FetcherError(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.thread_lock = threading.Lock()
+
+    def _take(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate,
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        # Sem trava do asyncio, o balde pode ser dividido entre event loops
+        while True:
+            with self.thread_lock:
+                delay = self._take()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self):
+        with self.thread_lock:
+            while True:
+                delay = self._take()
+                if not delay:
+                    return
+                time.sleep(delay)
+
+
+class AsyncFetcher:
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        requests_per_second: float = 5.0,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        headers: Dict = None,
+        transport: httpx.AsyncBaseTransport = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.headers = headers or DEFAULT_HEADERS
+        self.transport = transport
+        self.client = None
+        self.semaphore = None
+        self.buckets = {}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            follow_redirects=True,
+            transport=self.transport,
+        )
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *args):
+        await self.client.aclose()
+        self.client = None
+
+    def _get_bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(rate=self.requests_per_second)
+        return self.buckets[host]
+
+    def _get_retry_delay(self, attempt: int, response=None) -> float:
+        retry_after = None
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2**attempt
+
+    async def fetch(self, url: str, headers: Dict = None) -> httpx.Response:
+        if self.client is None:
+            raise FetcherError(
+                'AsyncFetcher must be used as a context manager.'
+            )
+
+        for attempt in range(self.max_retries + 1):
+            response = None
+            await self._get_bucket(url).acquire()
+            try:
+                async with self.semaphore:
+                    response = await self.client.get(url, headers=headers)
+                if response.status_code == 304:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = f'HTTP status {response.status_code}'
+            except httpx.HTTPStatusError as e:
+                raise FetcherError(f'HTTP error occurred: {str(e)}')
+            except httpx.TransportError as e:
+                error = str(e) or type(e).__name__
+
+            if attempt == self.max_retries:
+                raise FetcherError(f'Failed to fetch {url}: {error}')
+
+            delay = self._get_retry_delay(attempt, response)
+            fetcher_logger.warning(
+                f'Retrying {url} in {delay:.1f}s after: {error}'
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,268 @@
+import logging
+import os
+import uuid
+from os import makedirs, path
+from typing import Dict, Iterable, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from kami_pricing.constant import HISTORY_DIR
+from kami_pricing.snapshot import get_push_status
+
+history_logger = logging.getLogger('price history')
+CAPTURED_AT = pa.timestamp('us', tz='UTC')
+HISTORY_SCHEMAS = {
+    'offers': pa.schema(
+        [
+            ('sku', pa.string()),
+            ('brand', pa.string()),
+            ('category', pa.string()),
+            ('name', pa.string()),
+            ('price', pa.float64()),
+            ('seller_name', pa.string()),
+            ('company', pa.string()),
+            ('marketplace', pa.string()),
+            ('captured_at', CAPTURED_AT),
+        ]
+    ),
+    'prices': pa.schema(
+        [
+            ('sku', pa.string()),
+            ('special_price', pa.float64()),
+            ('pushed', pa.bool_()),
+            ('company', pa.string()),
+            ('marketplace', pa.string()),
+            ('integrator', pa.string()),
+            ('captured_at', CAPTURED_AT),
+        ]
+    ),
+}
+PARTITIONING = ds.partitioning(
+    pa.schema([('date', pa.string())]), flavor='hive'
+)
+
+
+def to_utc(value) -> pd.Timestamp:
+    value = pd.Timestamp(value)
+    if value.tzinfo is None:
+        return value.tz_localize('UTC')
+    return value.tz_convert('UTC')
+
+
+class PriceHistory:
+    def __init__(
+        self, root_dir: str = HISTORY_DIR, row_group_size: int = 10000
+    ):
+        self.root_dir = root_dir
+        self.row_group_size = row_group_size
+
+    def _append(
+        self, dataset: str, df: pd.DataFrame, captured_at: pd.Timestamp
+    ) -> str | None:
+        if df.empty:
+            return None
+        schema = HISTORY_SCHEMAS[dataset]
+        df = df.assign(captured_at=captured_at)
+        for column in schema.names:
+            if schema.field(column).type == pa.string():
+                df[column] = (
+                    df[column]
+                    .astype(object)
+                    .map(lambda value: None if pd.isna(value) else str(value))
+                )
+        # ordenado por sku, as estatísticas de cada row group deixam as
+        # consultas por sku pularem o resto do arquivo
+        df = df.sort_values(['sku', 'captured_at'], kind='stable')
+        table = pa.Table.from_pandas(
+            df[schema.names], schema=schema, preserve_index=False
+        )
+
+        # Cada ciclo grava um arquivo novo na partição do dia, nada é
+        # reescrito; o nome temporário começa com '.' para não ser lido
+        # antes de completo
+        partition_dir = path.join(
+            self.root_dir, dataset, f'date={captured_at:%Y-%m-%d}'
+        )
+        makedirs(partition_dir, exist_ok=True)
+        file_name = f'{captured_at:%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet'
+        tmp_path = path.join(partition_dir, f'.{file_name}.tmp')
+        file_path = path.join(partition_dir, file_name)
+        pq.write_table(table, tmp_path, row_group_size=self.row_group_size)
+        os.replace(tmp_path, file_path)
+        return file_path
+
+    def append_offers(
+        self,
+        offers_df: pd.DataFrame,
+        company: str,
+        marketplace: str,
+        captured_at=None,
+    ) -> str | None:
+        captured_at = to_utc(captured_at or pd.Timestamp.now(tz='UTC'))
+        return self._append(
+            'offers',
+            offers_df.assign(company=company, marketplace=marketplace),
+            captured_at,
+        )
+
+    def append_prices(
+        self,
+        pricing_df: pd.DataFrame,
+        company: str,
+        marketplace: str,
+        integrator: str,
+        results: List = None,
+        captured_at=None,
+    ) -> str | None:
+        captured_at = to_utc(captured_at or pd.Timestamp.now(tz='UTC'))
+        skus = pricing_df['sku (*)'].astype(str)
+        # sem resultado de sucesso (falha, preço inalterado ou anúncio não
+        # encontrado) o preço fica registrado como não enviado
+        push_status = get_push_status(results)
+        prices_df = pd.DataFrame(
+            {
+                'sku': skus,
+                'special_price': pricing_df['special_price'],
+                'pushed': skus.map(push_status).eq(True),
+                'company': company,
+                'marketplace': marketplace,
+                'integrator': integrator,
+            }
+        )
+        return self._append('prices', prices_df, captured_at)
+
+    def record(
+        self,
+        sellers_df: pd.DataFrame,
+        pricing_df: pd.DataFrame,
+        results: List,
+        company: str,
+        marketplace: str,
+        integrator: str,
+        captured_at=None,
+    ):
+        captured_at = to_utc(captured_at or pd.Timestamp.now(tz='UTC'))
+        self.append_offers(sellers_df, company, marketplace, captured_at)
+        self.append_prices(
+            pricing_df, company, marketplace, integrator, results, captured_at
+        )
+        history_logger.info(
+            f'Recorded {len(sellers_df)} offers and {len(pricing_df)} prices of {company} at {captured_at}'
+        )
+
+    def _filter(
+        self, start=None, end=None, **values: Iterable
+    ) -> ds.Expression:
+        # o filtro em 'date' poda partições inteiras, os demais descem até
+        # as estatísticas dos row groups do parquet
+        expression = ds.scalar(True)
+        if start is not None:
+            start = to_utc(start)
+            expression &= ds.field('date') >= f'{start:%Y-%m-%d}'
+            expression &= ds.field('captured_at') >= pa.scalar(
+                start, type=CAPTURED_AT
+            )
+        if end is not None:
+            end = to_utc(end)
+            expression &= ds.field('date') <= f'{end:%Y-%m-%d}'
+            expression &= ds.field('captured_at') <= pa.scalar(
+                end, type=CAPTURED_AT
+            )
+        for column, value in values.items():
+            if value is None:
+                continue
+            if isinstance(value, str):
+                value = [value]
+            expression &= ds.field(column).isin([str(v) for v in value])
+        return expression
+
+    def read(
+        self,
+        dataset: str,
+        columns: List[str] = None,
+        start=None,
+        end=None,
+        **values: Iterable,
+    ) -> pd.DataFrame:
+        schema = HISTORY_SCHEMAS[dataset]
+        columns = columns or schema.names
+        dataset_dir = path.join(self.root_dir, dataset)
+        if not path.isdir(dataset_dir):
+            return pd.DataFrame(columns=columns)
+        history = ds.dataset(
+            dataset_dir,
+            format='parquet',
+            schema=schema.append(pa.field('date', pa.string())),
+            partitioning=PARTITIONING,
+        )
+        table = history.to_table(
+            columns=columns, filter=self._filter(start, end, **values)
+        )
+        history_df = table.to_pandas()
+        if 'captured_at' in columns:
+            history_df = history_df.sort_values(
+                'captured_at', kind='stable', ignore_index=True
+            )
+        return history_df
+
+    def sku_offers(
+        self, sku: str, start=None, end=None, **values: Iterable
+    ) -> pd.DataFrame:
+        offers_df = self.read(
+            'offers',
+            columns=['captured_at', 'seller_name', 'price'],
+            start=start,
+            end=end,
+            sku=sku,
+            **values,
+        )
+        return offers_df.pivot_table(
+            index='captured_at',
+            columns='seller_name',
+            values='price',
+            aggfunc='min',
+        )
+
+    def seller_offers(
+        self, seller: str, start=None, end=None, **values: Iterable
+    ) -> pd.DataFrame:
+        offers_df = self.read(
+            'offers',
+            columns=['captured_at', 'sku', 'price'],
+            start=start,
+            end=end,
+            seller_name=seller,
+            **values,
+        )
+        return offers_df.pivot_table(
+            index='captured_at', columns='sku', values='price', aggfunc='min'
+        )
+
+    def sku_prices(
+        self, sku: str, start=None, end=None, **values: Iterable
+    ) -> pd.Series:
+        prices_df = self.read(
+            'prices',
+            columns=['captured_at', 'special_price'],
+            start=start,
+            end=end,
+            sku=sku,
+            **values,
+        )
+        return prices_df.set_index('captured_at')['special_price']
+
+    def last_prices(self, start=None, **values: Iterable) -> Dict:
+        prices_df = self.read(
+            'prices',
+            columns=['captured_at', 'sku', 'special_price'],
+            start=start,
+            **values,
+        )
+        return (
+            prices_df.drop_duplicates(subset='sku', keep='last')
+            .set_index('sku')['special_price']
+            .to_dict()
+        )
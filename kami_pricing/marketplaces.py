@@ -0,0 +1,79 @@
+import logging
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+from kami_pricing.extractors import get_offer_extractor
+
+marketplaces_logger = logging.getLogger('marketplaces')
+
+
+class MarketplaceAdapter:
+    hosts: Tuple[str, ...] = ()
+    headers: Dict = {}
+
+    def __init__(self, extractor: str = 'stream'):
+        self.extractor = extractor
+
+    def normalize_url(self, url: str) -> str | None:
+        url = str(url).strip()
+        host = urlparse(url).hostname or ''
+        if self.hosts and not any(
+            host == allowed or host.endswith(f'.{allowed}')
+            for allowed in self.hosts
+        ):
+            marketplaces_logger.warning(
+                f'{url} does not belong to {type(self).__name__}, skipping it.'
+            )
+            return None
+        return url
+
+    def extract_rows(self, content: bytes) -> List[List]:
+        raise NotImplementedError
+
+
+class BelezaNaWebAdapter(MarketplaceAdapter):
+    hosts = ('belezanaweb.com.br',)
+
+    def __init__(self, extractor: str = 'stream'):
+        super().__init__(extractor=extractor)
+        self.offer_extractor = get_offer_extractor(extractor)
+
+    def extract_rows(self, content: bytes) -> List[List]:
+        sellers_list = []
+        for row in self.offer_extractor.extract(content):
+            marketplaces_logger.info(
+                f"Extraindo dados do vendedor Id: {row['seller']['id']} \
+                    | Loja: {row['seller']['name']} "
+            )
+
+            sellers_row = [
+                row['sku'],
+                row['brand'],
+                row['category'],
+                row['name'],
+                row['price'],
+                row['seller']['name'],
+            ]
+            sellers_list.append(sellers_row)
+
+        return sellers_list
+
+
+MARKETPLACE_ADAPTERS = {
+    'BELEZA_NA_WEB': BelezaNaWebAdapter,
+}
+
+
+def register_marketplace(name: str):
+    def register(adapter_class: type) -> type:
+        MARKETPLACE_ADAPTERS[name.upper()] = adapter_class
+        return adapter_class
+
+    return register
+
+
+def get_marketplace_adapter(name: str, **kwargs) -> MarketplaceAdapter:
+    adapter_class = MARKETPLACE_ADAPTERS.get(str(name).upper())
+    if adapter_class is None:
+        raise ValueError(f'Unsupported marketplace: {name}')
+    return adapter_class(**kwargs)
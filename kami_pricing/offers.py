@@ -0,0 +1,82 @@
+from typing import Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from kami_pricing.constant import COLUMNS_ALL_SELLER
+
+PRICE_COLUMN = COLUMNS_ALL_SELLER.index('price')
+
+
+class OffersBuffer:
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.prices = np.empty(capacity, dtype=np.float64)
+        self.codes = [
+            np.empty(capacity, dtype=np.int32)
+            for _ in range(len(COLUMNS_ALL_SELLER) - 1)
+        ]
+        self.categories = [[] for _ in self.codes]
+        self.lookups = [{} for _ in self.codes]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self, capacity: int):
+        if capacity <= len(self.prices):
+            return
+        capacity = max(capacity, 2 * len(self.prices))
+        prices = np.empty(capacity, dtype=np.float64)
+        prices[: self.size] = self.prices[: self.size]
+        self.prices = prices
+        for i, codes in enumerate(self.codes):
+            self.codes[i] = np.empty(capacity, dtype=np.int32)
+            self.codes[i][: self.size] = codes[: self.size]
+
+    def _encode(self, column: int, value) -> int:
+        if value is None:
+            return -1
+        lookup = self.lookups[column]
+        code = lookup.get(value)
+        if code is None:
+            code = len(self.categories[column])
+            lookup[value] = code
+            self.categories[column].append(value)
+        return code
+
+    def append(self, row: List):
+        self.extend([row])
+
+    def extend(self, rows: Iterable[List]):
+        rows = list(rows)
+        self._grow(self.size + len(rows))
+        for row in rows:
+            price = row[PRICE_COLUMN]
+            self.prices[self.size] = np.nan if price is None else price
+            values = row[:PRICE_COLUMN] + row[PRICE_COLUMN + 1 :]
+            for column, value in enumerate(values):
+                self.codes[column][self.size] = self._encode(column, value)
+            self.size += 1
+
+    def __iter__(self) -> Iterator[List]:
+        for i in range(self.size):
+            row = [
+                self.categories[column][codes[i]] if codes[i] >= 0 else None
+                for column, codes in enumerate(self.codes)
+            ]
+            row.insert(PRICE_COLUMN, float(self.prices[i]))
+            yield row
+
+    def to_frame(self, columns: List[str] = None) -> pd.DataFrame:
+        columns = columns or COLUMNS_ALL_SELLER
+        data = {}
+        categorical = iter(zip(self.codes, self.categories))
+        for i, name in enumerate(columns):
+            if i == PRICE_COLUMN:
+                data[name] = self.prices[: self.size]
+                continue
+            codes, categories = next(categorical)
+            data[name] = pd.Categorical.from_codes(
+                codes[: self.size], categories=pd.Index(categories)
+            )
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import time
+from os import listdir, makedirs, path, remove
+from typing import Callable, Dict, List
+
+from kami_logging import benchmark_with, logging_with
+
+from kami_pricing.constant import PAGE_CACHE_DIR
+from kami_pricing.extractors import BELEZA_NA_WEB_OFFER_CLASS
+
+page_cache_logger = logging.getLogger('page cache')
+
+
+class PageCache:
+    def __init__(
+        self,
+        cache_dir: str = PAGE_CACHE_DIR,
+        ttl: float = 86400,
+        max_entries: int = 10000,
+        offer_marker: str = BELEZA_NA_WEB_OFFER_CLASS,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.offer_marker = offer_marker.encode('utf-8')
+        self.stats = {'not_modified': 0, 'unchanged': 0, 'miss': 0}
+        makedirs(self.cache_dir, exist_ok=True)
+
+    def _get_entry_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return path.join(self.cache_dir, f'{key}.json')
+
+    def get(self, url: str) -> Dict | None:
+        entry_path = self._get_entry_path(url)
+        try:
+            with open(entry_path, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if time.time() - entry['stored_at'] > self.ttl:
+            remove(entry_path)
+            return None
+        return entry
+
+    def put(
+        self,
+        url: str,
+        headers: Dict,
+        offer_hash: str | None,
+        rows: List,
+    ):
+        entry = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'offer_hash': offer_hash,
+            'rows': rows,
+            'stored_at': time.time(),
+        }
+        try:
+            with open(self._get_entry_path(url), 'w') as f:
+                json.dump(entry, f)
+        except OSError as e:
+            page_cache_logger.error(f'Failed to cache {url}: {str(e)}')
+
+    def get_conditional_headers(self, entry: Dict | None) -> Dict:
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get_offer_hash(self, content: bytes) -> str | None:
+        first = content.find(self.offer_marker)
+        if first == -1:
+            return None
+        start = content.rfind(b'<', 0, first)
+        end = content.find(b'>', content.rfind(self.offer_marker))
+        return hashlib.sha256(content[start : end + 1]).hexdigest()
+
+    def resolve(
+        self,
+        url: str,
+        entry: Dict | None,
+        status_code: int,
+        headers: Dict,
+        content: bytes,
+        extract: Callable[[bytes], List],
+    ) -> List:
+        if status_code == 304 and entry:
+            self.stats['not_modified'] += 1
+            validators = {
+                'ETag': headers.get('ETag', entry['etag']),
+                'Last-Modified': headers.get(
+                    'Last-Modified', entry['last_modified']
+                ),
+            }
+            self.put(url, validators, entry['offer_hash'], entry['rows'])
+            return entry['rows']
+
+        offer_hash = self.get_offer_hash(content)
+        if entry and offer_hash and offer_hash == entry['offer_hash']:
+            self.stats['unchanged'] += 1
+            self.put(url, headers, offer_hash, entry['rows'])
+            return entry['rows']
+
+        self.stats['miss'] += 1
+        rows = extract(content)
+        self.put(url, headers, offer_hash, rows)
+        return rows
+
+    def evict(self):
+        entries = [
+            path.join(self.cache_dir, filename)
+            for filename in listdir(self.cache_dir)
+            if filename.endswith('.json')
+        ]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=path.getmtime)
+        for entry_path in entries[: len(entries) - self.max_entries]:
+            try:
+                remove(entry_path)
+            except OSError as e:
+                page_cache_logger.error(
+                    f'Failed to evict {entry_path}: {str(e)}'
+                )
+
+    @benchmark_with(page_cache_logger)
+    @logging_with(page_cache_logger)
+    def report(self):
+        page_cache_logger.info(
+            f"Page cache hits: {self.stats['not_modified']} not modified, "
+            f"{self.stats['unchanged']} unchanged offers | "
+            f"misses: {self.stats['miss']}"
+        )
+        self.evict()
+        self.stats = {key: 0 for key in self.stats}
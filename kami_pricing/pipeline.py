@@ -0,0 +1,156 @@
+import contextvars
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List
+
+import pandas as pd
+
+from kami_pricing.offers import OffersBuffer
+
+pipeline_logger = logging.getLogger('pricing pipeline')
+_DONE = object()
+
+
+class PricingPipeline:
+    def __init__(
+        self,
+        price: Callable[[List], pd.DataFrame],
+        push: Callable[[pd.DataFrame], List],
+        batch_size: int = 20,
+        max_batch_delay: float = 5.0,
+        queue_size: int = 8,
+        pricing_workers: int = 1,
+        push_workers: int = 1,
+    ):
+        self.price = price
+        self.push = push
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay
+        self.queue_size = queue_size
+        self.pricing_workers = pricing_workers
+        self.push_workers = push_workers
+        self.sellers = OffersBuffer()
+        self.priced = []
+        self.pushed = []
+        self.results = []
+        self.errors = []
+        self.lock = threading.Lock()
+
+    def _record_error(self, stage: str, error: Exception):
+        pipeline_logger.exception(f'The {stage} stage failed: {str(error)}')
+        with self.lock:
+            self.errors.append({'stage': stage, 'error': str(error)})
+
+    def _read(self, pages: Iterable[List], pages_queue: queue.Queue):
+        try:
+            for page in pages:
+                pages_queue.put(page)
+        except Exception as e:
+            self._record_error('scraping', e)
+        finally:
+            pages_queue.put(_DONE)
+
+    def _produce(self, pages: Iterable[List], batches: queue.Queue):
+        # As páginas chegam por uma fila para que um lote parcial saia
+        # quando o prazo vence, mesmo que a próxima página demore
+        pages_queue = queue.Queue(maxsize=self.queue_size)
+        reader = self._thread(self._read, pages, pages_queue)
+        reader.start()
+        batch = []
+        batch_pages = 0
+        deadline = None
+        try:
+            while True:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0)
+                try:
+                    page = pages_queue.get(timeout=timeout)
+                except queue.Empty:
+                    page = None
+                if page is _DONE:
+                    break
+                if page is not None:
+                    if not batch_pages:
+                        deadline = time.monotonic() + self.max_batch_delay
+                    batch.extend(page)
+                    batch_pages += 1
+                    self.sellers.extend(page)
+                if batch_pages and (
+                    batch_pages >= self.batch_size
+                    or time.monotonic() >= deadline
+                ):
+                    if batch:
+                        batches.put(batch)
+                    batch = []
+                    batch_pages = 0
+                    deadline = None
+            if batch:
+                batches.put(batch)
+        finally:
+            reader.join()
+            for _ in range(self.pricing_workers):
+                batches.put(_DONE)
+
+    def _price(self, batches: queue.Queue, priced: queue.Queue):
+        while (batch := batches.get()) is not _DONE:
+            try:
+                pricing_df = self.price(batch)
+            except Exception as e:
+                self._record_error('pricing', e)
+                continue
+            if pricing_df is None or pricing_df.empty:
+                continue
+            with self.lock:
+                self.priced.append(pricing_df)
+            priced.put(pricing_df)
+
+    def _push(self, priced: queue.Queue):
+        while (pricing_df := priced.get()) is not _DONE:
+            try:
+                results = self.push(pricing_df)
+            except Exception as e:
+                self._record_error('push', e)
+                continue
+            with self.lock:
+                self.pushed.append(pricing_df)
+                self.results.extend(results or [])
+
+    def _thread(self, target: Callable, *args) -> threading.Thread:
+        # Mantém o contexto de quem chamou, como o nome do job nos logs
+        context = contextvars.copy_context()
+        return threading.Thread(target=context.run, args=(target, *args))
+
+    def get_pushed(self) -> pd.DataFrame:
+        # Só os lotes cujo envio terminou, lotes com erro ficam de fora
+        if not self.pushed:
+            return pd.DataFrame(columns=['sku (*)', 'special_price'])
+        return pd.concat(self.pushed, ignore_index=True)
+
+    def run(self, pages: Iterable[List]) -> pd.DataFrame:
+        batches = queue.Queue(maxsize=self.queue_size)
+        priced = queue.Queue(maxsize=self.queue_size)
+        producer = self._thread(self._produce, pages, batches)
+        pricers = [
+            self._thread(self._price, batches, priced)
+            for _ in range(self.pricing_workers)
+        ]
+        pushers = [
+            self._thread(self._push, priced) for _ in range(self.push_workers)
+        ]
+        for thread in [producer, *pricers, *pushers]:
+            thread.start()
+
+        producer.join()
+        for thread in pricers:
+            thread.join()
+        for _ in pushers:
+            priced.put(_DONE)
+        for thread in pushers:
+            thread.join()
+
+        if not self.priced:
+            return pd.DataFrame(columns=['sku (*)', 'special_price'])
+        return pd.concat(self.priced, ignore_index=True)
@@ -1,4 +1,5 @@
 import logging
+import math
 from os import path
 
 import numpy as np
@@ -11,9 +12,32 @@ from kami_pricing.constant import (
     COLUMNS_DIFERENCE,
     COLUMNS_EXCEPT_HAIRPRO,
     GOOGLE_API_CREDENTIALS,
+    ID_HAIRPRO_SHEET,
 )
+from kami_pricing.cost_table import CostTable
+from kami_pricing.offers import OffersBuffer
+from kami_pricing.sheets import SheetReader
+from kami_pricing.sku_status import SkuStatus
 
 pricing_logger = logging.getLogger('pricing')
+PRICING_ENGINES = ['loop', 'vectorized', 'cents']
+COST_JOINS = ['sheet', 'local']
+MAX_PRICING_STEPS = 100000
+PPM = 1000000
+COMPETITOR_DISCOUNT_CENTS = 10
+
+
+def to_cents(values: pd.Series) -> pd.Series:
+    values = pd.Series(values, dtype=np.float64)
+    return values.mul(100).round().astype('Int64')
+
+
+def from_cents(values: pd.Series) -> pd.Series:
+    return (pd.Series(values, dtype='Int64') / 100).astype(np.float64)
+
+
+def ceil_div(numerator: np.ndarray, denominator: int) -> np.ndarray:
+    return -(-numerator // denominator)
 
 
 class Pricing:
@@ -24,12 +48,53 @@ class Pricing:
         multiplier_reverse: float = 0.003,
         limit_rate_ebitda: float = 4.0,
         increment_price_new: float = 0.10,
+        pricing_engine: str = 'vectorized',
+        cost_table: CostTable = None,
+        cost_join: str = 'sheet',
+        report_to_sheet: bool = True,
+        sku_status: SkuStatus = None,
+        sheet_reader: SheetReader = None,
     ):
         self.multiplier_commission = multiplier_commission
         self.multiplier_admin = multiplier_admin
         self.multiplier_reverse = multiplier_reverse
         self.limit_rate_ebitda = limit_rate_ebitda
         self.increment_price_new = increment_price_new
+        if pricing_engine not in PRICING_ENGINES:
+            raise ValueError(f'Unsupported pricing engine: {pricing_engine}')
+        self.pricing_engine = pricing_engine
+        # O modo em centavos trabalha só com inteiros: taxas em partes por
+        # milhão e preços em centavos
+        self.multipliers_ppm = [
+            round(multiplier * PPM)
+            for multiplier in (
+                multiplier_commission,
+                multiplier_admin,
+                multiplier_reverse,
+            )
+        ]
+        # Os outros motores arredondam o EBITDA % antes de comparar: com uma
+        # casa decimal em calc_ebitda e em percentuais inteiros durante o
+        # reajuste. Arredondado meio para cima, o percentual atinge o limite
+        # a partir de meia unidade abaixo dele, um valor inteiro em ppm
+        self.limit_ebitda_ppm = (
+            math.ceil(round(limit_rate_ebitda, 6)) * PPM // 100 - PPM // 200
+        )
+        self.initial_limit_ebitda_ppm = (
+            math.ceil(round(limit_rate_ebitda * 10, 6)) * PPM // 1000
+            - PPM // 2000
+        )
+        self.increment_price_cents = round(increment_price_new * 100)
+        if cost_join not in COST_JOINS:
+            raise ValueError(f'Unsupported cost join: {cost_join}')
+        self.cost_join = cost_join
+        self.report_to_sheet = report_to_sheet
+        self.cost_table = cost_table or CostTable(sheet_id=ID_HAIRPRO_SHEET)
+        self.sku_status = sku_status or SkuStatus(sheet_id=ID_HAIRPRO_SHEET)
+        self.sheet_reader = sheet_reader or SheetReader(
+            sheet_id=self.cost_table.sheet_id,
+            get_revision=self.cost_table.get_revision,
+        )
 
     def calc_ebitda(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
@@ -66,10 +131,18 @@ class Pricing:
     @benchmark_with(pricing_logger)
     @logging_with(pricing_logger)
     def pricing(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.pricing_engine == 'cents':
+            return self._pricing_cents(df)
+
         df = self.calc_ebitda(df)
         if df is None:
             return None
 
+        if self.pricing_engine == 'loop':
+            return self._pricing_loop(df)
+        return self._pricing_vectorized(df)
+
+    def _pricing_loop(self, df: pd.DataFrame) -> pd.DataFrame:
         try:
             for idx in range(0, len(df['special_price'])):
                 while df.loc[idx, 'EBITDA %'] < self.limit_rate_ebitda:
@@ -113,30 +186,232 @@ class Pricing:
             pricing_logger.error(f'An unexpected error occurred: {str(e)}')
             return None
 
-    @benchmark_with(pricing_logger)
-    @logging_with(pricing_logger)
-    def create_dataframes(self, sellers_list, skus_list) -> pd.DataFrame:
-        df_sellers_df_list = pd.DataFrame(
-            sellers_list, columns=COLUMNS_ALL_SELLER
+    def _ebitda_at(
+        self,
+        price: np.ndarray,
+        custo: np.ndarray,
+        frete: np.ndarray,
+        insumo: np.ndarray,
+    ) -> tuple:
+        commission = np.round(price * self.multiplier_commission, 2)
+        admin = np.round(price * self.multiplier_admin, 2)
+        reverse = np.round(price * self.multiplier_reverse, 2)
+        ebitda = price - custo - commission - frete - admin - insumo - reverse
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ebitda_rate = np.round(ebitda / price, 2) * 100
+        return commission, admin, reverse, ebitda, ebitda_rate
+
+    def _min_pricing_steps(
+        self,
+        price: np.ndarray,
+        custo: np.ndarray,
+        frete: np.ndarray,
+        insumo: np.ndarray,
+    ) -> np.ndarray:
+        # Ignoring the per-cent rounding, EBITDA % >= limit solves to
+        # price >= costs / (1 - multipliers - limit). Each of the three
+        # rounded fees moves by at most half a cent and the rate itself is
+        # rounded to whole percents, so relaxing the inequality by those
+        # amounts gives a step count that can never overshoot the first
+        # step accepted by the loop.
+        multipliers = (
+            self.multiplier_commission
+            + self.multiplier_admin
+            + self.multiplier_reverse
         )
-        skus_df = pd.DataFrame(skus_list)
-        df_sellers_df_list.drop_duplicates(keep='first', inplace=True)
-        df_sellers_df_list['seller_name'] = df_sellers_df_list[
-            'seller_name'
-        ].astype(str)
-        hairpro_df = df_sellers_df_list.loc[
-            df_sellers_df_list['seller_name'] == 'HAIRPRO'
+        margin = 1 - multipliers - self.limit_rate_ebitda / 100 + 0.005
+        costs = custo + frete + insumo
+        with np.errstate(divide='ignore', invalid='ignore'):
+            min_price = (costs - 0.015) / margin
+            steps = np.ceil((min_price - price) / self.increment_price_new)
+        steps = np.nan_to_num(steps, nan=1, posinf=1, neginf=1) - 1
+        return np.clip(steps, 1, MAX_PRICING_STEPS).astype(np.int64)
+
+    def _accumulate_increments(
+        self, price: np.ndarray, steps: np.ndarray
+    ) -> np.ndarray:
+        # adds the increment one step at a time, like the loop does, so the
+        # float drift of the resulting prices is exactly the same; rows are
+        # sorted by step count so every step is a single slice addition
+        order = np.argsort(-steps, kind='stable')
+        accumulated = price[order].copy()
+        descending_steps = -steps[order]
+        for step in range(1, int(steps.max(initial=0)) + 1):
+            count = np.searchsorted(descending_steps, -step, side='right')
+            accumulated[:count] += self.increment_price_new
+        result = np.empty_like(accumulated)
+        result[order] = accumulated
+        return result
+
+    def _pricing_vectorized(self, df: pd.DataFrame) -> pd.DataFrame:
+        try:
+            price = df['special_price'].to_numpy(dtype=np.float64)
+            custo = df['CUSTO'].to_numpy(dtype=np.float64)
+            frete = df['FRETE'].to_numpy(dtype=np.float64)
+            insumo = df['INSUMO'].to_numpy(dtype=np.float64)
+            ebitda_rate = df['EBITDA %'].to_numpy(dtype=np.float64)
+
+            pending = np.flatnonzero(ebitda_rate < self.limit_rate_ebitda)
+            steps = self._min_pricing_steps(
+                price[pending], custo[pending], frete[pending], insumo[pending]
+            )
+            candidates = self._accumulate_increments(price[pending], steps)
+            results = np.full((5, len(pending)), np.nan)
+            new_prices = np.full(len(pending), np.nan)
+            unresolved = np.arange(len(pending))
+
+            # the margin is not monotonic right at the threshold because of
+            # the rounding, so walk forward one increment at a time from the
+            # lower bound, only over the rows that did not converge yet
+            while len(unresolved):
+                rows = pending[unresolved]
+                candidate = candidates[unresolved]
+                values = self._ebitda_at(
+                    candidate, custo[rows], frete[rows], insumo[rows]
+                )
+                accepted = values[4] >= self.limit_rate_ebitda
+                done = unresolved[accepted]
+                new_prices[done] = candidate[accepted]
+                results[:, done] = np.vstack(values)[:, accepted]
+                unresolved = unresolved[~accepted]
+                candidates[unresolved] += self.increment_price_new
+                steps[unresolved] += 1
+                exhausted = steps[unresolved] > MAX_PRICING_STEPS
+                if exhausted.any():
+                    for sku in df['sku (*)'].iloc[
+                        pending[unresolved[exhausted]]
+                    ]:
+                        pricing_logger.warning(
+                            f'The sku {sku} can not reach an ebitda of {self.limit_rate_ebitda}'
+                        )
+                    unresolved = unresolved[~exhausted]
+
+            converged = ~np.isnan(new_prices)
+            rows = df.index[pending[converged]]
+            df.loc[rows, 'special_price'] = new_prices[converged]
+            for column, values in zip(
+                ['COMISSÃO', 'ADMIN', 'REVERSA', 'EBITDA R$', 'EBITDA %'],
+                results,
+            ):
+                df.loc[rows, column] = values[converged]
+
+            for sku, special_price, ebitda_rate in zip(
+                df['sku (*)'], df['special_price'], df['EBITDA %']
+            ):
+                pricing_logger.info(
+                    f'The sku {sku} with a price of {special_price} has an ebitda of {ebitda_rate}'
+                )
+            return df
+        except Exception as e:
+            pricing_logger.error(f'An unexpected error occurred: {str(e)}')
+            return None
+
+    def _ebitda_cents(self, price: np.ndarray, costs: np.ndarray) -> tuple:
+        # cada taxa é arredondada para o centavo mais próximo (meio para cima)
+        fees = [
+            (price * multiplier + PPM // 2) // PPM
+            for multiplier in self.multipliers_ppm
         ]
-        except_hairpro_df = df_sellers_df_list.drop(
-            df_sellers_df_list[
-                df_sellers_df_list['seller_name'].str.contains('HAIRPRO')
-            ].index
+        ebitda = price - costs - sum(fees)
+        return (*fees, ebitda)
+
+    def _reaches_limit(
+        self, price: np.ndarray, ebitda: np.ndarray, limit_ppm: int = None
+    ) -> np.ndarray:
+        if limit_ppm is None:
+            limit_ppm = self.limit_ebitda_ppm
+        return ebitda * PPM >= limit_ppm * price
+
+    def _min_prices_cents(self, price: np.ndarray, costs: np.ndarray) -> tuple:
+        # EBITDA % >= limit solves to price * margin >= costs, and the three
+        # rounded fees move the EBITDA by at most a cent and a half, so the
+        # first accepted step lies between the two bounds below and every
+        # candidate in between is checked at once
+        margin = PPM - sum(self.multipliers_ppm) - self.limit_ebitda_ppm
+        if margin <= 0:
+            return price, np.zeros(len(price), dtype=bool)
+        step = margin * self.increment_price_cents
+        lower = ceil_div(PPM * costs - 3 * PPM // 2 - margin * price, step)
+        upper = ceil_div(PPM * costs + 3 * PPM // 2 - margin * price, step)
+        lower = np.maximum(lower, 1)
+        upper = np.maximum(upper, lower)
+        reachable = upper <= MAX_PRICING_STEPS
+
+        steps = lower[reachable, None] + np.arange(
+            int((upper - lower)[reachable].max(initial=0)) + 1
         )
-        except_hairpro_df = pd.DataFrame(
-            except_hairpro_df, columns=COLUMNS_EXCEPT_HAIRPRO
+        candidates = (
+            price[reachable, None] + steps * self.increment_price_cents
         )
+        ebitda = self._ebitda_cents(candidates, costs[reachable, None])[-1]
+        first = self._reaches_limit(candidates, ebitda).argmax(axis=1)
+        new_prices = price.copy()
+        new_prices[reachable] = candidates[np.arange(len(candidates)), first]
+        return new_prices, reachable
 
-        sugest_price = except_hairpro_df.groupby('sku')['price'].idxmin()
+    def _pricing_cents(self, df: pd.DataFrame) -> pd.DataFrame:
+        try:
+            df = df.dropna(
+                subset=['special_price', 'CUSTO', 'FRETE', 'INSUMO'],
+                axis=0,
+                how='any',
+            )
+            df = df.reset_index()
+            price = to_cents(df['special_price']).to_numpy(dtype=np.int64)
+            costs = sum(
+                to_cents(df[column]).to_numpy(dtype=np.int64)
+                for column in ['CUSTO', 'FRETE', 'INSUMO']
+            )
+
+            ebitda = self._ebitda_cents(price, costs)[-1]
+            pending = np.flatnonzero(
+                ~self._reaches_limit(
+                    price, ebitda, self.initial_limit_ebitda_ppm
+                )
+            )
+            price[pending], reachable = self._min_prices_cents(
+                price[pending], costs[pending]
+            )
+            for sku in df['sku (*)'].iloc[pending[~reachable]]:
+                pricing_logger.warning(
+                    f'The sku {sku} can not reach an ebitda of {self.limit_rate_ebitda}'
+                )
+
+            commission, admin, reverse, ebitda = self._ebitda_cents(
+                price, costs
+            )
+            df['special_price'] = from_cents(price)
+            df['COMISSÃO'] = from_cents(commission)
+            df['ADMIN'] = from_cents(admin)
+            df['REVERSA'] = from_cents(reverse)
+            df['EBITDA R$'] = from_cents(ebitda)
+            # EBITDA % arredondado meio para cima, com uma casa decimal como
+            # em calc_ebitda e em percentuais inteiros nos preços reajustados
+            with np.errstate(divide='ignore'):
+                ebitda_rate = (2000 * ebitda + price) // (2 * price) / 10
+                repriced = pending[reachable]
+                ebitda_rate[repriced] = (
+                    200 * ebitda[repriced] + price[repriced]
+                ) // (2 * price[repriced])
+            df['EBITDA %'] = ebitda_rate
+
+            for sku, special_price, ebitda_rate in zip(
+                df['sku (*)'], df['special_price'], df['EBITDA %']
+            ):
+                pricing_logger.info(
+                    f'The sku {sku} with a price of {special_price} has an ebitda of {ebitda_rate}'
+                )
+            return df
+        except Exception as e:
+            pricing_logger.error(f'An unexpected error occurred: {str(e)}')
+            return None
+
+    def _match_competitors_loop(
+        self, hairpro_df: pd.DataFrame, except_hairpro_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        sugest_price = except_hairpro_df.groupby('sku', observed=True)[
+            'price'
+        ].idxmin()
         except_hairpro_df = except_hairpro_df.loc[sugest_price]
 
         difference_price_df = pd.DataFrame(
@@ -191,13 +466,113 @@ class Pricing:
                     difference_price_df['ganho_%'].round(2) * 100
                 )
 
+        return difference_price_df
+
+    def _match_competitors(
+        self, hairpro_df: pd.DataFrame, except_hairpro_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        competitor_prices = except_hairpro_df.groupby('sku', observed=True)[
+            'price'
+        ].min()
+        difference_price_df = pd.DataFrame(
+            hairpro_df, columns=COLUMNS_DIFERENCE
+        )
+        # com um OffersBuffer o sku é categórico e o map também seria
+        difference_price_df['competitor_price'] = (
+            difference_price_df['sku'].map(competitor_prices).astype(float)
+        )
+        competitor_price = difference_price_df['competitor_price']
+        price = difference_price_df['price']
+
+        difference_price_df['difference_price'] = (
+            competitor_price - price - 0.10
+        ).round(6)
+        # sem concorrente, manter o preço da Hairpro; caso contrário sugerir
+        # o preço de 0,10 centavos a menos que o preço do concorrente
+        difference_price_df['suggest_price'] = (
+            competitor_price.round(6) - 0.10
+        ).where(competitor_price.notna(), price.round(6))
+        difference_price_df['ganho_%'] = (
+            difference_price_df['suggest_price'] / price - 1
+        ).round(2) * 100
+
+        return difference_price_df
+
+    def _match_competitors_cents(
+        self, hairpro_df: pd.DataFrame, except_hairpro_df: pd.DataFrame
+    ) -> pd.DataFrame:
+        competitor_prices = except_hairpro_df.groupby('sku', observed=True)[
+            'price'
+        ].min()
+        difference_price_df = pd.DataFrame(
+            hairpro_df, columns=COLUMNS_DIFERENCE
+        )
+        competitor_price = to_cents(
+            difference_price_df['sku'].map(competitor_prices).astype(float)
+        )
+        price = to_cents(difference_price_df['price'])
+        suggest_price = (competitor_price - COMPETITOR_DISCOUNT_CENTS).where(
+            competitor_price.notna(), price
+        )
+
+        difference_price_df['competitor_price'] = from_cents(competitor_price)
+        difference_price_df['difference_price'] = from_cents(
+            competitor_price - price - COMPETITOR_DISCOUNT_CENTS
+        )
+        difference_price_df['suggest_price'] = from_cents(suggest_price)
+        # ganho em pontos percentuais inteiros, arredondado meio para cima
+        difference_price_df['ganho_%'] = (
+            (200 * (suggest_price - price) + price) // (2 * price)
+        ).astype(np.float64)
+
+        return difference_price_df
+
+    @benchmark_with(pricing_logger)
+    @logging_with(pricing_logger)
+    def create_dataframes(self, sellers_list, skus_list) -> pd.DataFrame:
+        if isinstance(sellers_list, OffersBuffer):
+            df_sellers_df_list = sellers_list.to_frame()
+        else:
+            df_sellers_df_list = pd.DataFrame(
+                sellers_list, columns=COLUMNS_ALL_SELLER
+            )
+        skus_df = pd.DataFrame(skus_list)
+        df_sellers_df_list.drop_duplicates(keep='first', inplace=True)
+        df_sellers_df_list['seller_name'] = df_sellers_df_list[
+            'seller_name'
+        ].astype(str)
+        hairpro_df = df_sellers_df_list.loc[
+            df_sellers_df_list['seller_name'] == 'HAIRPRO'
+        ]
+        except_hairpro_df = df_sellers_df_list.drop(
+            df_sellers_df_list[
+                df_sellers_df_list['seller_name'].str.contains('HAIRPRO')
+            ].index
+        )
+        except_hairpro_df = pd.DataFrame(
+            except_hairpro_df, columns=COLUMNS_EXCEPT_HAIRPRO
+        )
+
+        if self.pricing_engine == 'loop':
+            difference_price_df = self._match_competitors_loop(
+                hairpro_df, except_hairpro_df
+            )
+        elif self.pricing_engine == 'cents':
+            difference_price_df = self._match_competitors_cents(
+                hairpro_df, except_hairpro_df
+            )
+        else:
+            difference_price_df = self._match_competitors(
+                hairpro_df, except_hairpro_df
+            )
+
         sku_sellers = skus_df.rename(
             columns={'SKU Seller': 'sku_kami', 'SKU Beleza': 'sku'}
         )
         sku_sellers = sku_sellers[['sku', 'sku_kami']]
         pricing_result = difference_price_df.merge(sku_sellers, how='left')
         df_pricing = pricing_result[
-            ['sku_kami', 'suggest_price', 'competitor_price']
+            ['sku_kami', 'suggest_price', 'competitor_price', 'price']
         ]
         df_pricing = df_pricing.dropna()
         df_pricing = df_pricing.rename(
@@ -206,56 +581,67 @@ class Pricing:
 
         return df_pricing
 
-    @benchmark_with(pricing_logger)
-    @logging_with(pricing_logger)
-    def ebitda_proccess(self, df: pd.DataFrame):
-        kg = KamiGsheet(
+    def _write_ebitda_sheet(
+        self, df: pd.DataFrame, kg: KamiGsheet = None
+    ) -> KamiGsheet:
+        # O cliente do Google não é thread-safe, o relatório usa o seu
+        kg = kg or KamiGsheet(
             api_version='v4',
             credentials_path=GOOGLE_API_CREDENTIALS,
         )
-        kg.clear_range(
-            '1u7dCTQzbqgKSSjpSVtsUl7ea2j2YgW4Ko2nB9akE1ws', 'ebit!A2:B'
-        )
+        kg.clear_range(self.cost_table.sheet_id, 'ebit!A2:B')
+        kg.append_dataframe(df, self.cost_table.sheet_id, 'ebit!A2:B')
+        return kg
 
-        df = df[['sku (*)', 'special_price']]
-
-        kg.append_dataframe(
-            df, '1u7dCTQzbqgKSSjpSVtsUl7ea2j2YgW4Ko2nB9akE1ws', 'ebit!A2:B'
-        )
-        df_ebitda = kg.convert_range_to_dataframe(
-            '1u7dCTQzbqgKSSjpSVtsUl7ea2j2YgW4Ko2nB9akE1ws', 'ebit!A1:E'
-        )
-
-        df_ebitda = df_ebitda.replace('None', np.nan)
+    def _sheet_costs(self, df: pd.DataFrame) -> pd.DataFrame:
+        # A aba ebit só comporta um lote de preços por vez
+        with self.cost_table.sheet_lock:
+            was_fresh = self.cost_table.is_fresh()
+            costs = self.cost_table.lookup(df['sku (*)'], fresh=was_fresh)
+            if costs is None:
+                kg = self._write_ebitda_sheet(df, self.sheet_reader.gsheet)
+                raw_df = kg.convert_range_to_dataframe(
+                    self.cost_table.sheet_id, 'ebit!A1:E'
+                )
+                costs = self.cost_table.load(raw_df, merge=was_fresh)
+                costs = costs.reindex(df['sku (*)'].astype(str))
+                costs = costs.reset_index(drop=True)
+        return costs
 
-        numeric_columns = ['special_price', 'CUSTO', 'FRETE', 'INSUMO']
-        df_ebitda[numeric_columns] = df_ebitda[numeric_columns].apply(
-            lambda x: pd.to_numeric(
-                x.str.replace(',', '.', regex=False), errors='coerce'
+    def _local_costs(self, df: pd.DataFrame) -> pd.DataFrame:
+        if not self.cost_table.is_fresh():
+            self.sheet_reader.register(self.cost_table.cost_range)
+            self.sheet_reader.refresh()
+            self.cost_table.load(
+                self.sheet_reader.get(self.cost_table.cost_range)
             )
-        )
+        costs = self.cost_table.lookup(df['sku (*)'], fresh=True)
+        if costs is None:
+            return self._sheet_costs(df)
+        if self.report_to_sheet:
+            self.cost_table.submit_report(self._write_ebitda_sheet, df)
+        return costs
 
-        return df_ebitda
+    @benchmark_with(pricing_logger)
+    @logging_with(pricing_logger)
+    def ebitda_proccess(self, df: pd.DataFrame):
+        df = df[['sku (*)', 'special_price']].reset_index(drop=True)
 
-    def drop_inactives(self, df: pd.DataFrame):
-        kg = KamiGsheet(
-            api_version='v4',
-            credentials_path=GOOGLE_API_CREDENTIALS,
-        )
+        if self.cost_join == 'local':
+            costs = self._local_costs(df)
+        else:
+            costs = self._sheet_costs(df)
 
-        df_active = kg.convert_range_to_dataframe(
-            '1u7dCTQzbqgKSSjpSVtsUl7ea2j2YgW4Ko2nB9akE1ws', 'sku!A1:B'
+        df_ebitda = pd.concat([df, costs], axis=1)
+        df_ebitda['special_price'] = pd.to_numeric(
+            df_ebitda['special_price'], errors='coerce'
         )
 
-        df_inactives = df_active.loc[df_active['status'] == 'INATIVO']
+        return df_ebitda
 
+    def drop_inactives(self, df: pd.DataFrame):
         try:
-            to_drop_pricing = []
-            for sku in df_inactives['sku']:
-                to_drop_pricing.extend(df.loc[df['sku (*)'] == sku].index)
-            df = df.drop(to_drop_pricing)
-
-            return df
+            return self.sku_status.drop_inactives(df)
         except Exception as e:
             pricing_logger.exception(str(e))
             return None
@@ -1,24 +1,46 @@
 import json
 import logging
+import threading
 from os import path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pandas as pd
-from kami_gsuite.kami_gsheet import KamiGsheet
 from kami_logging import benchmark_with, logging_with
 
-from kami_pricing.api.anymarket import AnymarketAPI
-from kami_pricing.api.plugg_to import PluggToAPI
+from kami_pricing.api.anymarket import AnymarketAPI, AsyncAnymarketAPI
+from kami_pricing.api.anymarket_index import AnymarketIndex
+from kami_pricing.api.http_client import PooledHTTPClient
+from kami_pricing.api.plugg_to import AsyncPluggToAPI, PluggToAPI
+from kami_pricing.api.token_cache import TokenCache
 from kami_pricing.constant import (
-    GOOGLE_API_CREDENTIALS,
+    COMPANIES_SHEETS,
+    HISTORY_DIR,
     ID_HAIRPRO_SHEET,
+    INDEXES_DIR,
     ROOT_DIR,
+    SHEETS_DIR,
+    SNAPSHOTS_DIR,
+    TOKENS_DIR,
 )
+from kami_pricing.cost_table import CostTable
+from kami_pricing.fetcher import TokenBucket
+from kami_pricing.history import PriceHistory
+from kami_pricing.pipeline import PricingPipeline
 from kami_pricing.pricing import Pricing
 from kami_pricing.scraper import Scraper
+from kami_pricing.sheets import SheetReader
+from kami_pricing.sku_status import SkuStatus
+from kami_pricing.snapshot import PricingSnapshot
 
-gsheet = KamiGsheet(api_version='v4', credentials_path=GOOGLE_API_CREDENTIALS)
 pricing_logger = logging.getLogger('Pricing Manager')
+SELLERS_REPORT_COLUMNS = [
+    'sku',
+    'brand',
+    'category',
+    'name',
+    'price',
+    'seller_name',
+]
 
 
 class PricingManagerError(Exception):
@@ -33,19 +55,77 @@ class PricingManager:
         integrator: str = 'PLUGG_TO',
         products_ulrs_sheet_name: str = 'pricing_teste',
         skus_sellers_sheet_name: str = 'skushairpro',
+        scraper_settings: Dict = None,
+        incremental_settings: Dict = None,
+        http_client_settings: Dict = None,
+        integrator_settings: Dict = None,
+        pricing_settings: Dict = None,
+        pipeline_settings: Dict = None,
+        history_settings: Dict = None,
+        sheet_id: str = None,
+        rate_limiter: TokenBucket = None,
     ):
         self.company = company
+        self.sheet_id = sheet_id or COMPANIES_SHEETS.get(company)
+        self.rate_limiter = rate_limiter
         self.marketplace = marketplace
         self.products_ulrs_sheet_name = products_ulrs_sheet_name
         self.skus_sellers_sheet_name = skus_sellers_sheet_name
         self.integrator = integrator
         self.integrator_api = None
+        self.scraper_settings = scraper_settings or {}
+        self.http_client_settings = http_client_settings or {}
+        self.integrator_settings = integrator_settings or {}
+        self.snapshot = None
+        self.history = None
+        self.landscape_df = None
+        self.pricing_settings = dict(pricing_settings or {})
+        self.pipeline_settings = pipeline_settings or {}
+        # Planilha e custos ficam em disco, chaveados pela revisão, porque
+        # cada execução agendada recria o runner e os managers
+        cache_name = f'{company.lower()}_{marketplace.lower()}'
+        self.sheet_reader = SheetReader(
+            sheet_id=self.sheet_id,
+            file_path=path.join(SHEETS_DIR, f'{cache_name}_ranges.json'),
+        )
+        self.cost_table = CostTable(
+            sheet_id=self.sheet_id,
+            file_path=path.join(SHEETS_DIR, f'{cache_name}_costs.json'),
+            **self.pricing_settings.pop('cost_table', {}),
+        )
+        self.sku_status = SkuStatus(
+            sheet_id=self.sheet_id,
+            fetch=self.sheet_reader.fetch,
+            **self.pricing_settings.pop('sku_status', {}),
+        )
+        self.sheet_reader.register(
+            f'{products_ulrs_sheet_name}!A1:A',
+            f'{skus_sellers_sheet_name}!A1:B',
+            self.sku_status.sheet_range,
+        )
+        if self.pricing_settings.get('cost_join') == 'local':
+            self.sheet_reader.register(self.cost_table.cost_range)
+        if incremental_settings:
+            self.snapshot = PricingSnapshot(
+                file_path=path.join(
+                    SNAPSHOTS_DIR,
+                    f'{company.lower()}_{marketplace.lower()}.json',
+                ),
+                **incremental_settings,
+            )
+        if history_settings:
+            self.history = PriceHistory(
+                root_dir=HISTORY_DIR, **history_settings
+            )
 
     @classmethod
     def from_json(cls, file_path: str):
         with open(file_path, 'r') as file:
             json_data = json.load(file)
+        return cls.from_dict(json_data)
 
+    @classmethod
+    def from_dict(cls, json_data: Dict, rate_limiter: TokenBucket = None):
         company = json_data.get('company', 'HAIRPRO')
         marketplace = json_data.get('marketplace', 'BELEZA_NA_WEB')
         integrator = json_data.get('integrator', 'ANYMARKET')
@@ -55,6 +135,16 @@ class PricingManager:
         skus_sellers_sheet_name = json_data.get(
             'skus_sellers_sheet_name', 'skushairpro'
         )
+        scraper_settings = json_data.get('scraper', {})
+        incremental_settings = json_data.get('incremental', {})
+        http_client_settings = json_data.get('http_client', {})
+        integrator_settings = json_data.get('integrators', {}).get(
+            integrator, {}
+        )
+        pricing_settings = json_data.get('pricing', {})
+        pipeline_settings = json_data.get('pipeline', {})
+        history_settings = json_data.get('history', {})
+        sheet_id = json_data.get('sheet_id')
 
         if not all(
             [
@@ -75,6 +165,15 @@ class PricingManager:
             integrator=integrator,
             products_ulrs_sheet_name=products_ulrs_sheet_name,
             skus_sellers_sheet_name=skus_sellers_sheet_name,
+            scraper_settings=scraper_settings,
+            incremental_settings=incremental_settings,
+            http_client_settings=http_client_settings,
+            integrator_settings=integrator_settings,
+            pricing_settings=pricing_settings,
+            pipeline_settings=pipeline_settings,
+            history_settings=history_settings,
+            sheet_id=sheet_id,
+            rate_limiter=rate_limiter,
         )
 
     def _set_integrator_api(self):
@@ -87,19 +186,54 @@ class PricingManager:
                     f'PluggTo only support BELEZA NA WEB marktplace.'
                 )
 
+            http_client = PooledHTTPClient(**self.http_client_settings)
+            integrator_settings = dict(self.integrator_settings)
+            engine = integrator_settings.pop('engine', 'sync')
+            if engine == 'async' and self.rate_limiter is not None:
+                integrator_settings['rate_limiter'] = self.rate_limiter
             if self.integrator.upper() == 'ANYMARKET':
-                self.integrator_api = AnymarketAPI(
+                index_settings = integrator_settings.pop('index', None)
+                if index_settings is not None:
+                    integrator_settings['index'] = AnymarketIndex(
+                        file_path=path.join(
+                            INDEXES_DIR,
+                            f'anymarket_{self.company.lower()}.json',
+                        ),
+                        **index_settings,
+                    )
+                anymarket_api = (
+                    AsyncAnymarketAPI if engine == 'async' else AnymarketAPI
+                )
+                self.integrator_api = anymarket_api(
                     credentials_path=path.join(
                         ROOT_DIR,
                         f'credentials/anymarket_{self.company.lower()}.json',
-                    )
+                    ),
+                    http_client=http_client,
+                    **integrator_settings,
                 )
             elif self.integrator.upper() == 'PLUGG_TO':
-                self.integrator_api = PluggToAPI(
+                token_cache_settings = dict(
+                    integrator_settings.pop('token_cache', {})
+                )
+                token_cache_path = None
+                if token_cache_settings.pop('persist', False):
+                    token_cache_path = path.join(
+                        TOKENS_DIR, f'plugg_to_{self.company.lower()}.json'
+                    )
+                integrator_settings['token_cache'] = TokenCache(
+                    file_path=token_cache_path, **token_cache_settings
+                )
+                plugg_to_api = (
+                    AsyncPluggToAPI if engine == 'async' else PluggToAPI
+                )
+                self.integrator_api = plugg_to_api(
                     credentials_path=path.join(
                         ROOT_DIR,
                         f'credentials/plugg_to_{self.company.lower()}.json',
-                    )
+                    ),
+                    http_client=http_client,
+                    **integrator_settings,
                 )
             else:
                 raise PricingManagerError(
@@ -114,12 +248,14 @@ class PricingManager:
         self, sheet_id: str = ID_HAIRPRO_SHEET
     ) -> Tuple[List[str], pd.DataFrame]:
         try:
-            urls = gsheet.convert_range_to_dataframe(
+            if sheet_id == self.sheet_reader.sheet_id:
+                self.sheet_reader.refresh()
+            urls = self.sheet_reader.fetch(
                 sheet_id=sheet_id,
                 sheet_range=f'{self.products_ulrs_sheet_name}!A1:A',
             )
             urls = list(urls['urls'])
-            sku_sellers = gsheet.convert_range_to_dataframe(
+            sku_sellers = self.sheet_reader.fetch(
                 sheet_id=sheet_id,
                 sheet_range=f'{self.skus_sellers_sheet_name}!A1:B',
             )
@@ -132,34 +268,72 @@ class PricingManager:
             raise
 
     def get_products_from_company(self) -> Tuple[List[str], pd.DataFrame]:
-        if self.company == 'HAIRPRO':
-            return self._get_products_from_gsheet(sheet_id=ID_HAIRPRO_SHEET)
+        if self.sheet_id:
+            return self._get_products_from_gsheet(sheet_id=self.sheet_id)
         raise ValueError(f'Unsupported company: {self.company}')
 
+    def _get_pricing(self, **settings) -> Pricing:
+        return Pricing(
+            cost_table=self.cost_table,
+            sku_status=self.sku_status,
+            sheet_reader=self.sheet_reader,
+            **{**self.pricing_settings, **settings},
+        )
+
+    def _price_sellers(
+        self, pc: Pricing, sellers_list: List, products_skus: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, pd.DataFrame | None]:
+        pricing_df = pc.create_dataframes(
+            sellers_list=sellers_list, skus_list=products_skus
+        )
+        landscape_df = None
+        if self.snapshot is not None:
+            pricing_df = self.snapshot.get_changed(pricing_df)
+            landscape_df = pricing_df[['sku (*)', 'competitor_price', 'price']]
+            if pricing_df.empty:
+                return (
+                    pd.DataFrame(columns=['sku (*)', 'special_price']),
+                    landscape_df,
+                )
+        pricing_df = pc.drop_inactives(pricing_df)
+        func_ebitda = pc.ebitda_proccess(pricing_df)
+        df_ebitda = pc.pricing(func_ebitda)
+        df_final = pc.drop_inactives(df_ebitda)
+        return df_final[['sku (*)', 'special_price']], landscape_df
+
     @benchmark_with(pricing_logger)
     @logging_with(pricing_logger)
     def scraping_and_pricing(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         try:
             products_urls, products_skus = self.get_products_from_company()
-            pc = Pricing()
+            pc = self._get_pricing()
             sc = Scraper(
-                marketplace=self.marketplace, products_urls=products_urls
+                marketplace=self.marketplace,
+                products_urls=products_urls,
+                **self.scraper_settings,
             )
-            sellers_list = sc.scrap_products_from_marketplace()
-            pricing_df = pc.create_dataframes(
-                sellers_list=sellers_list, skus_list=products_skus
+            sellers_list = sc.scrap_offers_from_marketplace()
+            sellers_df = sellers_list.to_frame(columns=SELLERS_REPORT_COLUMNS)
+            pricing_df, self.landscape_df = self._price_sellers(
+                pc, sellers_list, products_skus
             )
-            pricing_df = pc.drop_inactives(pricing_df)
-            func_ebitda = pc.ebitda_proccess(pricing_df)
-            df_ebitda = pc.pricing(func_ebitda)
-            df_final = pc.drop_inactives(df_ebitda)
-            columns = ['sku', 'brand', 'category', 'name', 'price', 'seller_name']
-            sellers_df = pd.DataFrame(sellers_list, columns=columns)
-            return sellers_df, df_final[['sku (*)', 'special_price']]
+            return sellers_df, pricing_df
         except Exception as e:
             pricing_logger.exception(str(e))
             raise
 
+    def _push_prices(self, pricing_df: pd.DataFrame) -> List:
+        if self.snapshot is not None:
+            pricing_df = self.snapshot.drop_unchanged_prices(pricing_df)
+
+        if self.integrator == 'PLUGG_TO':
+            return self.integrator_api.update_prices(pricing_df=pricing_df)
+        elif self.integrator == 'ANYMARKET':
+            return self.integrator_api.update_prices_on_marketplace(
+                pricing_df=pricing_df, marketplace=self.marketplace
+            )
+        raise PricingManagerError(f'Unsupported integrator: {self.integrator}')
+
     @benchmark_with(pricing_logger)
     @logging_with(pricing_logger)
     def update_prices(self, pricing_df: pd.DataFrame):
@@ -167,19 +341,116 @@ class PricingManager:
             if not self.integrator_api:
                 self._set_integrator_api()
 
-            if self.integrator == 'PLUGG_TO':
-                self.integrator_api.update_prices(pricing_df=pricing_df)
+            priced_df = self.sku_status.drop_inactives(pricing_df)
+            with self.integrator_api:
+                results = self._push_prices(priced_df)
+
+            if self.snapshot is not None and self.landscape_df is not None:
+                self.snapshot.update(self.landscape_df, priced_df, results)
+
+            return results
+
+        except Exception as e:
+            pricing_logger.exception(str(e))
+            raise
+
+    @benchmark_with(pricing_logger)
+    @logging_with(pricing_logger)
+    def scraping_pricing_and_pushing(
+        self,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, List]:
+        try:
+            if not self.integrator_api:
+                self._set_integrator_api()
+
+            products_urls, products_skus = self.get_products_from_company()
+            settings = dict(self.pipeline_settings)
+            settings.pop('enabled', None)
+            scraper_queue_size = settings.pop('scraper_queue_size', 0)
+            # O relatório na aba ebit sai uma vez, com o resultado consolidado
+            report_to_sheet = self.pricing_settings.get(
+                'report_to_sheet', True
+            )
+            pc = self._get_pricing(report_to_sheet=False)
+            sc = Scraper(
+                marketplace=self.marketplace,
+                products_urls=products_urls,
+                **self.scraper_settings,
+            )
+            landscapes = []
+            landscapes_lock = threading.Lock()
 
-            elif self.integrator == 'ANYMARKET':
-                self.integrator_api.update_prices_on_marketplace(
-                    pricing_df=pricing_df, marketplace=self.marketplace
+            def price(sellers_list: List) -> pd.DataFrame:
+                pricing_df, landscape_df = self._price_sellers(
+                    pc, sellers_list, products_skus
                 )
+                if landscape_df is not None:
+                    with landscapes_lock:
+                        landscapes.append(landscape_df)
+                return pricing_df
 
-            else:
-                raise PricingManagerError(
-                    f'Unsupported integrator: {self.integrator}'
+            pipeline = PricingPipeline(
+                price=price, push=self._push_prices, **settings
+            )
+            with self.integrator_api:
+                pricing_df = pipeline.run(
+                    sc.iter_products_from_marketplace(
+                        queue_size=scraper_queue_size
+                    )
+                )
+
+            for error in pipeline.errors:
+                pricing_logger.error(
+                    f"Pipeline {error['stage']} error: {error['error']}"
+                )
+            if self.snapshot is not None and landscapes:
+                self.landscape_df = pd.concat(landscapes, ignore_index=True)
+                self.snapshot.update(
+                    self.landscape_df, pipeline.get_pushed(), pipeline.results
+                )
+            if (
+                report_to_sheet
+                and pc.cost_join == 'local'
+                and not pricing_df.empty
+            ):
+                self.cost_table.submit_report(
+                    pc._write_ebitda_sheet, pricing_df
                 )
 
+            sellers_df = pipeline.sellers.to_frame(
+                columns=SELLERS_REPORT_COLUMNS
+            )
+            return sellers_df, pricing_df, pipeline.results
         except Exception as e:
             pricing_logger.exception(str(e))
             raise
+
+    def _record_history(
+        self, sellers_df: pd.DataFrame, pricing_df: pd.DataFrame, results: List
+    ):
+        # O histórico não pode derrubar um ciclo que já enviou os preços
+        try:
+            self.history.record(
+                sellers_df,
+                pricing_df,
+                results,
+                company=self.company,
+                marketplace=self.marketplace,
+                integrator=self.integrator,
+            )
+        except Exception as e:
+            pricing_logger.exception(f'Failed to record history: {str(e)}')
+
+    def run_cycle(self) -> Tuple[pd.DataFrame, pd.DataFrame, List]:
+        if self.pipeline_settings.get('enabled'):
+            (
+                sellers_df,
+                pricing_df,
+                results,
+            ) = self.scraping_pricing_and_pushing()
+        else:
+            sellers_df, pricing_df = self.scraping_and_pricing()
+            results = self.update_prices(pricing_df=pricing_df)
+        if self.history is not None:
+            self._record_history(sellers_df, pricing_df, results)
+        return sellers_df, pricing_df, results
@@ -0,0 +1,131 @@
+import contextvars
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import makedirs, path
+from typing import Dict, List
+
+import pandas as pd
+
+from kami_pricing.constant import ROOT_DIR
+from kami_pricing.fetcher import TokenBucket
+from kami_pricing.pricing_manager import PricingManager
+from kami_pricing.snapshot import get_push_status
+
+runner_logger = logging.getLogger('Pricing Runner')
+LOGS_DIR = path.join(ROOT_DIR, 'logs')
+RUNNER_KEYS = ['managers', 'max_workers', 'rate_budgets']
+current_job = contextvars.ContextVar('current_job', default=None)
+
+
+class JobLogFilter(logging.Filter):
+    def __init__(self, job_name: str):
+        super().__init__()
+        self.job_name = job_name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return current_job.get() == self.job_name
+
+
+def get_job_name(manager: PricingManager) -> str:
+    return '_'.join(
+        [manager.company, manager.marketplace, manager.integrator]
+    ).lower()
+
+
+class PricingRunner:
+    def __init__(
+        self,
+        managers: List[PricingManager],
+        max_workers: int = 4,
+    ):
+        self.managers = managers
+        self.max_workers = max_workers
+        self.outputs = {}
+
+    @classmethod
+    def from_json(cls, file_path: str):
+        with open(file_path, 'r') as file:
+            json_data = json.load(file)
+        return cls.from_dict(json_data)
+
+    @classmethod
+    def from_dict(cls, json_data: Dict):
+        defaults = {
+            key: value
+            for key, value in json_data.items()
+            if key not in RUNNER_KEYS
+        }
+        # Lojas no mesmo integrador dividem a mesma cota de requisições
+        rate_limiters = {
+            integrator.upper(): TokenBucket(rate=rate)
+            for integrator, rate in json_data.get('rate_budgets', {}).items()
+        }
+        managers = []
+        for manager_data in json_data.get('managers') or [{}]:
+            manager_data = {**defaults, **manager_data}
+            integrator = manager_data.get('integrator', 'ANYMARKET').upper()
+            managers.append(
+                PricingManager.from_dict(
+                    manager_data, rate_limiter=rate_limiters.get(integrator)
+                )
+            )
+        return cls(
+            managers=managers, max_workers=json_data.get('max_workers', 4)
+        )
+
+    def _run_manager(self, manager: PricingManager) -> Dict:
+        job_name = get_job_name(manager)
+        current_job.set(job_name)
+        makedirs(LOGS_DIR, exist_ok=True)
+        handler = logging.FileHandler(path.join(LOGS_DIR, f'{job_name}.log'))
+        handler.setFormatter(
+            logging.Formatter(
+                '%(asctime)s - [%(name)s] [%(levelname)s]: %(message)s'
+            )
+        )
+        handler.addFilter(JobLogFilter(job_name))
+        logging.getLogger().addHandler(handler)
+
+        status = {
+            'job': job_name,
+            'company': manager.company,
+            'marketplace': manager.marketplace,
+            'integrator': manager.integrator,
+            'status': 'OK',
+            'prices': 0,
+            'pushed': 0,
+            'failed': 0,
+            'error': None,
+        }
+        started_at = time.monotonic()
+        try:
+            sellers_df, pricing_df, results = manager.run_cycle()
+            self.outputs[job_name] = (sellers_df, pricing_df)
+            push_status = get_push_status(results)
+            pushed = sum(push_status.values())
+            status.update(
+                prices=len(pricing_df),
+                pushed=pushed,
+                failed=len(push_status) - pushed,
+            )
+        except Exception as e:
+            runner_logger.exception(f'{job_name} failed: {str(e)}')
+            status.update(status='ERROR', error=str(e))
+        finally:
+            status['seconds'] = round(time.monotonic() - started_at, 3)
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+        return status
+
+    def run(self) -> pd.DataFrame:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, self._run_manager, manager
+                )
+                for manager in self.managers
+            ]
+            statuses = [future.result() for future in futures]
+        return pd.DataFrame(statuses)
@@ -1,11 +1,13 @@
-import json
+import asyncio
+import contextvars
 import logging
-from typing import List
+import queue
+import threading
+from typing import Dict, Iterator, List
 
 import numpy as np
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
 from kami_gsuite.kami_gsheet import KamiGsheet
 from kami_logging import benchmark_with, logging_with
 
@@ -14,8 +16,13 @@ from kami_pricing.constant import (
     COLUMNS_DIFERENCE,
     COLUMNS_EXCEPT_HAIRPRO,
 )
+from kami_pricing.fetcher import DEFAULT_HEADERS, AsyncFetcher, FetcherError
+from kami_pricing.marketplaces import get_marketplace_adapter
+from kami_pricing.offers import OffersBuffer
+from kami_pricing.page_cache import PageCache
 
 scraper_logger = logging.getLogger('scraper')
+SCRAPING_ENGINES = ['sync', 'async']
 
 
 class Scraper:
@@ -23,62 +30,187 @@ class Scraper:
         self,
         marketplace: str = 'BELEZA_NA_WEB',
         products_urls: List[str] = None,
+        engine: str = 'sync',
+        max_concurrency: int = 10,
+        requests_per_second: float = 5.0,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        extractor: str = 'stream',
+        page_cache: Dict = None,
     ):
         self.marketplace = marketplace
         self.products_urls = products_urls
+        if engine not in SCRAPING_ENGINES:
+            raise ValueError(f'Unsupported scraping engine: {engine}')
+        self.engine = engine
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.adapter = get_marketplace_adapter(
+            marketplace, extractor=extractor
+        )
+        self.page_cache = PageCache(**page_cache) if page_cache else None
 
-    @benchmark_with(scraper_logger)
-    @logging_with(scraper_logger)
-    def scrap_products_from_beleza_na_web(self) -> List[str]:
-        sellers_list = []
-        try:
-            for url in self.products_urls:
+    def _extract_sellers(self, content: bytes) -> List:
+        return self.adapter.extract_rows(content)
+
+    def _get_products_urls(self) -> List[str]:
+        urls = (self.adapter.normalize_url(url) for url in self.products_urls)
+        return [url for url in urls if url]
+
+    def _get_cache_entry(self, url: str) -> Dict | None:
+        if self.page_cache is None:
+            return None
+        return self.page_cache.get(url)
+
+    def _get_request_headers(self, entry: Dict | None) -> Dict:
+        headers = dict(self.adapter.headers)
+        if self.page_cache is not None:
+            headers.update(self.page_cache.get_conditional_headers(entry))
+        return headers
+
+    def _get_sellers_from_response(
+        self,
+        url: str,
+        entry: Dict | None,
+        status_code: int,
+        headers: Dict,
+        content: bytes,
+    ) -> List:
+        if self.page_cache is None:
+            return self._extract_sellers(content)
+        return self.page_cache.resolve(
+            url=url,
+            entry=entry,
+            status_code=status_code,
+            headers=headers,
+            content=content,
+            extract=self._extract_sellers,
+        )
+
+    def _iter_products_sync(self) -> Iterator[List]:
+        for url in self._get_products_urls():
+            try:
+                entry = self._get_cache_entry(url)
                 response = requests.get(
                     url,
                     headers={
-                        'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:79.0) Gecko/20100101 Firefox/79.0'
+                        **DEFAULT_HEADERS,
+                        **self._get_request_headers(entry),
                     },
                 )
+            except requests.RequestException as e:
+                scraper_logger.error(str(e))
+                continue
+            yield self._get_sellers_from_response(
+                url=url,
+                entry=entry,
+                status_code=response.status_code,
+                headers=response.headers,
+                content=response.content,
+            )
 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                id_sellers = soup.find_all(
-                    'a',
-                    class_='btn btn-block btn-primary btn-lg js-add-to-cart',
+    def _get_fetcher(self) -> AsyncFetcher:
+        return AsyncFetcher(
+            max_concurrency=self.max_concurrency,
+            requests_per_second=self.requests_per_second,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            backoff_factor=self.backoff_factor,
+        )
+
+    async def _scrap_url(self, fetcher: AsyncFetcher, url: str) -> List:
+        try:
+            entry = self._get_cache_entry(url)
+            response = await fetcher.fetch(
+                url, headers=self._get_request_headers(entry)
+            )
+            return self._get_sellers_from_response(
+                url=url,
+                entry=entry,
+                status_code=response.status_code,
+                headers=response.headers,
+                content=response.content,
+            )
+        except FetcherError as e:
+            scraper_logger.error(str(e))
+            return []
+
+    async def _scrap_urls(self) -> List:
+        async with self._get_fetcher() as fetcher:
+            pages = await asyncio.gather(
+                *(
+                    self._scrap_url(fetcher, url)
+                    for url in self._get_products_urls()
                 )
+            )
+        return [row for page in pages for row in page]
 
-                for id_seller in id_sellers:
-                    sellers = id_seller.get('data-sku')
-                    row = json.loads(sellers)[0]
-                    '\n'
+    async def _stream_urls(self, pages: queue.Queue):
+        async with self._get_fetcher() as fetcher:
+            for page in asyncio.as_completed(
+                [
+                    self._scrap_url(fetcher, url)
+                    for url in self._get_products_urls()
+                ]
+            ):
+                # Espera fora do loop para não travar os downloads em curso
+                await asyncio.to_thread(pages.put, await page)
 
-                    scraper_logger.info(
-                        f"Extraindo dados do vendedor Id: {row['seller']['id']} \
-                            | Loja: {row['seller']['name']} "
-                    )
+    def _iter_products_async(self, queue_size: int = 0) -> Iterator[List]:
+        pages = queue.Queue(maxsize=queue_size)
+        done = object()
 
-                    sellers_row = [
-                        row['sku'],
-                        row['brand'],
-                        row['category'],
-                        row['name'],
-                        row['price'],
-                        row['seller']['name'],
-                    ]
-                    sellers_list.append(sellers_row)
+        def stream():
+            try:
+                asyncio.run(self._stream_urls(pages))
+            except Exception as e:
+                scraper_logger.exception(str(e))
+            finally:
+                pages.put(done)
 
-            return sellers_list
+        thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(stream,), daemon=True
+        )
+        thread.start()
+        while (page := pages.get()) is not done:
+            yield page
+        thread.join()
 
-        except requests.RequestException as e:
-            scraper_logger.exception(e)
+    def iter_products_from_marketplace(
+        self, queue_size: int = 0
+    ) -> Iterator[List]:
+        try:
+            if self.engine == 'async':
+                yield from self._iter_products_async(queue_size=queue_size)
+            else:
+                yield from self._iter_products_sync()
+        finally:
+            if self.page_cache is not None:
+                self.page_cache.report()
 
     @benchmark_with(scraper_logger)
     @logging_with(scraper_logger)
     def scrap_products_from_marketplace(self) -> List[str]:
-        sellers_list = []
-        try:
-            if self.marketplace == 'BELEZA_NA_WEB':
-                sellers_list = self.scrap_products_from_beleza_na_web()
-        except requests.RequestException as e:
-            scraper_logger.exception(e)
+        if self.engine == 'async':
+            sellers_list = asyncio.run(self._scrap_urls())
+        else:
+            sellers_list = [
+                row for page in self._iter_products_sync() for row in page
+            ]
+
+        if self.page_cache is not None:
+            self.page_cache.report()
 
         return sellers_list
+
+    @benchmark_with(scraper_logger)
+    @logging_with(scraper_logger)
+    def scrap_offers_from_marketplace(self) -> OffersBuffer:
+        offers = OffersBuffer()
+        for page in self.iter_products_from_marketplace():
+            offers.extend(page)
+        return offers
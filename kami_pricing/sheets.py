@@ -0,0 +1,154 @@
+import json
+import logging
+import os
+import threading
+from os import makedirs, path
+from typing import Callable, Dict, Iterable, List
+
+import pandas as pd
+from kami_gsuite.kami_gdrive import KamiGdrive
+from kami_gsuite.kami_gsheet import KamiGsheet
+
+from kami_pricing.constant import GOOGLE_API_CREDENTIALS
+
+sheets_logger = logging.getLogger('sheets')
+gdrive_lock = threading.Lock()
+gdrive = None
+
+
+def get_sheet_revision(sheet_id: str) -> str:
+    # Um único cliente autenticado atende todas as consultas de revisão; o
+    # cliente do Google não é thread-safe, então as chamadas são em série
+    global gdrive
+    with gdrive_lock:
+        if gdrive is None:
+            client = KamiGdrive(
+                api_version='v3', credentials_path=GOOGLE_API_CREDENTIALS
+            )
+            client.connect()
+            gdrive = client
+        file = gdrive.service.files().get(fileId=sheet_id, fields='version')
+        return file.execute()['version']
+
+
+def values_to_dataframe(values: List[List]) -> pd.DataFrame:
+    if not values:
+        return pd.DataFrame()
+    return pd.DataFrame(values[1:], columns=values[0])
+
+
+class SheetReader:
+    def __init__(
+        self,
+        sheet_id: str,
+        gsheet: KamiGsheet = None,
+        get_revision: Callable[[str], str] = get_sheet_revision,
+        file_path: str = None,
+    ):
+        self.sheet_id = sheet_id
+        self.gsheet = gsheet or KamiGsheet(
+            api_version='v4', credentials_path=GOOGLE_API_CREDENTIALS
+        )
+        self.get_revision = get_revision
+        self.file_path = file_path
+        self.revision = None
+        self.ranges = []
+        self.frames = {}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        # Os intervalos salvos valem enquanto a revisão não mudar, mesmo
+        # depois de o processo ser recriado
+        if self.file_path is None:
+            return
+        try:
+            with open(self.file_path, 'r') as f:
+                data = json.load(f)
+            self.frames = {
+                sheet_range: values_to_dataframe(values)
+                for sheet_range, values in data['frames'].items()
+            }
+            self.revision = data['revision']
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, ValueError):
+            sheets_logger.error(
+                f'The sheet cache at {self.file_path} is invalid, it will be rebuilt.'
+            )
+
+    def _save(self):
+        if self.file_path is None:
+            return
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        data = {
+            'revision': self.revision,
+            'frames': {
+                sheet_range: [list(frame.columns)] + frame.values.tolist()
+                for sheet_range, frame in self.frames.items()
+            },
+        }
+        tmp_path = f'{self.file_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.file_path)
+
+    def register(self, *sheet_ranges: str):
+        for sheet_range in sheet_ranges:
+            if sheet_range not in self.ranges:
+                self.ranges.append(sheet_range)
+
+    def batch_get(
+        self, sheet_ranges: Iterable[str]
+    ) -> Dict[str, pd.DataFrame]:
+        sheet_ranges = list(sheet_ranges)
+        if self.gsheet.service is None:
+            self.gsheet.connect()
+        response = (
+            self.gsheet.service.spreadsheets()
+            .values()
+            .batchGet(spreadsheetId=self.sheet_id, ranges=sheet_ranges)
+            .execute()
+        )
+        # A API normaliza os nomes dos intervalos, mas mantém a ordem
+        return {
+            sheet_range: values_to_dataframe(value_range.get('values', []))
+            for sheet_range, value_range in zip(
+                sheet_ranges, response.get('valueRanges', [])
+            )
+        }
+
+    def refresh(self) -> bool:
+        try:
+            revision = self.get_revision(self.sheet_id)
+        except Exception as e:
+            sheets_logger.error(
+                f'Could not read the revision of {self.sheet_id}: {str(e)}'
+            )
+            revision = None
+        with self.lock:
+            if (
+                revision is not None
+                and revision == self.revision
+                and all(r in self.frames for r in self.ranges)
+            ):
+                return False
+            self.frames = self.batch_get(self.ranges) if self.ranges else {}
+            self.revision = revision
+            self._save()
+            return True
+
+    def get(self, sheet_range: str) -> pd.DataFrame:
+        with self.lock:
+            if sheet_range not in self.frames:
+                self.register(sheet_range)
+                self.frames.update(self.batch_get([sheet_range]))
+                self._save()
+            return self.frames[sheet_range].copy()
+
+    def fetch(self, sheet_id: str, sheet_range: str) -> pd.DataFrame:
+        if sheet_id != self.sheet_id:
+            return self.gsheet.convert_range_to_dataframe(
+                sheet_id, sheet_range
+            )
+        return self.get(sheet_range)
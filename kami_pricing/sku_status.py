@@ -0,0 +1,60 @@
+import logging
+import threading
+import time
+from typing import Callable, FrozenSet
+
+import pandas as pd
+from kami_gsuite.kami_gsheet import KamiGsheet
+
+from kami_pricing.constant import GOOGLE_API_CREDENTIALS
+
+sku_status_logger = logging.getLogger('sku status')
+
+
+def fetch_sku_status(sheet_id: str, sheet_range: str) -> pd.DataFrame:
+    kg = KamiGsheet(
+        api_version='v4',
+        credentials_path=GOOGLE_API_CREDENTIALS,
+    )
+    return kg.convert_range_to_dataframe(sheet_id, sheet_range)
+
+
+class SkuStatus:
+    def __init__(
+        self,
+        sheet_id: str,
+        sheet_range: str = 'sku!A1:B',
+        ttl: float = 600,
+        fetch: Callable[[str, str], pd.DataFrame] = fetch_sku_status,
+    ):
+        self.sheet_id = sheet_id
+        self.sheet_range = sheet_range
+        self.ttl = ttl
+        self.fetch = fetch
+        self.refreshed_at = 0
+        self.inactives = frozenset()
+        self.lock = threading.Lock()
+
+    def is_stale(self) -> bool:
+        return time.time() - self.refreshed_at > self.ttl
+
+    def get_inactives(self) -> FrozenSet[str]:
+        with self.lock:
+            if self.is_stale():
+                df_status = self.fetch(self.sheet_id, self.sheet_range)
+                self.inactives = frozenset(
+                    df_status.loc[df_status['status'] == 'INATIVO', 'sku']
+                    .astype(str)
+                    .tolist()
+                )
+                self.refreshed_at = time.time()
+            return self.inactives
+
+    def drop_inactives(
+        self, df: pd.DataFrame, column: str = 'sku (*)'
+    ) -> pd.DataFrame:
+        inactives = self.get_inactives()
+        mask = df[column].astype(str).isin(inactives)
+        if mask.any():
+            sku_status_logger.info(f'Dropping {mask.sum()} inactive skus.')
+        return df.loc[~mask]
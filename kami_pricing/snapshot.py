@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import time
+from os import makedirs, path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+snapshot_logger = logging.getLogger('pricing snapshot')
+SNAPSHOT_COLUMNS = ['competitor_price', 'price', 'special_price', 'updated_at']
+
+
+def get_push_status(results: List) -> Dict[str, bool]:
+    # Anymarket e PluggTo devolvem um resultado por sku com 'sku (*)' e
+    # 'success'; skus sem resultado não chegaram a ser enviados
+    return {
+        str(result['sku (*)']): bool(result.get('success'))
+        for result in results or []
+        if isinstance(result, dict) and 'sku (*)' in result
+    }
+
+
+class PricingSnapshot:
+    def __init__(self, file_path: str, max_age: float = 86400):
+        self.file_path = file_path
+        self.max_age = max_age
+        self.entries = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.file_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            snapshot_logger.error(
+                f'The snapshot at {self.file_path} contains invalid JSON, starting a new one.'
+            )
+            return {}
+
+    def save(self):
+        makedirs(path.dirname(self.file_path), exist_ok=True)
+        tmp_path = f'{self.file_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.file_path)
+
+    def _merge_last(self, df: pd.DataFrame) -> pd.DataFrame:
+        last_df = pd.DataFrame.from_dict(
+            self.entries, orient='index', columns=SNAPSHOT_COLUMNS
+        ).astype(float)
+        last_df.index = last_df.index.astype(str)
+        last_df = last_df.add_suffix('_last')
+        merged = last_df.reindex(df['sku (*)'].astype(str))
+        merged['fresh'] = (
+            time.time() - merged['updated_at_last'] <= self.max_age
+        )
+        return merged
+
+    def get_changed(self, pricing_df: pd.DataFrame) -> pd.DataFrame:
+        last = self._merge_last(pricing_df)
+        unchanged = (
+            last['fresh'].to_numpy()
+            & np.isclose(
+                pricing_df['competitor_price'].to_numpy(dtype=float),
+                last['competitor_price_last'].to_numpy(dtype=float),
+            )
+            & np.isclose(
+                pricing_df['price'].to_numpy(dtype=float),
+                last['price_last'].to_numpy(dtype=float),
+            )
+        )
+        snapshot_logger.info(
+            f'{unchanged.sum()} of {len(pricing_df)} skus have an unchanged competitor landscape'
+        )
+        return pricing_df[~unchanged]
+
+    def drop_unchanged_prices(self, pricing_df: pd.DataFrame) -> pd.DataFrame:
+        last = self._merge_last(pricing_df)
+        unchanged = last['fresh'].to_numpy() & (
+            pricing_df['special_price'].round(2).to_numpy()
+            == last['special_price_last'].round(2).to_numpy()
+        )
+        snapshot_logger.info(
+            f'{unchanged.sum()} of {len(pricing_df)} skus keep the last pushed price'
+        )
+        return pricing_df[~unchanged]
+
+    def update(
+        self,
+        landscape_df: pd.DataFrame,
+        pricing_df: pd.DataFrame,
+        results: List,
+    ):
+        updated_at = time.time()
+        push_status = get_push_status(results)
+        landscape = (
+            landscape_df.assign(sku=landscape_df['sku (*)'].astype(str))
+            .drop_duplicates(subset='sku', keep='first')
+            .set_index('sku')
+        )
+        for sku, special_price in zip(
+            pricing_df['sku (*)'].astype(str), pricing_df['special_price']
+        ):
+            pushed = push_status.get(sku)
+            if pushed is False:
+                # sem a entrada, o envio que falhou é refeito no próximo ciclo
+                self.entries.pop(sku, None)
+                continue
+            if sku not in landscape.index:
+                continue
+            competitor_price = float(landscape.at[sku, 'competitor_price'])
+            price = float(landscape.at[sku, 'price'])
+            special_price = round(float(special_price), 2)
+            if pushed is None:
+                # Sem envio, o preço só vale se for o mesmo já enviado: a
+                # concorrência é atualizada e a entrada ainda vence em max_age
+                entry = self.entries.get(sku)
+                if (
+                    entry is not None
+                    and entry['special_price'] == special_price
+                ):
+                    entry['competitor_price'] = competitor_price
+                    entry['price'] = price
+                continue
+            self.entries[sku] = {
+                'competitor_price': competitor_price,
+                'price': price,
+                'special_price': special_price,
+                'updated_at': updated_at,
+            }
+        self.save()
@@ -6,7 +6,8 @@ import schedule
 
 from kami_pricing.constant import PRICING_MANAGER_FILE, ROOT_DIR
 from kami_pricing.messages import get_contacts_from_json, send_email_by_group
-from kami_pricing.pricing_manager import PricingManager, pricing_logger
+from kami_pricing.pricing_manager import pricing_logger
+from kami_pricing.runner import PricingRunner
 
 contacts = get_contacts_from_json(
     path.join(ROOT_DIR, 'messages/contacts.json')
@@ -34,16 +35,24 @@ def _remove_files_from(folder_path):
 
 
 def update_prices():
-    pricing_manager = PricingManager.from_json(file_path=PRICING_MANAGER_FILE)
-    scraping_df, pricing_df = pricing_manager.scraping_and_pricing()
+    pricing_runner = PricingRunner.from_json(file_path=PRICING_MANAGER_FILE)
+    status_df = pricing_runner.run()
     _remove_files_from(reports_folder)
-    pricing_df.to_excel(
-        reports_folder + '/novos_precos.xlsx', index=False, engine='openpyxl'
+    for job_name, (scraping_df, pricing_df) in pricing_runner.outputs.items():
+        prefix = '' if len(pricing_runner.managers) == 1 else f'{job_name}_'
+        pricing_df.to_excel(
+            f'{reports_folder}/{prefix}novos_precos.xlsx',
+            index=False,
+            engine='openpyxl',
+        )
+        scraping_df.to_excel(
+            f'{reports_folder}/{prefix}concorrentes.xlsx',
+            index=False,
+            engine='openpyxl',
+        )
+    status_df.to_excel(
+        reports_folder + '/status.xlsx', index=False, engine='openpyxl'
     )
-    scraping_df.to_excel(
-        reports_folder + '/concorrentes.xlsx', index=False, engine='openpyxl'
-    )
-    pricing_manager.update_prices(pricing_df=pricing_df)
 
 
 def send_emails():
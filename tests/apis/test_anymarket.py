@@ -3,7 +3,14 @@ import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
 # Using the provided names for module and class
-from kami_pricing.api.anymarket import AnymarketAPI, AnymarketAPIError
+import pandas as pd
+
+from kami_pricing.api.anymarket import (
+    AnymarketAPI,
+    AnymarketAPIError,
+    AsyncAnymarketAPI,
+)
+from tests.stand_in_server import StandInServer
 
 
 class TestAnymarketAPI(unittest.TestCase):
@@ -76,5 +83,242 @@ class TestAnymarketAPI(unittest.TestCase):
         self.assertEqual(self.anymarket_api.result.status_code, 200)
 
 
+class TestAnymarketAPIBatchedPrices(unittest.TestCase):
+    def _get_api(self, server):
+        anymarket_api = AnymarketAPI(base_url=server.base_url, batch_size=10)
+        anymarket_api.credentials = {'token': 'mock_token'}
+        return anymarket_api
+
+    def test_update_ads_prices_in_batches(self):
+        ads_prices = [{'id': i, 'price': 10.0 + i} for i in range(23)]
+        with StandInServer() as server:
+            results = self._get_api(server).update_ads_prices(ads_prices)
+
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(
+            [len(request['body']) for request in server.requests],
+            [10, 10, 3],
+        )
+        self.assertEqual(
+            server.requests[0]['body'][1],
+            {'id': 1, 'price': 11.0, 'discountPrice': 11.0},
+        )
+        self.assertTrue(all(result['success'] for result in results))
+
+    def test_update_ads_prices_reports_failures_per_ad(self):
+        def handler(method, path, body):
+            if any(ad['id'] == 15 for ad in body):
+                return 500, {'message': 'internal error'}
+            return 200, [
+                {'id': ad['id'], 'errorMessage': 'Invalid price'}
+                for ad in body
+                if ad['id'] == 3
+            ]
+
+        ads_prices = [{'id': i, 'price': 10.0 + i} for i in range(23)]
+        with StandInServer(handler) as server:
+            results = self._get_api(server).update_ads_prices(ads_prices)
+
+        failed = [result['id'] for result in results if not result['success']]
+        self.assertEqual(failed, [3] + list(range(10, 20)))
+        self.assertEqual(results[3]['error'], 'Invalid price')
+
+    def test_update_prices_on_marketplace_reports_missing_ads(self):
+        def handler(method, path, body):
+            if path.startswith('/v2/products?partnerId='):
+                partner_id = path.split('=')[1]
+                if partner_id == 'MISSING':
+                    return 200, {'content': []}
+                return 200, {'content': [{'id': f'P{partner_id}'}]}
+            if path.startswith('/v2/skus/marketplaces?partnerID='):
+                partner_id = path.split('=')[1]
+                return 200, [
+                    {'id': f'BW{partner_id}', 'marketPlace': 'BELEZA_NA_WEB'}
+                ]
+            return 200, {}
+
+        pricing_df = pd.DataFrame(
+            {'sku (*)': ['A', 'MISSING'], 'special_price': [10.0, 20.0]}
+        )
+        with StandInServer(handler) as server:
+            results = self._get_api(server).update_prices_on_marketplace(
+                pricing_df
+            )
+
+        results = {result['sku (*)']: result for result in results}
+        self.assertTrue(results['A']['success'])
+        self.assertFalse(results['MISSING']['success'])
+        self.assertIsNotNone(results['MISSING']['error'])
+
+
+class TestAnymarketAPIPagination(unittest.TestCase):
+    def _handler(self, method, path, body):
+        query = dict(
+            param.split('=') for param in path.split('?')[1].split('&')
+        )
+        offset, limit = int(query['offset']), int(query['limit'])
+        products = [
+            {'id': i, 'skus': [{'partnerId': f'SKU{i}'}]}
+            for i in range(offset, min(offset + limit, 250))
+        ]
+        return 200, {'page': {'totalElements': 250}, 'content': products}
+
+    def test_get_partner_and_product_ids_paginates(self):
+        with StandInServer(self._handler) as server:
+            anymarket_api = AnymarketAPI(
+                base_url=server.base_url, page_size=100, prefetch_pages=2
+            )
+            anymarket_api.credentials = {'token': 'mock_token'}
+            (
+                partner_ids,
+                product_ids,
+            ) = anymarket_api.get_partner_and_product_ids()
+
+        self.assertEqual(product_ids, list(range(250)))
+        self.assertEqual(partner_ids, [f'SKU{i}' for i in range(250)])
+        self.assertEqual(
+            sorted(request['path'] for request in server.requests),
+            [
+                '/v2/products?offset=0&limit=100',
+                '/v2/products?offset=100&limit=100',
+                '/v2/products?offset=200&limit=100',
+            ],
+        )
+
+
+class TestAnymarketAPIProductsAds(unittest.TestCase):
+    def _handler(self, method, path, body):
+        partner_id = path.split('=')[1]
+        if partner_id == 'BROKEN':
+            return 500, {}
+        return 200, [
+            {
+                'id': f'BW{partner_id}',
+                'skuInMarketplace': partner_id,
+                'marketPlace': 'BELEZA_NA_WEB',
+                'publicationStatus': 'ACTIVE',
+                'marketplaceStatus': 'ATIVO',
+                'price': 10.5,
+                'fields': {'title': f'Product {partner_id}'},
+                'attributes': {'nested': {'ignored': True}},
+            },
+            {'id': f'ML{partner_id}', 'marketPlace': 'MERCADO_LIVRE'},
+        ]
+
+    def test_get_products_ads_keeps_only_listed_columns(self):
+        with StandInServer(self._handler) as server:
+            anymarket_api = AnymarketAPI(
+                base_url=server.base_url, max_workers=2
+            )
+            anymarket_api.credentials = {'token': 'mock_token'}
+            ads_df = anymarket_api.get_products_ads(['A', 'BROKEN', 'B', 'C'])
+
+        self.assertEqual(
+            list(ads_df.columns),
+            [
+                'sku (*)',
+                'id',
+                'marketPlace',
+                'publicationStatus',
+                'marketplaceStatus',
+                'price',
+                'fields.title',
+            ],
+        )
+        self.assertEqual(list(ads_df['sku (*)']), ['A', 'B', 'C'])
+        self.assertEqual(list(ads_df['fields.title'])[0], 'Product A')
+        self.assertEqual(ads_df['price'].dtype, 'float64')
+
+
+class TestAsyncAnymarketAPI(unittest.TestCase):
+    def setUp(self):
+        self.rate_limited = set()
+
+    def _handler(self, method, path, body):
+        if path.startswith('/v2/products?partnerId='):
+            partner_id = path.split('=')[1]
+            if partner_id == 'MISSING':
+                return 200, {'content': []}
+            if partner_id == 'LIMITED' and partner_id not in self.rate_limited:
+                self.rate_limited.add(partner_id)
+                return 429, {}, {'Retry-After': '0'}
+            return 200, {'content': [{'id': f'P{partner_id}'}]}
+        if path.startswith('/v2/skus/marketplaces?partnerID='):
+            partner_id = path.split('=')[1]
+            return 200, [
+                {'id': f'ML{partner_id}', 'marketPlace': 'MERCADO_LIVRE'},
+                {'id': f'BW{partner_id}', 'marketPlace': 'BELEZA_NA_WEB'},
+            ]
+        return 200, {}
+
+    def test_update_prices_on_marketplace_per_sku_results(self):
+        pricing_df = pd.DataFrame(
+            {
+                'sku (*)': ['A', 'LIMITED', 'MISSING', 'B'],
+                'special_price': [10.0, 20.0, 30.0, 40.0],
+            }
+        )
+        with StandInServer(self._handler) as server:
+            anymarket_api = AsyncAnymarketAPI(
+                base_url=server.base_url, requests_per_second=100
+            )
+            anymarket_api.credentials = {'token': 'mock_token'}
+            results = anymarket_api.update_prices_on_marketplace(pricing_df)
+
+        self.assertEqual(
+            [result['sku (*)'] for result in results],
+            ['A', 'LIMITED', 'MISSING', 'B'],
+        )
+        self.assertEqual(
+            [result['success'] for result in results],
+            [True, True, False, True],
+        )
+        self.assertIsNotNone(results[2]['error'])
+        batches = [
+            request['body']
+            for request in server.requests
+            if request['method'] == 'PUT'
+        ]
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(
+            [ad['id'] for ad in batches[0]], ['BWA', 'BWLIMITED', 'BWB']
+        )
+        self.assertIn(
+            {'id': 'BWLIMITED', 'price': 20.0, 'discountPrice': 20.0},
+            batches[0],
+        )
+
+    def test_price_batches_are_retried_when_rate_limited(self):
+        def handler(method, path, body):
+            if method == 'PUT' and 'PUT' not in self.rate_limited:
+                self.rate_limited.add('PUT')
+                return 429, {}, {'Retry-After': '0'}
+            return self._handler(method, path, body)
+
+        pricing_df = pd.DataFrame(
+            {'sku (*)': ['A', 'B', 'C'], 'special_price': [10.0, 20.0, 30.0]}
+        )
+        with StandInServer(handler) as server:
+            anymarket_api = AsyncAnymarketAPI(
+                base_url=server.base_url,
+                batch_size=2,
+                requests_per_second=100,
+            )
+            anymarket_api.credentials = {'token': 'mock_token'}
+            results = anymarket_api.update_prices_on_marketplace(pricing_df)
+
+        self.assertTrue(all(result['success'] for result in results))
+        batches = [
+            request['body']
+            for request in server.requests
+            if request['method'] == 'PUT'
+        ]
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(
+            {ad['id'] for batch in batches for ad in batch},
+            {'BWA', 'BWB', 'BWC'},
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,126 @@
+import tempfile
+import unittest
+from os import path
+
+import pandas as pd
+
+from kami_pricing.api.anymarket import AnymarketAPI
+from kami_pricing.api.anymarket_index import AnymarketIndex
+from tests.stand_in_server import StandInServer
+
+PRODUCTS = [
+    {
+        'id': 1,
+        'calculatedPrice': False,
+        'definitionPriceScope': 'SKU_MARKETPLACE',
+        'skus': [{'partnerId': 'A'}],
+    },
+    {
+        'id': 2,
+        'calculatedPrice': True,
+        'definitionPriceScope': 'SKU',
+        'skus': [{'partnerId': 'B'}],
+    },
+]
+
+
+def _handler(method, path, body):
+    if path.startswith('/v2/products?offset='):
+        return 200, {
+            'page': {'totalElements': len(PRODUCTS)},
+            'content': PRODUCTS,
+        }
+    if path.startswith('/v2/skus/marketplaces?partnerID='):
+        partner_id = path.split('=')[1]
+        return 200, [{'id': f'BW{partner_id}', 'marketPlace': 'BELEZA_NA_WEB'}]
+    return 200, {}
+
+
+class TestAnymarketIndex(unittest.TestCase):
+    def setUp(self):
+        self.index_dir = tempfile.TemporaryDirectory()
+        self.file_path = path.join(self.index_dir.name, 'index.json')
+        self.pricing_df = pd.DataFrame(
+            {'sku (*)': ['A', 'B'], 'special_price': [10.0, 20.0]}
+        )
+
+    def tearDown(self):
+        self.index_dir.cleanup()
+
+    def _get_api(self, server):
+        anymarket_api = AnymarketAPI(
+            base_url=server.base_url,
+            index=AnymarketIndex(file_path=self.file_path),
+        )
+        anymarket_api.credentials = {'token': 'mock_token'}
+        return anymarket_api
+
+    def test_index_removes_lookup_round_trips(self):
+        with StandInServer(_handler) as server:
+            results = self._get_api(server).update_prices_on_marketplace(
+                self.pricing_df
+            )
+            first_run = [
+                (request['method'], request['path'])
+                for request in server.requests
+            ]
+            server.requests.clear()
+            self._get_api(server).update_prices_on_marketplace(self.pricing_df)
+            second_run = [
+                (request['method'], request['path'])
+                for request in server.requests
+            ]
+
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(
+            [request for request in first_run if request[0] == 'PATCH'],
+            [('PATCH', '/v2/products/2')],
+        )
+        self.assertNotIn(('GET', '/v2/products?partnerId=A'), first_run)
+        self.assertEqual(second_run, [('PUT', '/v2/skus/marketplaces/prices')])
+
+    def test_failed_push_drops_the_cached_ad(self):
+        def handler(method, path, body):
+            if method == 'PUT':
+                return 200, [
+                    {'id': ad['id'], 'errorMessage': 'Not found'}
+                    for ad in body
+                    if ad['id'] == 'BWA'
+                ]
+            return _handler(method, path, body)
+
+        with StandInServer(handler) as server:
+            results = self._get_api(server).update_prices_on_marketplace(
+                self.pricing_df
+            )
+            server.requests.clear()
+            self._get_api(server).update_prices_on_marketplace(self.pricing_df)
+            second_run = [
+                (request['method'], request['path'])
+                for request in server.requests
+            ]
+
+        self.assertEqual(
+            [result['success'] for result in results], [False, True]
+        )
+        self.assertEqual(
+            second_run,
+            [
+                ('GET', '/v2/skus/marketplaces?partnerID=A'),
+                ('PUT', '/v2/skus/marketplaces/prices'),
+            ],
+        )
+
+    def test_refresh_drops_known_ads(self):
+        index = AnymarketIndex(file_path=self.file_path)
+        index.refresh(PRODUCTS)
+        index.get('A')['ads']['BELEZA_NA_WEB'] = 'BWA'
+        index.refresh(PRODUCTS)
+        self.assertEqual(index.get('A')['ads'], {})
+        self.assertTrue(index.get('A')['manual_pricing'])
+        self.assertFalse(index.get('B')['manual_pricing'])
+        self.assertFalse(index.is_stale())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from kami_pricing.api.anymarket import AnymarketAPI
+from kami_pricing.api.http_client import PooledHTTPClient
+from kami_pricing.api.plugg_to import PluggToAPI
+from tests.stand_in_server import StandInServer
+
+
+class TestPooledHTTPClient(unittest.TestCase):
+    def test_client_is_reused_until_closed(self):
+        http_client = PooledHTTPClient()
+        client = http_client.client
+        self.assertIs(http_client.client, client)
+
+        http_client.close()
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(http_client.client, client)
+        http_client.close()
+
+    def test_apis_share_the_pool_as_context_managers(self):
+        http_client = PooledHTTPClient()
+        with StandInServer(
+            lambda method, path, body: (200, {'page': {'totalElements': 3}})
+        ) as server:
+            with AnymarketAPI(
+                base_url=server.base_url, http_client=http_client
+            ) as anymarket_api:
+                anymarket_api.credentials = {'token': 'mock_token'}
+                client = http_client.client
+                for _ in range(3):
+                    self.assertEqual(anymarket_api.get_products_quantity(), 3)
+                self.assertIs(http_client.client, client)
+
+        self.assertTrue(client.is_closed)
+        self.assertEqual(len(server.requests), 3)
+        self.assertIs(
+            PluggToAPI(http_client=http_client).http_client, http_client
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
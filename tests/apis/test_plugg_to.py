@@ -1,9 +1,17 @@
 import json
+import threading
 import unittest
 from unittest.mock import mock_open, patch
 
 # Using the provided names for module and class
-from kami_pricing.api.plugg_to import PluggToAPI, PluggToAPIError
+import pandas as pd
+
+from kami_pricing.api.plugg_to import (
+    AsyncPluggToAPI,
+    PluggToAPI,
+    PluggToAPIError,
+)
+from tests.stand_in_server import StandInServer
 
 
 class TestPluggToAPI(unittest.TestCase):
@@ -62,5 +70,111 @@ class TestPluggToAPI(unittest.TestCase):
         )
 
 
+class TestPluggToAPIAccessToken(unittest.TestCase):
+    def setUp(self):
+        self.tokens = 0
+        self.rejected = False
+
+    def _handler(self, method, path, body):
+        if path == '/oauth/token':
+            self.tokens += 1
+            return 200, {
+                'access_token': f'token-{self.tokens}',
+                'expires_in': 3600,
+            }
+        if not self.rejected:
+            self.rejected = True
+            return 401, {'message': 'invalid token'}
+        return 200, {}
+
+    def _get_api(self, server):
+        api_instance = PluggToAPI(base_url=server.base_url)
+        api_instance.credentials = {
+            'client_id': 'id',
+            'client_secret': 'secret',
+            'username': 'user',
+            'password': 'password',
+        }
+        return api_instance
+
+    def test_token_is_reused_and_refreshed_once_on_401(self):
+        with StandInServer(self._handler) as server:
+            api_instance = self._get_api(server)
+            api_instance.update_price(sku='A', new_price=10.0)
+            api_instance.update_price(sku='B', new_price=20.0)
+
+        self.assertEqual(
+            [request['path'] for request in server.requests],
+            ['/oauth/token', '/skus/A', '/oauth/token', '/skus/A', '/skus/B'],
+        )
+        self.assertEqual(
+            server.requests[-1]['headers']['Authorization'], 'Bearer token-2'
+        )
+
+
+class TestAsyncPluggToAPI(unittest.TestCase):
+    def setUp(self):
+        self.pricing_df = pd.DataFrame(
+            {
+                'sku (*)': ['A', 'BROKEN', 'B'],
+                'special_price': [10.0, 20.0, 30.0],
+            }
+        )
+
+    def _handler(self, method, path, body):
+        if path == '/oauth/token':
+            return 200, {'access_token': 'token', 'expires_in': 3600}
+        if path == '/skus/BROKEN':
+            return 500, {'message': 'internal error'}
+        return 200, {}
+
+    def _get_api(self, server, **kwargs):
+        api_instance = AsyncPluggToAPI(
+            base_url=server.base_url, requests_per_second=100, **kwargs
+        )
+        api_instance.credentials = {
+            'client_id': 'id',
+            'client_secret': 'secret',
+            'username': 'user',
+            'password': 'password',
+        }
+        return api_instance
+
+    def test_update_prices_per_sku_results(self):
+        with StandInServer(self._handler) as server:
+            results = self._get_api(server).update_prices(self.pricing_df)
+
+        self.assertEqual(
+            [(result['sku (*)'], result['success']) for result in results],
+            [('A', True), ('BROKEN', False), ('B', True)],
+        )
+        puts = {
+            request['path']: request['body']
+            for request in server.requests
+            if request['method'] == 'PUT'
+        }
+        self.assertEqual(puts['/skus/B'], [{'special_price': 30.0}])
+        self.assertEqual(
+            len([r for r in server.requests if r['path'] == '/oauth/token']),
+            1,
+        )
+
+    def test_token_is_refreshed_off_the_event_loop(self):
+        threads = []
+        with StandInServer(self._handler) as server:
+            api_instance = self._get_api(server)
+            request_access_token = api_instance._request_access_token
+
+            def _request_access_token():
+                threads.append(threading.current_thread())
+                return request_access_token()
+
+            api_instance._request_access_token = _request_access_token
+            api_instance.update_prices(self.pricing_df)
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,10 @@
 import json
 import unittest
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import mock_open, patch
 
 from kami_pricing.api.tiny import TinyAPI, TinyAPIError
+from kami_pricing.api.ttl_cache import TTLCache
+from tests.stand_in_server import StandInServer
 
 
 class TestTinyAPI(unittest.TestCase):
@@ -56,5 +58,43 @@ class TestTinyAPI(unittest.TestCase):
         )
 
 
+class TestTinyAPIProductsLookup(unittest.TestCase):
+    def _handler(self, method, path, body):
+        sku = body['pesquisa']
+        if sku == 'MISSING':
+            return 200, {'retorno': {'status': 'Erro', 'erros': ['not found']}}
+        return 200, {
+            'retorno': {
+                'status': 'OK',
+                'produtos': [{'produto': {'codigo': sku, 'preco': 10.0}}],
+            }
+        }
+
+    def test_products_are_cached_between_runs(self):
+        with StandInServer(self._handler) as server:
+            tiny_api = TinyAPI(
+                base_url=f'{server.base_url}/',
+                requests_per_minute=6000,
+                product_cache=TTLCache(),
+            )
+            tiny_api.credentials = {'token': 'mock_token'}
+            first_run = tiny_api.get_products_list_by_sku(
+                ['A', 'MISSING', 'B']
+            )
+            server.requests.clear()
+            second_run = tiny_api.get_products_list_by_sku(['B', 'C', 'A'])
+
+        self.assertEqual(first_run[0], {'codigo': 'A', 'preco': 10.0})
+        self.assertEqual(first_run[1]['sku'], 'MISSING')
+        self.assertIn('error', first_run[1])
+        self.assertEqual(
+            [product['codigo'] for product in second_run], ['B', 'C', 'A']
+        )
+        self.assertEqual(
+            [request['body']['pesquisa'] for request in server.requests],
+            ['C'],
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
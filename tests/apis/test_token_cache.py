@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import time
+import unittest
+from os import path
+
+from kami_pricing.api.token_cache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = path.join(self.temp_dir, 'tokens', 'token.json')
+        self.issued = []
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _request_token(self, expires_in: float = 3600):
+        self.issued.append(f'token-{len(self.issued) + 1}')
+        return {'access_token': self.issued[-1], 'expires_in': expires_in}
+
+    def test_reuses_token_until_refresh_margin(self):
+        token_cache = TokenCache(refresh_margin=60)
+        self.assertEqual(
+            token_cache.get_or_refresh(self._request_token), 'token-1'
+        )
+        self.assertEqual(
+            token_cache.get_or_refresh(self._request_token), 'token-1'
+        )
+
+        token_cache.expires_at = time.time() + 30
+        self.assertEqual(
+            token_cache.get_or_refresh(self._request_token), 'token-2'
+        )
+
+    def test_persisted_token_is_shared(self):
+        first_cache = TokenCache(file_path=self.file_path)
+        first_cache.get_or_refresh(self._request_token)
+
+        second_cache = TokenCache(file_path=self.file_path)
+        self.assertEqual(
+            second_cache.get_or_refresh(self._request_token), 'token-1'
+        )
+        self.assertEqual(self.issued, ['token-1'])
+
+    def test_invalidate_ignores_already_refreshed_token(self):
+        token_cache = TokenCache()
+        token_cache.get_or_refresh(self._request_token)
+        token_cache.invalidate('token-0')
+        self.assertTrue(token_cache.is_valid())
+        token_cache.invalidate('token-1')
+        self.assertFalse(token_cache.is_valid())
+
+    def test_invalidate_expires_persisted_token(self):
+        token_cache = TokenCache(file_path=self.file_path)
+        token_cache.get_or_refresh(self._request_token)
+        token_cache.invalidate('token-1')
+        self.assertEqual(
+            token_cache.get_or_refresh(self._request_token), 'token-2'
+        )
+
+        other_cache = TokenCache(file_path=self.file_path)
+        other_cache.invalidate('token-1')
+        self.assertEqual(
+            other_cache.get_or_refresh(self._request_token), 'token-2'
+        )
+        self.assertEqual(self.issued, ['token-1', 'token-2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
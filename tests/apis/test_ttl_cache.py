@@ -0,0 +1,44 @@
+import shutil
+import tempfile
+import time
+import unittest
+from os import path
+
+from kami_pricing.api.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = path.join(self.temp_dir, 'cache.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_evicts_least_recently_used(self):
+        ttl_cache = TTLCache(max_entries=2)
+        ttl_cache.put('A', 1)
+        ttl_cache.put('B', 2)
+        ttl_cache.get('A')
+        ttl_cache.put('C', 3)
+        self.assertEqual(ttl_cache.get('A'), 1)
+        self.assertIsNone(ttl_cache.get('B'))
+        self.assertEqual(len(ttl_cache), 2)
+
+    def test_expired_entries_are_dropped(self):
+        ttl_cache = TTLCache(ttl=60)
+        ttl_cache.put('A', 1)
+        ttl_cache.entries['A'] = (time.time() - 61, 1)
+        self.assertIsNone(ttl_cache.get('A'))
+
+    def test_entries_persist_between_instances(self):
+        ttl_cache = TTLCache(file_path=self.file_path)
+        ttl_cache.put('A', {'codigo': 'A'})
+        ttl_cache.save()
+        self.assertEqual(
+            TTLCache(file_path=self.file_path).get('A'), {'codigo': 'A'}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+
+class StandInServer:
+    """Local HTTP server recording requests and answering with a handler.
+
+    The handler receives ``(method, path, body)`` and returns
+    ``(status_code, json_body)`` or ``(status_code, json_body, headers)``.
+    """
+
+    def __init__(self, handler: Callable = None):
+        self.handler = handler or (lambda method, path, body: (200, {}))
+        self.requests: List[Dict] = []
+        self.server = None
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw_body = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw_body) if raw_body else None
+                except json.JSONDecodeError:
+                    body = raw_body.decode('utf-8')
+                stand_in.requests.append(
+                    {
+                        'method': self.command,
+                        'path': self.path,
+                        'headers': dict(self.headers),
+                        'body': body,
+                    }
+                )
+                status_code, response, *headers = stand_in.handler(
+                    self.command, self.path, body
+                )
+                content = json.dumps(response).encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                for name, value in (headers[0] if headers else {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
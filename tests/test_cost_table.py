@@ -0,0 +1,232 @@
+import tempfile
+import unittest
+from os import path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from kami_pricing.cost_table import (
+    CostTable,
+    CostTableError,
+    parse_brl_decimals,
+)
+from kami_pricing.pricing import Pricing
+from kami_pricing.sheets import SheetReader
+
+
+def _raw_cost_sheet() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'sku (*)': ['K1', 'K2', 'K3'],
+            'special_price': ['20,5', '1.050,00', '30'],
+            'CUSTO': ['10,25', '1.234,56', 'None'],
+            'FRETE': ['5', '7.5', '2,00'],
+            'INSUMO': ['R$ 1,10', '', '0,50'],
+        }
+    )
+
+
+class TestCostTable(unittest.TestCase):
+    def setUp(self):
+        self.revision = '1'
+        self.cost_table = CostTable(
+            sheet_id='sheet', get_revision=lambda sheet_id: self.revision
+        )
+
+    def test_parse_brl_decimals(self):
+        parsed = parse_brl_decimals(_raw_cost_sheet()[['CUSTO', 'INSUMO']])
+        self.assertTrue((parsed.dtypes == np.float64).all())
+        np.testing.assert_array_equal(
+            parsed.to_numpy(),
+            [[10.25, 1.10], [1234.56, np.nan], [np.nan, 0.50]],
+        )
+
+    def test_load_rejects_unexpected_schema(self):
+        with self.assertRaises(CostTableError):
+            self.cost_table.load(pd.DataFrame({'sku (*)': ['K1']}))
+
+    def test_lookup_is_keyed_by_revision(self):
+        self.cost_table.load(_raw_cost_sheet())
+        costs = self.cost_table.lookup(pd.Series(['K3', 'K1']))
+        self.assertEqual(list(costs['FRETE']), [2.0, 5.0])
+
+        self.assertIsNone(self.cost_table.lookup(pd.Series(['K4'])))
+        self.revision = '2'
+        self.assertIsNone(self.cost_table.lookup(pd.Series(['K1'])))
+
+    def test_parsed_table_is_kept_on_disk_between_runs(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            file_path = path.join(cache_dir, 'sheets', 'costs.json')
+            CostTable(
+                sheet_id='sheet',
+                get_revision=lambda sheet_id: self.revision,
+                file_path=file_path,
+            ).load(_raw_cost_sheet())
+
+            cost_table = CostTable(
+                sheet_id='sheet',
+                get_revision=lambda sheet_id: self.revision,
+                file_path=file_path,
+            )
+            costs = cost_table.lookup(pd.Series(['K2', 'K1']))
+            self.assertEqual(list(costs['CUSTO']), [1234.56, 10.25])
+            self.assertTrue(np.isnan(costs['INSUMO'][0]))
+
+            self.revision = '2'
+            self.assertIsNone(cost_table.lookup(pd.Series(['K1'])))
+
+    @patch('kami_pricing.sheets.gdrive', None)
+    @patch('kami_pricing.sheets.KamiGdrive')
+    def test_default_revision_reads_the_drive_version(self, gdrive):
+        files = gdrive.return_value.service.files.return_value
+        files.get.return_value.execute.return_value = {'version': '7'}
+        cost_table = CostTable(sheet_id='sheet')
+
+        self.assertEqual(cost_table.current_revision(), '7')
+        cost_table.load(_raw_cost_sheet())
+        self.assertTrue(cost_table.is_fresh())
+        files.get.assert_called_with(fileId='sheet', fields='version')
+        gdrive.assert_called_once()
+        gdrive.return_value.connect.assert_called_once()
+
+    def _sheet_reader(self, kg: MagicMock) -> SheetReader:
+        return SheetReader(
+            sheet_id='sheet',
+            gsheet=kg,
+            get_revision=lambda sheet_id: self.revision,
+        )
+
+    def test_ebitda_proccess_skips_sheet_on_cache_hit(self):
+        kg = MagicMock()
+        kg.convert_range_to_dataframe.return_value = _raw_cost_sheet()
+        pricing = Pricing(
+            cost_table=self.cost_table, sheet_reader=self._sheet_reader(kg)
+        )
+        df = pd.DataFrame(
+            {'sku (*)': ['K2', 'K1'], 'special_price': [1050.0, 20.5]}
+        )
+
+        first = pricing.ebitda_proccess(df)
+        second = pricing.ebitda_proccess(df)
+
+        self.assertEqual(kg.convert_range_to_dataframe.call_count, 1)
+        self.assertEqual(kg.append_dataframe.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(first['CUSTO']), [1234.56, 10.25])
+
+    def test_sheet_costs_are_kept_across_batches(self):
+        kg = MagicMock()
+        raw_df = _raw_cost_sheet().set_index('sku (*)', drop=False)
+        ebit_tab = {}
+
+        def write_batch(df, sheet_id, sheet_range):
+            ebit_tab['skus'] = list(df['sku (*)'])
+            self.revision = str(int(self.revision) + 1)
+
+        kg.append_dataframe.side_effect = write_batch
+        kg.convert_range_to_dataframe.side_effect = lambda *args: raw_df.loc[
+            ebit_tab['skus']
+        ].reset_index(drop=True)
+        pricing = Pricing(
+            cost_table=self.cost_table, sheet_reader=self._sheet_reader(kg)
+        )
+        batches = [
+            pd.DataFrame(
+                {'sku (*)': ['K1', 'K2'], 'special_price': [20.5, 1.0]}
+            ),
+            pd.DataFrame({'sku (*)': ['K3'], 'special_price': [30.0]}),
+        ]
+
+        for batch in batches:
+            pricing.ebitda_proccess(batch)
+        self.assertEqual(kg.convert_range_to_dataframe.call_count, 2)
+        self.assertEqual(list(self.cost_table.costs.index), ['K1', 'K2', 'K3'])
+
+        for batch in batches:
+            df_ebitda = pricing.ebitda_proccess(batch)
+        self.assertEqual(kg.append_dataframe.call_count, 2)
+        self.assertEqual(kg.convert_range_to_dataframe.call_count, 2)
+        self.assertEqual(list(df_ebitda['FRETE']), [2.0])
+
+        self.revision = '10'
+        pricing.ebitda_proccess(batches[1])
+        self.assertEqual(list(self.cost_table.costs.index), ['K3'])
+
+    def _local_pricing(self, reader_kg: MagicMock) -> Pricing:
+        batch_get = reader_kg.service.spreadsheets().values().batchGet
+        raw_df = _raw_cost_sheet()
+        batch_get.return_value.execute.return_value = {
+            'valueRanges': [
+                {'values': [list(raw_df.columns)] + raw_df.values.tolist()}
+            ]
+        }
+        return Pricing(
+            cost_table=self.cost_table,
+            cost_join='local',
+            sheet_reader=self._sheet_reader(reader_kg),
+        )
+
+    @patch('kami_pricing.pricing.KamiGsheet')
+    def test_local_cost_join_reports_in_background(self, MockKamiGsheet):
+        reader_kg = MagicMock()
+        report_kg = MockKamiGsheet.return_value
+
+        def bump_revision(*args):
+            self.revision = str(int(self.revision) + 1)
+
+        report_kg.append_dataframe.side_effect = bump_revision
+        pricing = self._local_pricing(reader_kg)
+        df = pd.DataFrame(
+            {'sku (*)': ['K2', 'K3'], 'special_price': [1050.0, 20.5]}
+        )
+
+        df_ebitda = pricing.ebitda_proccess(df)
+        self.cost_table.submit_report(lambda: None).result()
+        pricing.ebitda_proccess(df)
+        self.cost_table.submit_report(lambda: None).result()
+
+        batch_get = reader_kg.service.spreadsheets().values().batchGet
+        batch_get.assert_called_once_with(
+            spreadsheetId='sheet', ranges=['ebit!A1:E']
+        )
+        self.assertEqual(report_kg.append_dataframe.call_count, 2)
+        reader_kg.append_dataframe.assert_not_called()
+        self.assertEqual(df_ebitda['CUSTO'][0], 1234.56)
+        self.assertTrue(np.isnan(df_ebitda['CUSTO'][1]))
+
+    @patch('kami_pricing.pricing.KamiGsheet')
+    def test_local_cost_join_reads_missing_skus_from_the_sheet(
+        self, MockKamiGsheet
+    ):
+        reader_kg = MagicMock()
+        reader_kg.convert_range_to_dataframe.return_value = pd.DataFrame(
+            {
+                'sku (*)': ['K9'],
+                'special_price': ['20,5'],
+                'CUSTO': ['3,50'],
+                'FRETE': ['1'],
+                'INSUMO': ['0'],
+            }
+        )
+        pricing = self._local_pricing(reader_kg)
+        df = pd.DataFrame(
+            {'sku (*)': ['K1', 'K9'], 'special_price': [20.5, 20.5]}
+        )
+
+        df_ebitda = pricing.ebitda_proccess(df)
+        pricing.ebitda_proccess(df)
+        self.cost_table.submit_report(lambda: None).result()
+
+        self.assertEqual(reader_kg.append_dataframe.call_count, 1)
+        self.assertEqual(list(df_ebitda['CUSTO']), [10.25, 3.5])
+        self.assertEqual(
+            list(self.cost_table.costs.index), ['K1', 'K2', 'K3', 'K9']
+        )
+        self.assertEqual(
+            MockKamiGsheet.return_value.append_dataframe.call_count, 1
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import tempfile
+import unittest
+from os import listdir, path
+
+import pandas as pd
+
+from kami_pricing.history import PriceHistory
+from kami_pricing.offers import OffersBuffer
+from kami_pricing.pricing_manager import SELLERS_REPORT_COLUMNS
+
+
+def _sellers_df(prices):
+    offers = OffersBuffer()
+    offers.extend(
+        [
+            [sku, 'BRAND', 'CAT', f'P {sku}', price, seller]
+            for (sku, seller), price in prices.items()
+        ]
+    )
+    return offers.to_frame(columns=SELLERS_REPORT_COLUMNS)
+
+
+def _pricing_df(prices):
+    return pd.DataFrame(
+        {'sku (*)': list(prices), 'special_price': list(prices.values())}
+    )
+
+
+class TestPriceHistory(unittest.TestCase):
+    def setUp(self):
+        self.history_dir = tempfile.TemporaryDirectory()
+        self.history = PriceHistory(root_dir=self.history_dir.name)
+        cycles = [
+            ('2024-01-01 10:00', 50.0, 45.0, 44.9),
+            ('2024-01-01 10:10', 50.0, 44.0, 43.9),
+            ('2024-01-02 10:00', 49.0, 43.5, 43.4),
+        ]
+        for captured_at, hairpro, loja_a, special_price in cycles:
+            self.history.record(
+                _sellers_df(
+                    {
+                        ('MP1', 'HAIRPRO'): hairpro,
+                        ('MP1', 'LOJA A'): loja_a,
+                        ('MP2', 'LOJA A'): 30.0,
+                    }
+                ),
+                _pricing_df({'K1': special_price, 'K2': 29.9}),
+                [
+                    {
+                        'sku (*)': 'K1',
+                        'id': 'AD1',
+                        'price': special_price,
+                        'success': True,
+                        'error': None,
+                    },
+                    {
+                        'sku (*)': 'K2',
+                        'price': 29.9,
+                        'success': False,
+                        'error': 'HTTP error occurred: 422',
+                    },
+                ],
+                company='HAIRPRO',
+                marketplace='BELEZA_NA_WEB',
+                integrator='ANYMARKET',
+                captured_at=captured_at,
+            )
+
+    def tearDown(self):
+        self.history_dir.cleanup()
+
+    def test_cycles_are_appended_to_date_partitions(self):
+        offers_dir = path.join(self.history_dir.name, 'offers')
+        self.assertEqual(
+            sorted(listdir(offers_dir)), ['date=2024-01-01', 'date=2024-01-02']
+        )
+        self.assertEqual(
+            len(listdir(path.join(offers_dir, 'date=2024-01-01'))), 2
+        )
+        self.assertEqual(len(self.history.read('offers')), 9)
+
+    def test_sku_offers_per_seller(self):
+        series = self.history.sku_offers('MP1')
+        self.assertEqual(list(series.columns), ['HAIRPRO', 'LOJA A'])
+        self.assertEqual(list(series['LOJA A']), [45.0, 44.0, 43.5])
+
+    def test_seller_offers_filtered_by_date(self):
+        series = self.history.seller_offers('LOJA A', start='2024-01-02')
+        self.assertEqual(len(series), 1)
+        self.assertEqual(series.loc[:, 'MP1'].iloc[0], 43.5)
+
+        series = self.history.seller_offers(
+            'LOJA A', end='2024-01-01 10:05', sku=['MP2']
+        )
+        self.assertEqual(list(series.columns), ['MP2'])
+        self.assertEqual(len(series), 1)
+
+    def test_sku_prices_and_pushed_flag(self):
+        self.assertEqual(
+            list(self.history.sku_prices('K1')), [44.9, 43.9, 43.4]
+        )
+        pushed = self.history.read('prices').groupby('sku')['pushed']
+        self.assertEqual(pushed.all().to_dict(), {'K1': True, 'K2': False})
+        self.assertFalse(pushed.any()['K2'])
+        self.assertEqual(
+            self.history.last_prices(start='2024-01-01 10:05'),
+            {'K1': 43.4, 'K2': 29.9},
+        )
+
+    def test_prices_without_a_result_are_not_pushed(self):
+        self.history.append_prices(
+            _pricing_df({'K3': 10.0}),
+            company='HAIRPRO',
+            marketplace='BELEZA_NA_WEB',
+            integrator='PLUGG_TO',
+            results=[],
+            captured_at='2024-01-03',
+        )
+        prices_df = self.history.read('prices', sku='K3')
+        self.assertFalse(prices_df['pushed'].iloc[0])
+
+    def test_empty_history(self):
+        history = PriceHistory(root_dir=path.join(self.history_dir.name, 'x'))
+        self.assertTrue(history.read('prices').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from kami_pricing.constant import COLUMNS_ALL_SELLER
+from kami_pricing.offers import OffersBuffer
+
+ROWS = [
+    ['MP1', 'BRAND', 'CAT', 'P1', 50.0, 'HAIRPRO'],
+    ['MP1', 'BRAND', 'CAT', 'P1', 45.0, 'LOJA A'],
+    ['MP2', 'BRAND', None, 'P2', None, 'HAIRPRO'],
+]
+
+
+class TestOffersBuffer(unittest.TestCase):
+    def setUp(self):
+        self.offers = OffersBuffer(capacity=1)
+        for row in ROWS:
+            self.offers.append(row)
+
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.offers), 3)
+        rows = list(self.offers)
+        self.assertEqual(rows[:2], ROWS[:2])
+        self.assertEqual(rows[2][:4], ROWS[2][:4])
+        self.assertTrue(np.isnan(rows[2][4]))
+
+    def test_frame_is_categorical_with_float_prices(self):
+        df = self.offers.to_frame()
+        self.assertEqual(list(df.columns), COLUMNS_ALL_SELLER)
+        self.assertEqual(df['price'].dtype, np.float64)
+        self.assertEqual(df['seller_name'].dtype, 'category')
+        self.assertEqual(
+            list(df['seller_name'].cat.categories), ['HAIRPRO', 'LOJA A']
+        )
+        self.assertTrue(df['category'].isna().iloc[2])
+        self.assertTrue(
+            np.shares_memory(df['price'].to_numpy(), self.offers.prices)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
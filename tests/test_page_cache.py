@@ -0,0 +1,83 @@
+import tempfile
+import time
+import unittest
+from os import listdir, path
+from unittest.mock import MagicMock
+
+from kami_pricing.page_cache import PageCache
+
+FIXTURES_DIR = path.join(path.dirname(path.abspath(__file__)), 'fixtures')
+
+with open(path.join(FIXTURES_DIR, 'beleza_na_web_product.html'), 'rb') as f:
+    PRODUCT_PAGE = f.read()
+
+URL = 'https://www.belezanaweb.com.br/produto-1'
+ROWS = [['MP1001', 'Marca', 'Cabelos', 'Shampoo', 89.9, 'HAIRPRO']]
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.page_cache = PageCache(cache_dir=self.cache_dir.name)
+        self.extract = MagicMock(return_value=ROWS)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def _resolve(self, status_code=200, headers=None, content=PRODUCT_PAGE):
+        entry = self.page_cache.get(URL)
+        return self.page_cache.resolve(
+            url=URL,
+            entry=entry,
+            status_code=status_code,
+            headers=headers or {},
+            content=content,
+            extract=self.extract,
+        )
+
+    def test_miss_then_conditional_headers(self):
+        self.assertEqual(self._resolve(headers={'ETag': '"v1"'}), ROWS)
+        entry = self.page_cache.get(URL)
+        self.assertEqual(
+            self.page_cache.get_conditional_headers(entry),
+            {'If-None-Match': '"v1"'},
+        )
+        self.assertEqual(self.page_cache.stats['miss'], 1)
+
+    def test_not_modified_reuses_rows(self):
+        self._resolve(headers={'ETag': '"v1"'})
+        self.assertEqual(self._resolve(status_code=304, content=b''), ROWS)
+        self.extract.assert_called_once()
+        self.assertEqual(self.page_cache.stats['not_modified'], 1)
+
+    def test_unchanged_offers_skip_parsing(self):
+        self._resolve()
+        changed_page = PRODUCT_PAGE.replace(
+            b'<footer class="footer">', b'<footer class="footer new">'
+        )
+        self.assertEqual(self._resolve(content=changed_page), ROWS)
+        self.extract.assert_called_once()
+        self.assertEqual(self.page_cache.stats['unchanged'], 1)
+
+    def test_changed_offers_are_parsed(self):
+        self._resolve()
+        changed_page = PRODUCT_PAGE.replace(b'84.5', b'83.5')
+        self._resolve(content=changed_page)
+        self.assertEqual(self.extract.call_count, 2)
+
+    def test_expired_entries_are_ignored(self):
+        self.page_cache.ttl = 0
+        self._resolve()
+        time.sleep(0.01)
+        self.assertIsNone(self.page_cache.get(URL))
+
+    def test_evict_keeps_max_entries(self):
+        self.page_cache.max_entries = 2
+        for i in range(4):
+            self.page_cache.put(f'{URL}/{i}', {}, None, ROWS)
+        self.page_cache.report()
+        self.assertEqual(len(listdir(self.cache_dir.name)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+import pandas as pd
+
+from kami_pricing.pipeline import PricingPipeline
+
+
+def _price(sellers_list):
+    if any(row[0] == 'BROKEN' for row in sellers_list):
+        raise ValueError('broken batch')
+    return pd.DataFrame(
+        {
+            'sku (*)': [row[0] for row in sellers_list],
+            'special_price': [row[4] for row in sellers_list],
+        }
+    )
+
+
+class TestPricingPipeline(unittest.TestCase):
+    def test_first_batch_is_pushed_while_scraping(self):
+        first_push = threading.Event()
+
+        def pages():
+            yield [['K1', 'B', 'C', 'N', 10.0, 'LOJA']]
+            # A coleta só termina depois que o primeiro lote foi enviado
+            self.assertTrue(first_push.wait(timeout=5))
+            yield [['K2', 'B', 'C', 'N', 20.0, 'LOJA']]
+
+        def push(pricing_df):
+            first_push.set()
+            return list(pricing_df['sku (*)'])
+
+        pipeline = PricingPipeline(price=_price, push=push, batch_size=1)
+        pricing_df = pipeline.run(pages())
+
+        self.assertEqual(sorted(pricing_df['sku (*)']), ['K1', 'K2'])
+        self.assertEqual(sorted(pipeline.results), ['K1', 'K2'])
+        self.assertEqual(len(pipeline.sellers), 2)
+
+    def test_partial_batch_is_flushed_after_max_delay(self):
+        first_push = threading.Event()
+
+        def pages():
+            yield [['K1', 'B', 'C', 'N', 10.0, 'LOJA']]
+            # A próxima página só chega depois do envio do lote parcial
+            self.assertTrue(first_push.wait(timeout=5))
+            yield [['K2', 'B', 'C', 'N', 20.0, 'LOJA']]
+
+        def push(pricing_df):
+            first_push.set()
+            return list(pricing_df['sku (*)'])
+
+        pipeline = PricingPipeline(
+            price=_price, push=push, batch_size=10, max_batch_delay=0.05
+        )
+        pipeline.run(pages())
+
+        self.assertEqual(pipeline.results, ['K1', 'K2'])
+        self.assertEqual(pipeline.errors, [])
+
+    def test_failed_batches_are_reported_without_stopping(self):
+        pages = [
+            [['K1', 'B', 'C', 'N', 10.0, 'LOJA']],
+            [['BROKEN', 'B', 'C', 'N', 10.0, 'LOJA']],
+            [['K3', 'B', 'C', 'N', 30.0, 'LOJA']],
+        ]
+        pipeline = PricingPipeline(
+            price=_price,
+            push=lambda pricing_df: list(pricing_df['sku (*)']),
+            batch_size=1,
+            pricing_workers=2,
+            push_workers=2,
+            queue_size=1,
+        )
+        pricing_df = pipeline.run(pages)
+
+        self.assertEqual(sorted(pricing_df['sku (*)']), ['K1', 'K3'])
+        self.assertEqual(sorted(pipeline.results), ['K1', 'K3'])
+        self.assertEqual(
+            pipeline.errors, [{'stage': 'pricing', 'error': 'broken batch'}]
+        )
+
+    def test_only_pushed_batches_are_reported_as_pushed(self):
+        def push(pricing_df):
+            if 'K2' in list(pricing_df['sku (*)']):
+                raise ValueError('push failed')
+            return list(pricing_df['sku (*)'])
+
+        pages = [
+            [['K1', 'B', 'C', 'N', 10.0, 'LOJA']],
+            [['K2', 'B', 'C', 'N', 20.0, 'LOJA']],
+        ]
+        pipeline = PricingPipeline(price=_price, push=push, batch_size=1)
+        pricing_df = pipeline.run(pages)
+
+        self.assertEqual(sorted(pricing_df['sku (*)']), ['K1', 'K2'])
+        self.assertEqual(list(pipeline.get_pushed()['sku (*)']), ['K1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from kami_pricing.offers import OffersBuffer
+from kami_pricing.pricing import PPM, Pricing
+
+
+def _ebitda_frame(size: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    custo = np.round(rng.uniform(5, 150, size), 2)
+    frete = np.round(rng.uniform(0, 25, size), 2)
+    insumo = np.round(rng.uniform(0, 5, size), 2)
+    special_price = np.round(
+        (custo + frete + insumo) * rng.uniform(0.8, 2.5, size), 2
+    )
+    return pd.DataFrame(
+        {
+            'sku (*)': [f'SKU{i:05d}' for i in range(size)],
+            'special_price': special_price,
+            'CUSTO': custo,
+            'FRETE': frete,
+            'INSUMO': insumo,
+        }
+    )
+
+
+def _sellers_list(size: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    skus = rng.integers(0, size // 4, size)
+    sellers = rng.choice(['HAIRPRO', 'LOJA A', 'LOJA B', 'LOJA C'], size)
+    prices = np.round(rng.uniform(10, 300, size), 2)
+    sellers_list = [
+        [f'MP{sku}', 'BRAND', 'CAT', f'P{sku}', price, seller]
+        for sku, price, seller in zip(skus, prices, sellers)
+    ]
+    skus_df = pd.DataFrame(
+        {
+            'SKU Seller': [f'K{sku}' for sku in range(size // 4)],
+            'SKU Beleza': [f'MP{sku}' for sku in range(size // 4)],
+        }
+    )
+    return sellers_list, skus_df
+
+
+class TestPricing(unittest.TestCase):
+    def test_unsupported_pricing_engine(self):
+        with self.assertRaises(ValueError):
+            Pricing(pricing_engine='unknown')
+
+    def test_vectorized_pricing_matches_loop(self):
+        df = _ebitda_frame(120)
+        expected = Pricing(pricing_engine='loop').pricing(df.copy())
+        result = Pricing(pricing_engine='vectorized').pricing(df.copy())
+
+        self.assertEqual(list(result['sku (*)']), list(expected['sku (*)']))
+        columns = [
+            'special_price',
+            'COMISSÃO',
+            'ADMIN',
+            'REVERSA',
+            'EBITDA R$',
+            'EBITDA %',
+        ]
+        np.testing.assert_array_equal(result[columns], expected[columns])
+        self.assertTrue((result['EBITDA %'] >= 4.0).all())
+
+    def test_competitor_matching_matches_loop(self):
+        sellers_list, skus_df = _sellers_list(300)
+        expected = Pricing(pricing_engine='loop').create_dataframes(
+            sellers_list=sellers_list, skus_list=skus_df
+        )
+        result = Pricing(pricing_engine='vectorized').create_dataframes(
+            sellers_list=sellers_list, skus_list=skus_df
+        )
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_competitor_matching_accepts_offers_buffer(self):
+        sellers_list, skus_df = _sellers_list(300)
+        offers = OffersBuffer(capacity=16)
+        offers.extend(sellers_list)
+        expected = Pricing().create_dataframes(
+            sellers_list=sellers_list, skus_list=skus_df
+        )
+        result = Pricing().create_dataframes(
+            sellers_list=offers, skus_list=skus_df
+        )
+        pd.testing.assert_frame_equal(
+            result.reset_index(drop=True),
+            expected.reset_index(drop=True),
+            check_dtype=False,
+            check_categorical=False,
+        )
+
+    def test_competitor_matching_with_buffer_where_all_skus_compete(self):
+        sellers_list = [
+            ['MP1', 'BRAND', 'CAT', 'P1', 50.0, 'HAIRPRO'],
+            ['MP1', 'BRAND', 'CAT', 'P1', 45.0, 'LOJA A'],
+            ['MP2', 'BRAND', 'CAT', 'P2', 30.0, 'HAIRPRO'],
+            ['MP2', 'BRAND', 'CAT', 'P2', 28.0, 'LOJA B'],
+        ]
+        skus_df = pd.DataFrame(
+            {'SKU Seller': ['K1', 'K2'], 'SKU Beleza': ['MP1', 'MP2']}
+        )
+        for pricing_engine in ['loop', 'vectorized', 'cents']:
+            offers = OffersBuffer()
+            offers.extend(sellers_list)
+            result = Pricing(pricing_engine=pricing_engine).create_dataframes(
+                sellers_list=offers, skus_list=skus_df
+            )
+            np.testing.assert_allclose(result['special_price'], [44.9, 27.9])
+
+    def test_competitor_matching_keeps_own_price_without_competitor(self):
+        sellers_list = [
+            ['MP1', 'BRAND', 'CAT', 'P1', 50.0, 'HAIRPRO'],
+            ['MP1', 'BRAND', 'CAT', 'P1', 45.0, 'LOJA A'],
+            ['MP1', 'BRAND', 'CAT', 'P1', 42.5, 'LOJA B'],
+            ['MP2', 'BRAND', 'CAT', 'P2', 30.0, 'HAIRPRO'],
+        ]
+        skus_df = pd.DataFrame(
+            {'SKU Seller': ['K1', 'K2'], 'SKU Beleza': ['MP1', 'MP2']}
+        )
+        pc = Pricing()
+        result = pc.create_dataframes(
+            sellers_list=sellers_list, skus_list=skus_df
+        )
+        self.assertEqual(list(result['sku (*)']), ['K1'])
+        self.assertAlmostEqual(result['special_price'].iloc[0], 42.4)
+
+    def test_vectorized_pricing_keeps_profitable_prices(self):
+        df = pd.DataFrame(
+            {
+                'sku (*)': ['SKU1'],
+                'special_price': [100.0],
+                'CUSTO': [10.0],
+                'FRETE': [5.0],
+                'INSUMO': [1.0],
+            }
+        )
+        result = Pricing().pricing(df)
+        self.assertEqual(result.loc[0, 'special_price'], 100.0)
+
+    def test_cents_pricing_finds_the_first_exact_price(self):
+        df = _ebitda_frame(500)
+        pc = Pricing(pricing_engine='cents')
+        result = pc.pricing(df.copy())
+
+        np.testing.assert_array_equal(
+            result['special_price'], result['special_price'].round(2)
+        )
+        self.assertTrue((result['EBITDA %'] >= 4.0).all())
+
+        costs = result[['CUSTO', 'FRETE', 'INSUMO']].sum(axis=1)
+        previous = result['special_price'] - 0.10
+        # como no laço, um preço abaixo do limite sobe ao menos um passo
+        moved = result['special_price'] - df['special_price'] > 0.15
+        ebitda = pc._ebitda_cents(
+            np.round(previous[moved] * 100).astype(np.int64),
+            np.round(costs[moved] * 100).astype(np.int64),
+        )[-1]
+        self.assertFalse(
+            pc._reaches_limit(
+                np.round(previous[moved] * 100).astype(np.int64), ebitda
+            ).any()
+        )
+
+    def test_cents_pricing_matches_loop(self):
+        df = _ebitda_frame(120)
+        expected = Pricing(pricing_engine='loop').pricing(df.copy())
+        pc = Pricing(pricing_engine='cents')
+        result = pc.pricing(df.copy())
+
+        # valores exatamente na metade de um arredondamento, numa taxa ou no
+        # EBITDA %, ficam para cada lado conforme o erro do float; o motor
+        # em centavos arredonda sempre meio para cima
+        costs = np.round(
+            result[['CUSTO', 'FRETE', 'INSUMO']].sum(axis=1) * 100
+        ).astype(np.int64)
+        ties = np.zeros(len(result), dtype=bool)
+        for prices in [result['special_price'], expected['special_price']]:
+            price = np.round(prices * 100).astype(np.int64)
+            ebitda = pc._ebitda_cents(price, costs)[-1]
+            ties |= (200 * ebitda + price) % (2 * price) == 0
+            ties |= (2000 * ebitda + price) % (2 * price) == 0
+            for multiplier in pc.multipliers_ppm:
+                ties |= price * multiplier % PPM == PPM // 2
+
+        self.assertEqual(list(result['sku (*)']), list(expected['sku (*)']))
+        for column in ['special_price', 'EBITDA %']:
+            differs = result[column] != expected[column].round(2)
+            self.assertLess(differs.sum(), 5)
+            self.assertFalse((differs & ~ties).any())
+
+    def test_cents_pricing_keeps_unreachable_prices(self):
+        df = _ebitda_frame(10)
+        result = Pricing(
+            pricing_engine='cents', limit_rate_ebitda=80.0
+        ).pricing(df.copy())
+        np.testing.assert_array_equal(
+            result['special_price'], df['special_price']
+        )
+
+    def test_cents_competitor_matching_is_exact(self):
+        sellers_list, skus_df = _sellers_list(300)
+        expected = Pricing().create_dataframes(
+            sellers_list=sellers_list, skus_list=skus_df
+        )
+        result = Pricing(pricing_engine='cents').create_dataframes(
+            sellers_list=sellers_list, skus_list=skus_df
+        )
+        np.testing.assert_allclose(
+            result['special_price'], expected['special_price']
+        )
+        np.testing.assert_array_equal(
+            result['special_price'], result['special_price'].round(2)
+        )
+        self.assertEqual(
+            (
+                Pricing(pricing_engine='cents')
+                .create_dataframes(
+                    sellers_list=[
+                        ['MP1', 'BRAND', 'CAT', 'P1', 25.0, 'HAIRPRO'],
+                        ['MP1', 'BRAND', 'CAT', 'P1', 20.0, 'LOJA A'],
+                    ],
+                    skus_list=pd.DataFrame(
+                        {'SKU Seller': ['K1'], 'SKU Beleza': ['MP1']}
+                    ),
+                )['special_price']
+                .iloc[0]
+            ),
+            19.9,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import logging
+import shutil
+import tempfile
+import unittest
+from os import path
+from unittest.mock import patch
+
+import pandas as pd
+
+from kami_pricing.runner import PricingRunner
+
+job_logger = logging.getLogger('pricing job')
+
+
+def _run_cycle(self):
+    job_logger.warning(f'pricing {self.company}')
+    if self.company == 'BROKEN':
+        raise ValueError('no sheet')
+    pricing_df = pd.DataFrame({'sku (*)': ['K1', 'K2'], 'special_price': 1})
+    results = [
+        {'sku (*)': 'K1', 'success': True, 'error': None},
+        {'sku (*)': 'K2', 'success': False, 'error': 'HTTP error occurred'},
+    ]
+    return pd.DataFrame(), pricing_df, results
+
+
+class TestPricingRunner(unittest.TestCase):
+    def setUp(self):
+        self.logs_dir = tempfile.mkdtemp()
+        self.pricing_runner = PricingRunner.from_dict(
+            {
+                'integrator': 'ANYMARKET',
+                'rate_budgets': {'ANYMARKET': 5},
+                'managers': [
+                    {'company': 'HAIRPRO'},
+                    {'company': 'THE_BEST', 'sheet_id': 'sheet'},
+                    {'company': 'BROKEN', 'integrator': 'PLUGG_TO'},
+                ],
+            }
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.logs_dir)
+
+    def test_integrators_share_rate_budgets(self):
+        hairpro, the_best, broken = self.pricing_runner.managers
+        self.assertIs(hairpro.rate_limiter, the_best.rate_limiter)
+        self.assertIsNotNone(hairpro.rate_limiter)
+        self.assertIsNone(broken.rate_limiter)
+        self.assertEqual(the_best.sheet_id, 'sheet')
+
+    @patch('kami_pricing.runner.PricingManager.run_cycle', _run_cycle)
+    def test_run_reports_every_job_with_isolated_logs(self):
+        with patch('kami_pricing.runner.LOGS_DIR', self.logs_dir):
+            status_df = self.pricing_runner.run()
+
+        status_df = status_df.set_index('company')
+        self.assertEqual(list(status_df['status']), ['OK', 'OK', 'ERROR'])
+        self.assertEqual(status_df.loc['HAIRPRO', 'prices'], 2)
+        self.assertEqual(status_df.loc['HAIRPRO', 'pushed'], 1)
+        self.assertEqual(status_df.loc['HAIRPRO', 'failed'], 1)
+        self.assertEqual(status_df.loc['BROKEN', 'error'], 'no sheet')
+
+        job_log = path.join(
+            self.logs_dir, 'the_best_beleza_na_web_anymarket.log'
+        )
+        with open(job_log, 'r') as f:
+            content = f.read()
+        self.assertIn('pricing THE_BEST', content)
+        self.assertNotIn('pricing HAIRPRO', content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import glob
+import unittest
+from os import path
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from kami_pricing.extractors import (
+    SoupOfferExtractor,
+    StreamOfferExtractor,
+    get_offer_extractor,
+)
+from kami_pricing.fetcher import AsyncFetcher
+from kami_pricing.marketplaces import (
+    MARKETPLACE_ADAPTERS,
+    MarketplaceAdapter,
+    register_marketplace,
+)
+from kami_pricing.scraper import Scraper
+
+FIXTURES_DIR = path.join(path.dirname(path.abspath(__file__)), 'fixtures')
+# Páginas de produto reais, salvas do site, para a paridade entre os
+# extratores; beleza_na_web_product.html é um recorte mínimo para os testes
+SAVED_PAGES = sorted(glob.glob(path.join(FIXTURES_DIR, 'pages', '*.html')))
+
+with open(path.join(FIXTURES_DIR, 'beleza_na_web_product.html'), 'rb') as f:
+    PRODUCT_PAGE = f.read()
+
+EXPECTED_ROWS = [
+    [
+        'MP1001',
+        'Marca Teste',
+        'Cabelos',
+        'Shampoo Reparador 300ml',
+        89.9,
+        'HAIRPRO',
+    ],
+    [
+        'MP1001',
+        'Marca Teste',
+        'Cabelos',
+        'Shampoo Reparador 300ml',
+        84.5,
+        'Loja Ágil',
+    ],
+    [
+        'MP1001',
+        'Marca Teste',
+        'Cabelos',
+        'Shampoo Reparador 300ml',
+        92.0,
+        'Beleza na Web',
+    ],
+]
+
+
+class TestScraper(unittest.TestCase):
+    def setUp(self):
+        self.urls = [
+            'https://www.belezanaweb.com.br/produto-1',
+            'https://www.belezanaweb.com.br/produto-2',
+        ]
+
+    def _patch_fetcher(self, scraper, handler):
+        scraper._get_fetcher = lambda: AsyncFetcher(
+            max_concurrency=scraper.max_concurrency,
+            requests_per_second=scraper.requests_per_second,
+            max_retries=scraper.max_retries,
+            backoff_factor=0,
+            transport=httpx.MockTransport(handler),
+        )
+
+    def test_unsupported_engine(self):
+        with self.assertRaises(ValueError):
+            Scraper(engine='unknown')
+
+    def test_stream_extractor_matches_soup(self):
+        self.assertEqual(
+            StreamOfferExtractor().extract(PRODUCT_PAGE),
+            SoupOfferExtractor().extract(PRODUCT_PAGE),
+        )
+        for extractor in ['soup', 'stream']:
+            scraper = Scraper(extractor=extractor)
+            self.assertEqual(
+                scraper._extract_sellers(PRODUCT_PAGE),
+                EXPECTED_ROWS,
+            )
+
+    def test_stream_extractor_matches_soup_on_saved_pages(self):
+        if not SAVED_PAGES:
+            self.skipTest('No saved product pages in tests/fixtures/pages')
+        for page_path in SAVED_PAGES:
+            with self.subTest(page=path.basename(page_path)):
+                with open(page_path, 'rb') as f:
+                    content = f.read()
+                rows = StreamOfferExtractor().extract(content)
+                self.assertTrue(rows)
+                self.assertEqual(rows, SoupOfferExtractor().extract(content))
+
+    def test_stream_extractor_falls_back_to_soup(self):
+        content = PRODUCT_PAGE.decode('utf-8').encode('latin-1')
+        self.assertEqual(
+            get_offer_extractor('stream').extract(content),
+            SoupOfferExtractor().extract(content),
+        )
+
+    def test_unsupported_marketplace(self):
+        with self.assertRaises(ValueError):
+            Scraper(marketplace='unknown')
+
+    def test_registered_marketplace_uses_shared_engine(self):
+        @register_marketplace('TEST_STORE')
+        class TestStoreAdapter(MarketplaceAdapter):
+            hosts = ('loja.test',)
+
+            def extract_rows(self, content: bytes):
+                return [['T1', 'B', 'C', 'N', float(content), 'LOJA']]
+
+        self.addCleanup(MARKETPLACE_ADAPTERS.pop, 'TEST_STORE')
+        scraper = Scraper(
+            marketplace='test_store',
+            products_urls=[
+                'https://www.loja.test/produto',
+                'https://outra.test/produto',
+            ],
+            engine='async',
+        )
+        self._patch_fetcher(
+            scraper, lambda request: httpx.Response(200, content=b'9.9')
+        )
+        self.assertEqual(
+            scraper.scrap_products_from_marketplace(),
+            [['T1', 'B', 'C', 'N', 9.9, 'LOJA']],
+        )
+
+    def test_unsupported_extractor(self):
+        with self.assertRaises(ValueError):
+            Scraper(extractor='unknown')
+
+    @patch('kami_pricing.scraper.requests.get')
+    def test_sync_engine(self, mock_get):
+        mock_get.return_value = MagicMock(content=PRODUCT_PAGE)
+        scraper = Scraper(products_urls=self.urls)
+        sellers_list = scraper.scrap_products_from_marketplace()
+        self.assertEqual(sellers_list, EXPECTED_ROWS * 2)
+
+    def test_async_engine_matches_sync_shape(self):
+        scraper = Scraper(products_urls=self.urls, engine='async')
+        self._patch_fetcher(
+            scraper, lambda request: httpx.Response(200, content=PRODUCT_PAGE)
+        )
+        sellers_list = scraper.scrap_products_from_marketplace()
+        self.assertEqual(sellers_list, EXPECTED_ROWS * 2)
+
+    def test_async_engine_streams_one_page_per_url(self):
+        scraper = Scraper(products_urls=self.urls, engine='async')
+        self._patch_fetcher(
+            scraper, lambda request: httpx.Response(200, content=PRODUCT_PAGE)
+        )
+        pages = list(scraper.iter_products_from_marketplace(queue_size=1))
+        self.assertEqual(pages, [EXPECTED_ROWS, EXPECTED_ROWS])
+
+    def test_async_engine_retries_and_skips_failed_urls(self):
+        attempts = {}
+
+        def handler(request):
+            url = str(request.url)
+            attempts[url] = attempts.get(url, 0) + 1
+            if url.endswith('produto-1') and attempts[url] < 2:
+                return httpx.Response(503)
+            if url.endswith('produto-2'):
+                return httpx.Response(503)
+            return httpx.Response(200, content=PRODUCT_PAGE)
+
+        scraper = Scraper(
+            products_urls=self.urls, engine='async', max_retries=2
+        )
+        self._patch_fetcher(scraper, handler)
+        sellers_list = scraper.scrap_products_from_marketplace()
+        self.assertEqual(sellers_list, EXPECTED_ROWS)
+        self.assertEqual(attempts[self.urls[0]], 2)
+        self.assertEqual(attempts[self.urls[1]], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from os import path
+from unittest.mock import MagicMock
+
+from kami_pricing.sheets import SheetReader
+
+
+class TestSheetReader(unittest.TestCase):
+    def setUp(self):
+        self.revision = '1'
+        self.kg = MagicMock()
+        self.batch_get = self.kg.service.spreadsheets().values().batchGet
+        self.batch_get.return_value.execute.return_value = {
+            'valueRanges': [
+                {'values': [['urls'], ['https://a'], ['https://b']]},
+                {'values': [['sku', 'status'], ['K1', 'INATIVO']]},
+            ]
+        }
+        self.sheet_reader = SheetReader(
+            sheet_id='sheet',
+            gsheet=self.kg,
+            get_revision=lambda sheet_id: self.revision,
+        )
+        self.sheet_reader.register('pricing!A1:A', 'sku!A1:B')
+
+    def test_refresh_reads_every_range_in_one_call(self):
+        self.assertTrue(self.sheet_reader.refresh())
+        self.batch_get.assert_called_once_with(
+            spreadsheetId='sheet', ranges=['pricing!A1:A', 'sku!A1:B']
+        )
+        self.assertEqual(
+            list(self.sheet_reader.get('pricing!A1:A')['urls']),
+            ['https://a', 'https://b'],
+        )
+        self.assertEqual(
+            self.sheet_reader.fetch('sheet', 'sku!A1:B')['status'][0],
+            'INATIVO',
+        )
+        self.assertEqual(self.batch_get.call_count, 1)
+
+    def test_ranges_are_kept_on_disk_between_runs(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            file_path = path.join(cache_dir, 'sheets', 'ranges.json')
+            first_run = SheetReader(
+                sheet_id='sheet',
+                gsheet=self.kg,
+                get_revision=lambda sheet_id: self.revision,
+                file_path=file_path,
+            )
+            first_run.register('pricing!A1:A', 'sku!A1:B')
+            self.assertTrue(first_run.refresh())
+
+            sheet_reader = SheetReader(
+                sheet_id='sheet',
+                gsheet=self.kg,
+                get_revision=lambda sheet_id: self.revision,
+                file_path=file_path,
+            )
+            sheet_reader.register('pricing!A1:A', 'sku!A1:B')
+            self.assertFalse(sheet_reader.refresh())
+            self.assertEqual(list(sheet_reader.get('sku!A1:B')['sku']), ['K1'])
+            self.assertEqual(self.batch_get.call_count, 1)
+
+            self.revision = '2'
+            self.assertTrue(sheet_reader.refresh())
+            self.assertEqual(self.batch_get.call_count, 2)
+
+    def test_refresh_is_keyed_by_revision(self):
+        self.sheet_reader.refresh()
+        self.assertFalse(self.sheet_reader.refresh())
+        self.revision = '2'
+        self.assertTrue(self.sheet_reader.refresh())
+        self.assertEqual(self.batch_get.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
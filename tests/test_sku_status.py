@@ -0,0 +1,40 @@
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from kami_pricing.sku_status import SkuStatus
+
+
+class TestSkuStatus(unittest.TestCase):
+    def setUp(self):
+        self.fetch = MagicMock(
+            return_value=pd.DataFrame(
+                {
+                    'sku': ['K1', 'K2', '3'],
+                    'status': ['ATIVO', 'INATIVO', 'INATIVO'],
+                }
+            )
+        )
+        self.sku_status = SkuStatus(sheet_id='sheet', fetch=self.fetch)
+
+    def test_drops_inactive_skus(self):
+        df = pd.DataFrame(
+            {'sku (*)': ['K1', 'K2', 3, 'K4'], 'special_price': [1, 2, 3, 4]}
+        )
+        result = self.sku_status.drop_inactives(df)
+        self.assertEqual(list(result['sku (*)']), ['K1', 'K4'])
+
+    def test_status_is_fetched_once_within_ttl(self):
+        df = pd.DataFrame({'sku (*)': ['K1', 'K2']})
+        self.sku_status.drop_inactives(df)
+        self.sku_status.drop_inactives(df)
+        self.fetch.assert_called_once_with('sheet', 'sku!A1:B')
+
+        self.sku_status.refreshed_at -= self.sku_status.ttl + 1
+        self.sku_status.drop_inactives(df)
+        self.assertEqual(self.fetch.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from os import path
+
+import pandas as pd
+
+from kami_pricing.snapshot import PricingSnapshot
+
+
+def _pricing_df(competitor_prices, prices, special_prices=None):
+    skus = [f'K{i}' for i in range(len(prices))]
+    return pd.DataFrame(
+        {
+            'sku (*)': skus,
+            'special_price': special_prices or competitor_prices,
+            'competitor_price': competitor_prices,
+            'price': prices,
+        }
+    )
+
+
+def _results(df, failed=()):
+    return [
+        {'sku (*)': sku, 'success': sku not in failed} for sku in df['sku (*)']
+    ]
+
+
+class TestPricingSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.file_path = path.join(self.snapshot_dir.name, 'snapshot.json')
+        self.snapshot = PricingSnapshot(file_path=self.file_path)
+
+    def tearDown(self):
+        self.snapshot_dir.cleanup()
+
+    def test_empty_snapshot_keeps_every_sku(self):
+        df = _pricing_df([10.0, 20.0], [11.0, 21.0])
+        self.assertEqual(len(self.snapshot.get_changed(df)), 2)
+        self.assertEqual(len(self.snapshot.drop_unchanged_prices(df)), 2)
+
+    def test_only_changed_landscape_is_repriced(self):
+        df = _pricing_df([10.0, 20.0, 30.0], [11.0, 21.0, 31.0])
+        self.snapshot.update(df, df, _results(df))
+
+        snapshot = PricingSnapshot(file_path=self.file_path)
+        new_df = _pricing_df([10.0, 19.5, 30.0], [11.0, 21.0, 29.0])
+        changed = snapshot.get_changed(new_df)
+        self.assertEqual(list(changed['sku (*)']), ['K1', 'K2'])
+
+    def test_only_new_prices_are_pushed(self):
+        df = _pricing_df([10.0, 20.0], [11.0, 21.0], [9.9, 19.9])
+        self.snapshot.update(df, df, _results(df))
+
+        new_df = _pricing_df([10.0, 20.0], [11.0, 21.0], [9.9, 19.5])
+        pushed = self.snapshot.drop_unchanged_prices(new_df)
+        self.assertEqual(list(pushed['sku (*)']), ['K1'])
+
+    def test_stale_entries_are_repriced(self):
+        df = _pricing_df([10.0], [11.0])
+        self.snapshot.update(df, df, _results(df))
+        self.snapshot.max_age = -1
+        self.assertEqual(len(self.snapshot.get_changed(df)), 1)
+
+    def test_landscape_is_refreshed_when_the_price_is_kept(self):
+        df = _pricing_df([10.0, 20.0], [11.0, 21.0], [9.9, 19.9])
+        self.snapshot.update(df, df, _results(df))
+
+        new_df = _pricing_df([9.6, 20.5], [11.0, 21.0], [9.5, 19.9])
+        self.assertEqual(len(self.snapshot.get_changed(new_df)), 2)
+        pushed = self.snapshot.drop_unchanged_prices(new_df)
+        self.assertEqual(list(pushed['sku (*)']), ['K0'])
+        self.snapshot.update(new_df, new_df, _results(pushed))
+
+        snapshot = PricingSnapshot(file_path=self.file_path)
+        self.assertTrue(snapshot.get_changed(new_df).empty)
+        self.assertEqual(snapshot.entries['K1']['competitor_price'], 20.5)
+        self.assertEqual(snapshot.entries['K1']['special_price'], 19.9)
+
+    def test_failed_pushes_are_retried(self):
+        df = _pricing_df([10.0, 20.0, 30.0], [11.0, 21.0, 31.0])
+        self.snapshot.update(df, df, _results(df))
+        self.snapshot.update(df, df, _results(df, failed=['K1']))
+        self.snapshot.update(df, df, _results(df)[:1])
+
+        changed = self.snapshot.get_changed(df)
+        self.assertEqual(list(changed['sku (*)']), ['K1'])
+
+        snapshot = PricingSnapshot(file_path=self.file_path)
+        snapshot.update(df, df, _results(df, failed=['K0', 'K1', 'K2']))
+        self.assertEqual(len(snapshot.get_changed(df)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()